@@ -0,0 +1,86 @@
+"""합성 데이터로 대규모 백테스트 수행 시간을 측정한다.
+
+네트워크 없이 SyntheticProvider가 만든 종목/지수 데이터로 run_backtest를 실행한다.
+
+사용 예:
+    python benchmarks/bench_backtest.py --tickers 5000 --years 20 --engine panel
+    python benchmarks/bench_backtest.py --tickers 2000 --years 10 --extend-days 1
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+
+from src.data.fetcher import fetch_all_prices, fetch_kospi_index, fetch_stock_listing
+from src.data.providers import use_provider
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams, run_backtest
+from src.engine.checkpoint import BacktestCheckpoint, extend_backtest, load_checkpoint, save_checkpoint
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sort-method", default="market_cap", choices=["market_cap", "return_rate"])
+    parser.add_argument("--engine", default="panel", choices=["pandas", "panel", "numba"])
+    parser.add_argument("--extend-days", type=int, default=0,
+                        help="마지막 N거래일을 체크포인트에서 이어서 실행하는 시간도 잰다")
+    args = parser.parse_args()
+
+    end = pd.Timestamp("2024-12-31")
+    start = end - pd.DateOffset(years=args.years)
+    params = BacktestParams(
+        initial_cash=1_000_000_000,
+        start_date=start.strftime("%Y-%m-%d"),
+        end_date=end.strftime("%Y-%m-%d"),
+        fee_rate=0.015,
+        n_rise_days=3,
+        m_fall_days=2,
+        y_emergency_pct=5.0,
+        max_buy_amount=10_000_000,
+        min_balance=10_000_000,
+        sort_method=args.sort_method,
+        engine=args.engine,
+    )
+
+    provider = SyntheticProvider(seed=args.seed, n_kospi=args.tickers, n_nasdaq=0, as_of=params.start_date)
+    with use_provider(provider):
+        started = time.perf_counter()
+        listing = fetch_stock_listing("KOSPI")
+        price_data = fetch_all_prices(listing["Code"].tolist(), params.start_date, params.end_date)
+        kospi_df = fetch_kospi_index(params.start_date, params.end_date)
+        print(f"generate: {time.perf_counter() - started:.2f}s ({len(price_data)} tickers)")
+
+    started = time.perf_counter()
+    result = run_backtest(params, price_data, listing_df=listing, kospi_df=kospi_df)
+    elapsed = time.perf_counter() - started
+    print(f"run_backtest[{args.engine}]: {elapsed:.2f}s ({len(result.daily_snapshots)} days, {result.total_trades} trades)")
+
+    if args.extend_days > 0:
+        cutoff = pd.Timestamp(result.daily_snapshots[-args.extend_days - 1].date)
+        checkpoint = BacktestCheckpoint.new(params)
+        extend_backtest(checkpoint, {code: df.loc[:cutoff] for code, df in price_data.items()}, listing)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "checkpoint.npz"
+            save_checkpoint(checkpoint, path)
+            started = time.perf_counter()
+            checkpoint = load_checkpoint(path)
+            extended = extend_backtest(checkpoint, {code: df.loc[cutoff:] for code, df in price_data.items()}, listing)
+            save_checkpoint(checkpoint, path)
+            elapsed = time.perf_counter() - started
+            size = path.stat().st_size
+        same = extended.trades == result.trades and extended.daily_snapshots == result.daily_snapshots
+        print(f"extend_backtest[{args.extend_days} days]: {elapsed:.3f}s incl. load/save "
+              f"({size / 1e6:.1f} MB checkpoint, same as full run: {same})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""합성 데이터로 다중 시장 백테스트의 워커 수별 실행 시간을 측정한다.
+
+시드가 다른 두 합성 시장에서 원화 슬리브 둘(KOSPI, KOSDAQ)과 달러 슬리브
+둘(NASDAQ, NYSE)을 만들고, 슬리브별 단독 실행 시간과 워커 수별
+run_multi_market_backtest 시간을 출력한다. 워커가 슬리브 수만큼 있으면 가장
+느린 슬리브 시간에 가까워야 한다.
+
+사용 예:
+    python benchmarks/bench_markets.py --tickers 1000 --years 10 --workers 1 4
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+
+from src.data.fetcher import fetch_all_prices, fetch_exchange_rate, fetch_stock_listing
+from src.data.providers import use_provider
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams, run_backtest
+from src.engine.multi_market import MarketSleeve, _sleeve_params, run_multi_market_backtest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    end = pd.Timestamp("2024-12-31")
+    start = end - pd.DateOffset(years=args.years)
+    params = BacktestParams(
+        initial_cash=1_000_000_000,
+        start_date=start.strftime("%Y-%m-%d"),
+        end_date=end.strftime("%Y-%m-%d"),
+        fee_rate=0.015,
+        n_rise_days=3,
+        m_fall_days=2,
+        y_emergency_pct=5.0,
+        max_buy_amount=10_000_000,
+        min_balance=10_000_000,
+        engine="panel",
+    )
+
+    sleeves = []
+    for k, (krw_market, usd_market) in enumerate([("KOSPI", "NASDAQ"), ("KOSDAQ", "NYSE")]):
+        provider = SyntheticProvider(seed=args.seed + k, n_kospi=args.tickers, n_nasdaq=args.tickers,
+                                     as_of=params.start_date)
+        with use_provider(provider):
+            for market, source, column, currency in [(krw_market, "KOSPI", "Code", "KRW"),
+                                                     (usd_market, "NASDAQ", "Symbol", "USD")]:
+                listing = fetch_stock_listing(source)
+                prices = fetch_all_prices(listing[column].tolist(), params.start_date, params.end_date)
+                sleeves.append(MarketSleeve(market, 25, currency, prices, listing))
+            rate = fetch_exchange_rate(params.start_date, params.end_date)
+
+    start_rate = float(rate["Close"].asof(pd.Timestamp(params.start_date)))
+    for sleeve in sleeves:
+        started = time.perf_counter()
+        run_backtest(_sleeve_params(params, sleeve, start_rate if sleeve.currency == "USD" else 1.0),
+                     sleeve.price_data, sleeve.listing_df)
+        print(f"{sleeve.market:>6}: {time.perf_counter() - started:.2f}s alone")
+
+    for workers in args.workers:
+        started = time.perf_counter()
+        result = run_multi_market_backtest(params, sleeves, {"USD": rate}, max_workers=workers)
+        elapsed = time.perf_counter() - started
+        print(f"workers={workers:>3}: {elapsed:.2f}s ({result.total_trades} trades, "
+              f"return {result.final_return_pct}%)")
+
+
+if __name__ == "__main__":
+    main()
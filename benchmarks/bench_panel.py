@@ -0,0 +1,52 @@
+"""메모리 매핑 가격 패널 열기 / 변환 시간 벤치마크.
+
+사용 예:
+    python benchmarks/bench_panel.py --tickers 4000 --years 20
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import PricePanel, open_panel, save_panel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=4000)
+    parser.add_argument("--years", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(end="2024-12-31", periods=args.years * 252, name="Date")
+    close = np.asfortranarray(
+        10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, (len(dates), args.tickers)), axis=0))
+    )
+    codes = [f"{i:06d}" for i in range(args.tickers)]
+    workdir = Path(tempfile.mkdtemp(prefix="bench_panel_"))
+    try:
+        started = time.perf_counter()
+        save_panel(PricePanel(dates=dates, codes=codes, close=close), workdir)
+        print(f"save: {time.perf_counter() - started:.3f}s ({close.nbytes / 1e6:.0f} MB)")
+
+        started = time.perf_counter()
+        panel = open_panel(workdir)
+        print(f"open (mmap): {(time.perf_counter() - started) * 1000:.1f}ms")
+
+        started = time.perf_counter()
+        price_data = panel.to_price_data()
+        print(f"to_price_data ({len(price_data)} views): {time.perf_counter() - started:.3f}s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""통합 가격 저장소 압축 코덱 / row group 크기 비교 벤치마크.
+
+사용 예:
+    python benchmarks/bench_store.py --tickers 1000 --years 5
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np
+import pandas as pd
+
+from src.data import store
+
+CODECS = ["none", "snappy", "lz4", "zstd", "gzip"]
+ROW_GROUP_SIZES = [16 * 1024, 128 * 1024, 1024 * 1024]
+
+
+def _make_universe(n_tickers: int, n_years: int, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """랜덤 워크 기반 벤치마크용 가격 데이터를 생성한다."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end="2024-12-31", periods=n_years * 252, name="Date")
+    n = len(dates)
+    result = {}
+    for i in range(n_tickers):
+        close = 10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        result[f"{i:06d}"] = pd.DataFrame({
+            "Open": close * (1 + rng.normal(0, 0.005, n)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(1_000, 1_000_000, n),
+            "Change": np.concatenate([[0.0], np.diff(close) / close[:-1]]),
+        }, index=dates)
+    return result
+
+
+def _dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    price_data = _make_universe(args.tickers, args.years)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_store_"))
+    try:
+        # 기준선: 종목별 파일 하나씩
+        per_file_dir = workdir / "per_file"
+        per_file_dir.mkdir()
+        for code, df in price_data.items():
+            df.to_parquet(per_file_dir / f"{code}.parquet")
+        started = time.perf_counter()
+        for code in price_data:
+            pd.read_parquet(per_file_dir / f"{code}.parquet")
+        per_file_read = time.perf_counter() - started
+        print(f"{'layout':<28}{'write s':>10}{'read s':>10}{'size MB':>10}")
+        print(f"{'per-file (snappy)':<28}{'-':>10}{per_file_read:>10.3f}"
+              f"{_dir_size(per_file_dir) / 1e6:>10.1f}")
+
+        for codec in CODECS:
+            for row_group_size in ROW_GROUP_SIZES:
+                root = workdir / f"{codec}_{row_group_size}"
+                started = time.perf_counter()
+                store.write_market("KOSPI", price_data, root=root,
+                                   compression=codec, row_group_size=row_group_size)
+                write_s = time.perf_counter() - started
+
+                started = time.perf_counter()
+                store.read_market("KOSPI", root=root)
+                read_s = time.perf_counter() - started
+
+                label = f"{codec} / rg={row_group_size // 1024}k"
+                print(f"{label:<28}{write_s:>10.3f}{read_s:>10.3f}{_dir_size(root) / 1e6:>10.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
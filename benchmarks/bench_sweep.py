@@ -0,0 +1,74 @@
+"""합성 데이터로 파라미터 스윕의 워커 수별 처리량을 측정한다.
+
+같은 grid를 워커 수만 바꿔 run_sweep으로 실행하고 설정/초와 1 워커 대비 배율을
+출력한다.
+
+사용 예:
+    python benchmarks/bench_sweep.py --tickers 2000 --years 10 --workers 1 8 32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pandas as pd
+
+from src.data.fetcher import fetch_all_prices, fetch_kospi_index, fetch_stock_listing
+from src.data.providers import use_provider
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams
+from src.engine.sweep import run_sweep
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    end = pd.Timestamp("2024-12-31")
+    start = end - pd.DateOffset(years=args.years)
+    base = BacktestParams(
+        initial_cash=1_000_000_000,
+        start_date=start.strftime("%Y-%m-%d"),
+        end_date=end.strftime("%Y-%m-%d"),
+        fee_rate=0.015,
+        n_rise_days=3,
+        m_fall_days=2,
+        y_emergency_pct=5.0,
+        max_buy_amount=10_000_000,
+        min_balance=10_000_000,
+        engine="panel",
+    )
+    grid = {
+        "n_rise_days": [2, 3, 4, 5],
+        "m_fall_days": [1, 2, 3],
+        "max_buy_amount": [5_000_000, 10_000_000],
+        "sort_method": ["market_cap", "return_rate"],
+    }
+
+    provider = SyntheticProvider(seed=args.seed, n_kospi=args.tickers, n_nasdaq=0, as_of=base.start_date)
+    with use_provider(provider):
+        listing = fetch_stock_listing("KOSPI")
+        price_data = fetch_all_prices(listing["Code"].tolist(), base.start_date, base.end_date)
+        kospi_df = fetch_kospi_index(base.start_date, base.end_date)
+
+    baseline = None
+    for workers in args.workers:
+        started = time.perf_counter()
+        table = run_sweep(base, grid, price_data, listing, kospi_df, max_workers=workers)
+        elapsed = time.perf_counter() - started
+        rate = len(table) / elapsed
+        baseline = baseline or rate
+        print(f"workers={workers:>3}: {len(table)} configs in {elapsed:.2f}s "
+              f"({rate:.2f} configs/s, x{rate / baseline:.2f})")
+    print(table.sort_values("final_return_pct", ascending=False).head(5).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
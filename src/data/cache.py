@@ -1,27 +1,358 @@
-"""Parquet 파일 기반 로컬 캐시 모듈."""
+"""Parquet 파일 기반 로컬 캐시 모듈.
 
+종목별로 지금까지 수집한 가장 넓은 구간을 파일 하나에 보관한다. 보관 구간에
+포함되는 요청은 로컬에서 잘라 반환하고, 벗어나는 앞/뒤 구간만 새로 받아 병합한다.
+무엇이 캐시되어 있는지는 매니페스트(src.data.manifest)로 조회하며, 전체 크기가
+CACHE_BUDGET_BYTES를 넘으면 오래 안 쓴 항목부터 지운다.
+"""
+
+import logging
+import os
+import time
+from datetime import date, timedelta
 from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.data.manifest import CacheManifest, file_checksum, get_manifest
+from src.data.negative_cache import NegativeCache, get_negative_cache
+
+logger = logging.getLogger(__name__)
 
 CACHE_DIR = Path(".cache")
+CACHE_BUDGET_BYTES = 5 * 1024 ** 3
+LISTING_SUBDIR = "listings"
+
+_bootstrapped: set[Path] = set()
+
+_RANGE_KEY = b"cache_range"
+
+
+def _normalize_date(value: str) -> str:
+    """날짜 문자열을 YYYY-MM-DD 형식으로 정규화한다."""
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _shift_date(value: str, days: int) -> str:
+    """YYYY-MM-DD 날짜를 days만큼 이동한다."""
+    return (pd.Timestamp(value) + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def get_cache_path(code: str) -> Path:
+    """종목별 캐시 파일 경로를 반환한다."""
+    return CACHE_DIR / f"{code}.parquet"
+
+
+def manifest() -> CacheManifest:
+    """현재 CACHE_DIR의 매니페스트를 반환한다.
+
+    매니페스트 파일이 아직 없는 기존 캐시 디렉터리는 처음 한 번 파일을 훑어 등록한다.
+    """
+    current = get_manifest(CACHE_DIR)
+    if current.cache_dir not in _bootstrapped:
+        _bootstrapped.add(current.cache_dir)
+        if not current.path.exists() and CACHE_DIR.exists():
+            adopt_orphans()
+    return current
+
+
+def flush_manifest() -> None:
+    """매니페스트와 네거티브 캐시 변경 사항을 디스크에 저장한다."""
+    manifest().flush()
+    negative_cache().flush()
+
+
+def negative_cache() -> NegativeCache:
+    """현재 CACHE_DIR의 실패 종목 네거티브 캐시를 반환한다."""
+    return get_negative_cache(CACHE_DIR)
 
 
-def get_cache_path(code: str, start: str, end: str) -> Path:
-    """캐시 파일 경로를 반환한다."""
-    return CACHE_DIR / f"{code}_{start}_{end}.parquet"
+def adopt_orphans() -> list[str]:
+    """매니페스트에 없는 종목별 캐시 파일을 찾아 등록하고, 등록한 종목코드를 반환한다."""
+    current = get_manifest(CACHE_DIR)
+    adopted = []
+    for path in sorted(CACHE_DIR.glob("*.parquet")):
+        code = path.stem
+        if current.get(code) is None and register_file(code):
+            adopted.append(code)
+    return adopted
 
 
-def load_from_cache(code: str, start: str, end: str) -> pd.DataFrame | None:
-    """캐시 파일이 존재하면 DataFrame을 반환, 없으면 None."""
-    path = get_cache_path(code, start, end)
-    if path.exists():
-        return pd.read_parquet(path)
-    return None
+def read_range_metadata(path: Path) -> tuple[str, str] | None:
+    """캐시 파일의 스키마 메타데이터에서 (start, end) 보관 구간을 읽는다."""
+    metadata = pq.read_schema(path).metadata or {}
+    raw = metadata.get(_RANGE_KEY)
+    if raw is None:
+        return None
+    start, end = raw.decode().split(":")
+    return start, end
+
+
+def get_cached_range(code: str) -> tuple[str, str] | None:
+    """캐시가 보관 중인 (start, end) 구간을 반환한다. 캐시가 없으면 None.
+
+    매니페스트만 조회하므로 파일 시스템에 접근하지 않는다.
+    """
+    entry = manifest().get(code)
+    if entry is None:
+        return None
+    return entry.start, entry.end
+
+
+def get_missing_ranges(code: str, start: str, end: str) -> list[tuple[str, str]]:
+    """[start, end] 요청을 채우기 위해 새로 받아야 하는 앞/뒤 구간 목록을 반환한다.
+
+    보관 구간이 항상 연속이 되도록 요청과 캐시 사이의 빈 구간도 함께 포함한다.
+    """
+    start, end = _normalize_date(start), _normalize_date(end)
+    cached = get_cached_range(code)
+    if cached is None:
+        return [(start, end)]
+
+    cached_start, cached_end = cached
+    missing: list[tuple[str, str]] = []
+    if start < cached_start:
+        missing.append((start, _shift_date(cached_start, -1)))
+    if end > cached_end:
+        missing.append((_shift_date(cached_end, 1), end))
+    return missing
+
+
+def load_from_cache(
+    code: str, start: str, end: str, columns: list[str] | None = None
+) -> pd.DataFrame | None:
+    """캐시가 [start, end]를 모두 포함하면 해당 구간 DataFrame을, 아니면 None을 반환한다."""
+    start, end = _normalize_date(start), _normalize_date(end)
+    cached = get_cached_range(code)
+    if cached is None or start < cached[0] or end > cached[1]:
+        return None
+    return read_cached_slice(code, start, end, columns=columns)
+
+
+def read_cached_slice(
+    code: str, start: str, end: str, columns: list[str] | None = None
+) -> pd.DataFrame | None:
+    """보관 구간과 무관하게 캐시에 저장된 봉 중 [start, end] 부분을 반환한다.
+
+    columns가 주어지면 pyarrow에서 해당 컬럼만 읽는다 (파일에 없는 컬럼은 무시).
+    반환 DataFrame의 attrs["source_nbytes"]에는 모든 컬럼을 64비트로 읽었을 때의
+    메모리 크기를 기록해 절감량 계산에 쓴다.
+    """
+    current = manifest()
+    if current.get(code) is None:
+        return None
+    try:
+        parquet_file = pq.ParquetFile(get_cache_path(code))
+    except FileNotFoundError:
+        current.remove(code)
+        return None
+
+    schema = parquet_file.schema_arrow
+    index_columns = _pandas_index_columns(schema)
+    data_columns = [name for name in schema.names if name not in index_columns]
+    read_columns = None
+    if columns is not None:
+        read_columns = [name for name in columns if name in data_columns]
+    df = parquet_file.read(columns=read_columns, use_pandas_metadata=True).to_pandas()
+    current.touch(code)
+
+    df = df.loc[_normalize_date(start):_normalize_date(end)]
+    df.attrs["source_nbytes"] = len(df) * 8 * (len(data_columns) + 1)
+    return df
+
+
+def _pandas_index_columns(schema: pa.Schema) -> list[str]:
+    """pandas 메타데이터에 기록된 인덱스 컬럼명을 반환한다."""
+    pandas_meta = schema.pandas_metadata or {}
+    return [name for name in pandas_meta.get("index_columns", []) if isinstance(name, str)]
 
 
 def save_to_cache(code: str, start: str, end: str, df: pd.DataFrame) -> None:
-    """DataFrame을 Parquet 파일로 캐시에 저장한다."""
+    """[start, end] 구간 데이터를 기존 캐시와 병합해 저장한다.
+
+    오늘 이후의 봉은 장중 잠정치일 수 있으므로 보관 구간의 끝은 어제로
+    제한한다. 다음 실행에서 해당 봉을 다시 받아 덮어쓴다. 기존 캐시 없이 오늘
+    이후만 받은 경우처럼 제한한 구간이 비면 저장하지 않는다.
+    """
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    path = get_cache_path(code, start, end)
-    df.to_parquet(path)
+    path = get_cache_path(code)
+    start, end = _normalize_date(start), _normalize_date(end)
+
+    cached = get_cached_range(code)
+    if cached is not None and not path.exists():
+        manifest().remove(code)
+        cached = None
+    if cached is not None:
+        existing = pd.read_parquet(path)
+        if df is not None and not df.empty:
+            merged = pd.concat([existing, df])
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        else:
+            merged = existing
+        start, end = min(start, cached[0]), max(end, cached[1])
+    elif df is None or df.empty:
+        return
+    else:
+        merged = df.sort_index()
+
+    yesterday = (date.today() - timedelta(days=1)).strftime("%Y-%m-%d")
+    end = min(end, yesterday)
+    if start > end:
+        return
+
+    table = pa.Table.from_pandas(merged)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_RANGE_KEY] = f"{start}:{end}".encode()
+    table = table.replace_schema_metadata(metadata)
+
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer)
+    data = buffer.getvalue().to_pybytes()
+
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+    current = manifest()
+    current.record(code, start, end, rows=len(merged), nbytes=len(data), checksum=file_checksum(data))
+    if current.total_bytes() > CACHE_BUDGET_BYTES:
+        current.evict(CACHE_BUDGET_BYTES, protect={code})
+
+
+def register_file(code: str) -> bool:
+    """매니페스트에 없는 종목별 캐시 파일을 읽어 항목으로 등록한다.
+
+    보관 구간 메타데이터가 없는 파일(예전 형식)은 등록하지 않고 False를 반환한다.
+    """
+    path = get_cache_path(code)
+    cached_range = read_range_metadata(path)
+    if cached_range is None:
+        return False
+    data = path.read_bytes()
+    rows = pq.read_metadata(path).num_rows
+    get_manifest(CACHE_DIR).record(code, cached_range[0], cached_range[1], rows=rows,
+                                   nbytes=len(data), checksum=file_checksum(data))
+    return True
+
+
+def verify_cache(fix: bool = False) -> list[tuple[str, str]]:
+    """매니페스트 항목의 파일 존재 여부와 체크섬을 검사한다.
+
+    Args:
+        fix: True이면 문제가 있는 항목과 파일을 제거한다.
+
+    Returns:
+        [(종목코드, 문제 설명), ...]
+    """
+    current = manifest()
+    problems: list[tuple[str, str]] = []
+    for code, entry in sorted(current.entries.items()):
+        path = get_cache_path(code)
+        if not path.exists():
+            problems.append((code, "missing file"))
+        elif file_checksum(path.read_bytes()) != entry.checksum:
+            problems.append((code, "checksum mismatch"))
+    if fix:
+        for code, _ in problems:
+            current.remove(code, delete_file=True)
+        current.flush()
+    return problems
+
+
+def compact_cache(budget_bytes: int | None = None) -> dict[str, list[str]]:
+    """캐시를 정리한다.
+
+    파일이 사라진 항목을 지우고, 매니페스트에 없는 종목별 파일을 등록한 뒤
+    용량 한도에 맞춰 오래 안 쓴 항목을 삭제한다.
+
+    Returns:
+        {"dropped": [...], "adopted": [...], "evicted": [...]}
+    """
+    current = manifest()
+    dropped = [code for code in sorted(current.entries) if not get_cache_path(code).exists()]
+    for code in dropped:
+        current.remove(code)
+    adopted = adopt_orphans()
+    budget = CACHE_BUDGET_BYTES if budget_bytes is None else budget_bytes
+    evicted = current.evict(budget)
+    current.flush()
+    return {"dropped": dropped, "adopted": adopted, "evicted": evicted}
+
+
+def _listing_dir() -> Path:
+    return CACHE_DIR / LISTING_SUBDIR
+
+
+def get_listing_path(market: str, as_of: str) -> Path:
+    """시장/기준일별 종목 목록 스냅샷 경로를 반환한다."""
+    return _listing_dir() / f"{market}_{_normalize_date(as_of)}.parquet"
+
+
+def list_listing_snapshots(market: str) -> list[str]:
+    """저장된 종목 목록 스냅샷의 기준일(YYYY-MM-DD)을 오름차순으로 반환한다."""
+    prefix = f"{market}_"
+    return sorted(
+        path.stem[len(prefix):]
+        for path in _listing_dir().glob(f"{prefix}*.parquet")
+    )
+
+
+def save_listing_snapshot(market: str, as_of: str, df: pd.DataFrame) -> None:
+    """종목 목록을 기준일 스냅샷으로 저장한다."""
+    _listing_dir().mkdir(parents=True, exist_ok=True)
+    path = get_listing_path(market, as_of)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def listing_snapshot_age(market: str) -> float | None:
+    """가장 최근 스냅샷의 나이(초)를 반환한다. 스냅샷이 없으면 None.
+
+    파일 수정 시각과 기준일 종료 시각 중 이른 쪽을 기준으로 한다.
+    """
+    snapshots = list_listing_snapshots(market)
+    if not snapshots:
+        return None
+    latest = snapshots[-1]
+    mtime = get_listing_path(market, latest).stat().st_mtime
+    day_end = (pd.Timestamp(latest) + timedelta(days=1)).timestamp()
+    return max(0.0, time.time() - min(mtime, day_end))
+
+
+def load_listing_snapshot(market: str, as_of: str) -> tuple[str, pd.DataFrame] | None:
+    """as_of 시점에 유효한 종목 목록을 반환한다.
+
+    as_of 이전의 가장 가까운 스냅샷을 고른다. 더 나중 날짜의 스냅샷으로 대신하지
+    않는다.
+
+    Returns:
+        (스냅샷 기준일, 종목 목록 DataFrame). as_of 이전 스냅샷이 없으면 None.
+    """
+    as_of = _normalize_date(as_of)
+    eligible = [d for d in list_listing_snapshots(market) if d <= as_of]
+    if not eligible:
+        return None
+    chosen = eligible[-1]
+    return chosen, pd.read_parquet(get_listing_path(market, chosen))
+
+
+def load_listing_history(market: str, start: str, end: str) -> list[tuple[str, pd.DataFrame]]:
+    """[start, end] 구간에 유효한 종목 목록 스냅샷들을 기준일 오름차순으로 반환한다.
+
+    start 시점에 유효한 스냅샷(load_listing_snapshot과 같은 규칙)과 그 뒤 end까지의
+    스냅샷을 모두 포함한다. start 이전 스냅샷이 없으면 경고를 남기고 구간 안의
+    스냅샷만 반환하며, 구간 안에도 없으면 빈 리스트.
+    """
+    snapshots = list_listing_snapshots(market)
+    if not snapshots:
+        return []
+    start, end = _normalize_date(start), _normalize_date(end)
+    eligible = [d for d in snapshots if d <= start]
+    if not eligible:
+        logger.warning("No %s listing snapshot on or before %s; oldest is %s", market, start, snapshots[0])
+    first = eligible[-1] if eligible else start
+    chosen = [d for d in snapshots if first <= d <= end]
+    return [(d, pd.read_parquet(get_listing_path(market, d))) for d in chosen]
@@ -0,0 +1,166 @@
+"""데이터 관리 명령행 도구.
+
+사용 예:
+    python -m src.data.cli prefetch --market KOSPI --market NASDAQ --start 2005-01-01 --end 2024-12-31
+    python -m src.data.cli migrate --compression zstd --row-group-size 131072
+    python -m src.data.cli build-panel --market KOSPI --start 2005-01-01 --end 2024-12-31
+    python -m src.data.cli cache inspect --top 20
+    python -m src.data.cli cache verify --fix
+    python -m src.data.cli cache compact --budget-mb 2048
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from src.data import cache, panel, prefetch, store
+from src.data.fetcher import DEFAULT_MAX_WORKERS, DEFAULT_RATE_LIMIT
+
+
+def _cmd_prefetch(args: argparse.Namespace) -> int:
+    """시장별 종목 목록과 가격을 캐시에 미리 받아둔다."""
+    failed = 0
+    for market in args.market:
+        stats = prefetch.prefetch_market(
+            market, args.start, args.end,
+            max_workers=args.workers,
+            rate_limit=args.rate_limit or None,
+            checkpoint_every=args.checkpoint_every,
+            restart=args.restart,
+        )
+        print(stats.summary())
+        if stats.failed:
+            print(f"  failed: {', '.join(stats.failed[:20])}{' ...' if len(stats.failed) > 20 else ''}")
+        failed += len(stats.failed)
+    return 1 if failed else 0
+
+
+def _cmd_migrate(args: argparse.Namespace) -> int:
+    """종목별 캐시를 시장 단위 데이터셋으로 옮긴다."""
+    counts = store.migrate_cache(
+        cache_dir=args.cache_dir,
+        root=args.store_dir,
+        compression=args.compression,
+        row_group_size=args.row_group_size,
+    )
+    if not counts:
+        print("옮길 캐시 파일이 없습니다.")
+        return 0
+    for market, n_codes in sorted(counts.items()):
+        print(f"{market}: {n_codes} codes")
+    return 0
+
+
+def _cmd_build_panel(args: argparse.Namespace) -> int:
+    """통합 저장소에서 시장 데이터를 읽어 메모리 매핑 패널로 저장한다."""
+    price_data = store.read_market(args.market, start=args.start, end=args.end,
+                                   columns=["Close"], root=args.store_dir)
+    if not price_data:
+        print(f"{args.market} 데이터가 저장소에 없습니다.")
+        return 1
+    out = args.out or panel.PANEL_DIR / args.market
+    price_panel = panel.build_panel(price_data, start=args.start, end=args.end)
+    panel.save_panel(price_panel, out)
+    n_dates, n_codes = price_panel.close.shape
+    print(f"{out}: {n_dates} dates x {n_codes} codes")
+    return 0
+
+
+def _cmd_cache_inspect(args: argparse.Namespace) -> int:
+    """캐시 매니페스트 요약과 오래 안 쓴 항목을 출력한다."""
+    manifest = cache.manifest()
+    entries = sorted(manifest.entries.values(), key=lambda e: e.last_access)
+    total = manifest.total_bytes()
+    print(f"dir:     {cache.CACHE_DIR}")
+    print(f"entries: {len(entries)}")
+    print(f"size:    {total / 1e6:.1f} MB / budget {cache.CACHE_BUDGET_BYTES / 1e6:.1f} MB")
+    negative = cache.negative_cache()
+    blocked = [code for code in negative.entries if negative.is_blocked(code)]
+    print(f"blocked: {len(blocked)} failing codes (negative cache)")
+    if args.top:
+        print(f"\n{'code':<12}{'start':<12}{'end':<12}{'rows':>8}{'KB':>10}  last access")
+        for e in entries[:args.top]:
+            accessed = time.strftime("%Y-%m-%d %H:%M", time.localtime(e.last_access))
+            print(f"{e.code:<12}{e.start:<12}{e.end:<12}{e.rows:>8}{e.nbytes / 1e3:>10.1f}  {accessed}")
+    return 0
+
+
+def _cmd_cache_verify(args: argparse.Namespace) -> int:
+    """캐시 파일 존재 여부와 체크섬을 검사한다."""
+    problems = cache.verify_cache(fix=args.fix)
+    for code, problem in problems:
+        print(f"{code}: {problem}")
+    print(f"{len(problems)} problem(s){' removed' if args.fix and problems else ''}")
+    return 1 if problems and not args.fix else 0
+
+
+def _cmd_cache_compact(args: argparse.Namespace) -> int:
+    """사라진 항목 제거, 미등록 파일 등록, 용량 한도 정리를 수행한다."""
+    budget = int(args.budget_mb * 1e6) if args.budget_mb is not None else None
+    report = cache.compact_cache(budget)
+    report["unblocked"] = cache.negative_cache().purge_expired()
+    cache.negative_cache().flush()
+    for key, codes in report.items():
+        print(f"{key}: {len(codes)}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """명령행 인자 파서를 생성한다."""
+    parser = argparse.ArgumentParser(prog="python -m src.data.cli", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    warm = sub.add_parser("prefetch", help="종목 목록과 가격을 캐시에 미리 받아둔다 (중단 후 이어받기)")
+    warm.add_argument("--market", action="append", required=True, choices=["KOSPI", "NASDAQ"],
+                      help="대상 시장 (여러 번 지정 가능)")
+    warm.add_argument("--start", required=True)
+    warm.add_argument("--end", required=True)
+    warm.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS)
+    warm.add_argument("--rate-limit", type=float, default=DEFAULT_RATE_LIMIT,
+                      help="초당 최대 요청 수 (0이면 무제한)")
+    warm.add_argument("--checkpoint-every", type=int, default=prefetch.DEFAULT_CHECKPOINT_EVERY,
+                      help="체크포인트 저장 간격 (종목 수)")
+    warm.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터 받는다")
+    warm.set_defaults(func=_cmd_prefetch)
+
+    migrate = sub.add_parser("migrate", help="종목별 캐시를 시장 단위 데이터셋으로 옮긴다")
+    migrate.add_argument("--cache-dir", default=None, help="기존 캐시 디렉터리 (기본값: .cache)")
+    migrate.add_argument("--store-dir", default=None, help="저장소 디렉터리 (기본값: .store)")
+    migrate.add_argument("--compression", default=store.DEFAULT_COMPRESSION)
+    migrate.add_argument("--row-group-size", type=int, default=store.DEFAULT_ROW_GROUP_SIZE)
+    migrate.set_defaults(func=_cmd_migrate)
+
+    build = sub.add_parser("build-panel", help="저장소 데이터로 메모리 매핑 가격 패널을 만든다")
+    build.add_argument("--market", required=True)
+    build.add_argument("--start", required=True)
+    build.add_argument("--end", required=True)
+    build.add_argument("--store-dir", default=None, help="저장소 디렉터리 (기본값: .store)")
+    build.add_argument("--out", default=None, help="패널 디렉터리 (기본값: .panel/<market>)")
+    build.set_defaults(func=_cmd_build_panel)
+
+    cache_parser = sub.add_parser("cache", help="가격 캐시 조회 및 관리")
+    cache_sub = cache_parser.add_subparsers(dest="cache_command", required=True)
+    inspect = cache_sub.add_parser("inspect", help="캐시 요약과 오래 안 쓴 항목을 출력한다")
+    inspect.add_argument("--top", type=int, default=10, help="출력할 LRU 항목 수")
+    inspect.set_defaults(func=_cmd_cache_inspect)
+    verify = cache_sub.add_parser("verify", help="파일 존재 여부와 체크섬을 검사한다")
+    verify.add_argument("--fix", action="store_true", help="문제가 있는 항목을 제거한다")
+    verify.set_defaults(func=_cmd_cache_verify)
+    compact = cache_sub.add_parser("compact", help="매니페스트를 정리하고 용량 한도를 적용한다")
+    compact.add_argument("--budget-mb", type=float, default=None,
+                         help="디스크 용량 한도 (MB, 기본값: CACHE_BUDGET_BYTES)")
+    compact.set_defaults(func=_cmd_cache_compact)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """명령행 진입점."""
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
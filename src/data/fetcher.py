@@ -1,23 +1,175 @@
-"""FinanceDataReader 래퍼 모듈 - 주가 및 지수 데이터 수집."""
+"""주가 및 지수 데이터 수집 모듈.
+
+실제 요청은 src.data.providers의 현재 공급자(기본값: FinanceDataReader)가 처리한다.
+"""
 
 import time
 import logging
+import threading
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice
 
-import FinanceDataReader as fdr
+import numpy as np
 import pandas as pd
 
-from src.data.cache import load_from_cache, save_to_cache
+from src.data.cache import (
+    flush_manifest,
+    get_cached_range,
+    get_missing_ranges,
+    listing_snapshot_age,
+    load_listing_snapshot,
+    negative_cache,
+    read_cached_slice,
+    save_listing_snapshot,
+    save_to_cache,
+)
+from src.data.providers import get_provider
 
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0  # seconds
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_RATE_LIMIT = 10.0  # requests per second
+LISTING_TTL = 12 * 60 * 60  # seconds
+BREAKER_THRESHOLD = 10  # 연속 실패 횟수
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Adj Close", "Change")
+VOLUME_COLUMNS = ("Volume",)
+
+
+@dataclass
+class FetchStats:
+    """fetch_all_prices 실행 요약."""
+    requested: int = 0
+    loaded: int = 0
+    failed: list[str] = field(default_factory=list)
+    negative_skipped: list[str] = field(default_factory=list)  # 네거티브 캐시로 요청을 건너뛴 종목
+    breaker_skipped: list[str] = field(default_factory=list)   # 회로 차단으로 요청을 건너뛴 종목
+    breaker_tripped: bool = False
+    source_bytes: int = 0  # 전체 컬럼을 64비트로 읽었을 때의 메모리
+    loaded_bytes: int = 0  # 실제로 적재된 메모리
+    fetched_bytes: int = 0  # 공급자에서 새로 받은 데이터의 메모리 (캐시에서 읽은 부분 제외)
+
+    @property
+    def saved_bytes(self) -> int:
+        """컬럼 선택/다운캐스트로 절감한 메모리 (bytes)."""
+        return max(0, self.source_bytes - self.loaded_bytes)
+
+
+def downcast_prices(df: pd.DataFrame) -> pd.DataFrame:
+    """가격 컬럼은 float32로, 거래량은 정수 범위에 맞춰 int32/int64로 변환한다.
+
+    결측치가 있거나 정수가 아닌 거래량 컬럼은 그대로 둔다.
+    """
+    converted = {}
+    for column in df.columns:
+        values = df[column]
+        if column in PRICE_COLUMNS and pd.api.types.is_float_dtype(values):
+            converted[column] = values.astype(np.float32)
+        elif column in VOLUME_COLUMNS and pd.api.types.is_numeric_dtype(values):
+            if values.isna().any() or not np.array_equal(values, np.floor(values)):
+                continue
+            fits_int32 = values.empty or (values.min() >= np.iinfo(np.int32).min
+                                          and values.max() <= np.iinfo(np.int32).max)
+            converted[column] = values.astype(np.int32 if fits_int32 else np.int64)
+    if not converted:
+        return df
+    return df.assign(**converted)
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷 요청 속도 제한기.
+
+    Args:
+        rate: 초당 허용 요청 수
+        capacity: 순간적으로 허용할 최대 버스트 (기본값: max(1, rate))
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """토큰 하나를 얻을 때까지 대기한다."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitOpenError(RuntimeError):
+    """회로 차단기가 열려 요청을 보내지 않았다."""
+
 
+class CircuitBreaker:
+    """연속 실패가 threshold번 쌓이면 이후 요청을 막는 스레드 안전 회로 차단기.
 
-def _retry(func, *args, retries: int = MAX_RETRIES, **kwargs):
-    """네트워크 요청을 지수 백오프로 재시도한다."""
+    한 번 열리면 이 차단기를 쓰는 수집이 끝날 때까지 열린 상태를 유지한다.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD):
+        if threshold <= 0:
+            raise ValueError("threshold must be positive")
+        self.threshold = threshold
+        self.streak: list[str] = []  # 현재 연속 실패 중인 종목
+        self.tripped_by: list[str] = []  # 차단기를 연 연속 실패 종목
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.tripped_by)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.streak.clear()
+
+    def record_failure(self, code: str) -> bool:
+        """실패를 기록한다. 이번 실패로 차단기가 열렸으면 True."""
+        with self._lock:
+            if self.tripped_by:
+                return False
+            self.streak.append(code)
+            if len(self.streak) < self.threshold:
+                return False
+            self.tripped_by = list(self.streak)
+            return True
+
+
+def _retry(
+    func,
+    *args,
+    retries: int = MAX_RETRIES,
+    limiter: TokenBucket | None = None,
+    breaker: CircuitBreaker | None = None,
+    **kwargs,
+):
+    """네트워크 요청을 지수 백오프로 재시도한다.
+
+    limiter가 주어지면 매 시도 전에 토큰을 획득한다. 백오프 대기는 호출한
+    스레드에서만 일어나므로 다른 워커의 요청을 막지 않는다. breaker가 열려
+    있으면 요청하지 않고 CircuitOpenError를 던진다.
+    """
     for attempt in range(retries):
+        if breaker is not None and breaker.is_open:
+            raise CircuitOpenError("circuit breaker is open")
         try:
+            if limiter is not None:
+                limiter.acquire()
             return func(*args, **kwargs)
         except Exception as e:
             if attempt == retries - 1:
@@ -27,75 +179,324 @@ def _retry(func, *args, retries: int = MAX_RETRIES, **kwargs):
             time.sleep(delay)
 
 
-def fetch_stock_listing(market: str = "KOSPI") -> pd.DataFrame:
-    """상장 종목 목록을 반환한다.
+def fetch_stock_listing(
+    market: str = "KOSPI", as_of: str | None = None, ttl: float = LISTING_TTL
+) -> pd.DataFrame | None:
+    """as_of 시점의 상장 종목 목록을 반환한다.
+
+    가장 최근 스냅샷이 ttl보다 오래됐을 때만 새 목록을 받아 오늘 날짜 스냅샷으로
+    저장한다. 네트워크 요청이 실패해도 저장된 스냅샷이 있으면 그것을 사용한다.
 
     Args:
         market: "KOSPI" 또는 "NASDAQ"
+        as_of: 기준일 (None이면 오늘). 이 날짜 이전의 가장 가까운 스냅샷을 반환하며, 없으면 None.
+        ttl: 스냅샷 유효 시간 (초)
     """
-    return _retry(fdr.StockListing, market)
+    provider = get_provider()
+    if not provider.cacheable:
+        return _retry(provider.stock_listing, market)
 
+    today = date.today().strftime("%Y-%m-%d")
+    age = listing_snapshot_age(market)
+    if age is None or age > ttl:
+        try:
+            df = _retry(provider.stock_listing, market)
+            if df is not None and not df.empty:
+                save_listing_snapshot(market, today, df)
+        except Exception as e:
+            if age is None:
+                raise
+            logger.warning("Failed to refresh %s listing, using stored snapshot: %s", market, e)
 
-def fetch_price_data(code: str, start: str, end: str) -> pd.DataFrame:
-    """개별 종목의 일별 가격 데이터를 반환한다. 캐시를 우선 확인한다."""
-    cached = load_from_cache(code, start, end)
-    if cached is not None:
-        return cached
+    snapshot = load_listing_snapshot(market, as_of or today)
+    if snapshot is None:
+        logger.warning("No %s listing snapshot on or before %s", market, as_of or today)
+        return None
+    return snapshot[1]
+
+
+def _fetch_with_cache(
+    symbol: str,
+    cache_key: str,
+    start: str,
+    end: str,
+    limiter: TokenBucket | None = None,
+    columns: list[str] | None = None,
+    breaker: CircuitBreaker | None = None,
+) -> pd.DataFrame | None:
+    """캐시에 없는 앞/뒤 구간만 내려받아 병합한 뒤 [start, end] 구간을 반환한다.
+
+    캐시하지 않는 공급자는 매번 요청 구간 전체를 받는다. 새로 받은 데이터의
+    메모리 크기는 반환 DataFrame의 attrs["fetched_nbytes"]에 기록한다.
+    """
+    provider = get_provider()
+    if not provider.cacheable:
+        df = _retry(provider.data_reader, symbol, start, end, limiter=limiter, breaker=breaker)
+        if df is None:
+            return df
+        fetched_nbytes = int(df.memory_usage(index=True).sum())
+        if columns is not None:
+            source_nbytes = len(df) * 8 * (len(df.columns) + 1)
+            df = df[[name for name in columns if name in df.columns]]
+            df.attrs["source_nbytes"] = source_nbytes
+        df.attrs["fetched_nbytes"] = fetched_nbytes
+        return df
 
-    df = _retry(fdr.DataReader, code, start, end)
-    if df is not None and not df.empty:
-        save_to_cache(code, start, end, df)
+    fetched_nbytes = 0
+    for seg_start, seg_end in get_missing_ranges(cache_key, start, end):
+        df = _retry(provider.data_reader, symbol, seg_start, seg_end, limiter=limiter, breaker=breaker)
+        if df is not None:
+            fetched_nbytes += int(df.memory_usage(index=True).sum())
+        save_to_cache(cache_key, seg_start, seg_end, df)
+    df = read_cached_slice(cache_key, start, end, columns=columns)
+    if df is not None:
+        df.attrs["fetched_nbytes"] = fetched_nbytes
     return df
 
 
+def fetch_price_data(
+    code: str,
+    start: str,
+    end: str,
+    limiter: TokenBucket | None = None,
+    columns: list[str] | None = None,
+    downcast: bool = False,
+    breaker: CircuitBreaker | None = None,
+) -> pd.DataFrame | None:
+    """개별 종목의 일별 가격 데이터를 반환한다. 캐시를 우선 확인한다.
+
+    Args:
+        columns: 읽을 컬럼 (None이면 전체)
+        downcast: True이면 downcast_prices로 메모리를 줄인다
+        breaker: 주어지면 열려 있을 때 요청하지 않고 CircuitOpenError를 던진다
+    """
+    df = _fetch_with_cache(code, code, start, end, limiter=limiter, columns=columns, breaker=breaker)
+    return _maybe_downcast(df, downcast)
+
+
+def _maybe_downcast(df: pd.DataFrame | None, downcast: bool) -> pd.DataFrame | None:
+    if not downcast or df is None:
+        return df
+    attrs = dict(df.attrs)
+    df = downcast_prices(df)
+    df.attrs.update(attrs)
+    return df
+
+
+def _read_cache_only(
+    code: str, start: str, end: str, columns: list[str] | None, downcast: bool
+) -> pd.DataFrame | None:
+    """네트워크 요청 없이 캐시에 있는 [start, end] 부분만 반환한다."""
+    if not get_provider().cacheable or get_cached_range(code) is None:
+        return None
+    df = read_cached_slice(code, start, end, columns=columns)
+    if df is None or df.empty:
+        return None
+    return _maybe_downcast(df, downcast)
+
+
+def _fetch_one(
+    code: str,
+    start: str,
+    end: str,
+    limiter: TokenBucket | None,
+    columns: list[str] | None = None,
+    downcast: bool = False,
+    breaker: CircuitBreaker | None = None,
+    negative: bool = False,
+) -> tuple[pd.DataFrame | None, str]:
+    """단일 종목을 수집한다. 실패 시 로그만 남긴다.
+
+    네거티브 캐시에 있는 종목이나 차단기가 열린 뒤의 종목은 요청하지 않고
+    캐시에 있는 데이터만 반환한다.
+
+    Returns:
+        (DataFrame 또는 None, 결과). 결과는 "loaded", "failed", "negative", "breaker" 중 하나.
+    """
+    if negative and negative_cache().is_blocked(code):
+        return _read_cache_only(code, start, end, columns, downcast), "negative"
+    if breaker is not None and breaker.is_open:
+        return _read_cache_only(code, start, end, columns, downcast), "breaker"
+    try:
+        df = fetch_price_data(code, start, end, limiter=limiter, columns=columns,
+                              downcast=downcast, breaker=breaker)
+    except CircuitOpenError:
+        return _read_cache_only(code, start, end, columns, downcast), "breaker"
+    except Exception as e:
+        logger.warning("Failed to fetch %s: %s", code, e)
+        if negative and not (breaker is not None and breaker.is_open):
+            negative_cache().add(code, str(e))
+        if breaker is not None and breaker.record_failure(code):
+            logger.warning("Circuit breaker opened after %d consecutive failures; serving cache only",
+                           breaker.threshold)
+            if negative:
+                # 연속 실패는 종목 문제가 아니라 공급자 장애일 가능성이 높다
+                for failed_code in breaker.tripped_by:
+                    negative_cache().discard(failed_code)
+        if negative and breaker is not None and breaker.is_open:
+            # 차단기가 열릴 때 진행 중이던 요청의 실패도 공급자 장애로 보고 남기지 않는다
+            negative_cache().discard(code)
+        return None, "failed"
+    if breaker is not None:
+        breaker.record_success()
+    if negative:
+        negative_cache().discard(code)
+    if df is None or df.empty:
+        return None, "failed"
+    return df, "loaded"
+
+
+def iter_prices(
+    codes: list[str],
+    start: str,
+    end: str,
+    progress_callback=None,
+    max_workers: int = 1,
+    rate_limit: float | None = None,
+    columns: list[str] | None = None,
+    downcast: bool = False,
+    stats: FetchStats | None = None,
+    breaker_threshold: int | None = BREAKER_THRESHOLD,
+    use_negative_cache: bool = True,
+    limiter: TokenBucket | None = None,
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """여러 종목의 가격 데이터를 수집이 끝나는 순서대로 (종목코드, DataFrame)으로 내보낸다.
+
+    동시에 진행 중이거나 소비를 기다리는 요청은 max_workers * 2개로 제한하므로,
+    소비하는 쪽이 받은 DataFrame을 바로 버리면 메모리에는 그만큼만 남는다.
+    인자는 fetch_all_prices와 같다. stats는 반복이 끝나거나 중단될 때 채워진다.
+    """
+    if limiter is None and rate_limit:
+        limiter = TokenBucket(rate_limit)
+    breaker = CircuitBreaker(breaker_threshold) if breaker_threshold else None
+    negative = use_negative_cache and get_provider().cacheable
+    unique_codes = list(dict.fromkeys(codes))
+    total = len(unique_codes)
+    stats = stats if stats is not None else FetchStats()
+    outcomes: dict[str, str] = {}
+
+    def account(code: str, df: pd.DataFrame | None, outcome: str) -> None:
+        outcomes[code] = outcome
+        if df is None:
+            return
+        loaded_bytes = int(df.memory_usage(index=True).sum())
+        stats.loaded += 1
+        stats.loaded_bytes += loaded_bytes
+        stats.source_bytes += df.attrs.get("source_nbytes", loaded_bytes)
+        stats.fetched_bytes += df.attrs.get("fetched_nbytes", 0)
+
+    args = (start, end, limiter, columns, downcast, breaker, negative)
+    try:
+        if max_workers <= 1:
+            for i, code in enumerate(unique_codes):
+                df, outcome = _fetch_one(code, *args)
+                account(code, df, outcome)
+                if progress_callback:
+                    progress_callback(i + 1, total)
+                if df is not None:
+                    yield code, df
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                queued = iter(unique_codes)
+                in_flight = {}
+                for code in islice(queued, max_workers * 2):
+                    in_flight[executor.submit(_fetch_one, code, *args)] = code
+                completed = 0
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        code = in_flight.pop(future)
+                        next_code = next(queued, None)
+                        if next_code is not None:
+                            in_flight[executor.submit(_fetch_one, next_code, *args)] = next_code
+                        df, outcome = future.result()
+                        account(code, df, outcome)
+                        completed += 1
+                        if progress_callback:
+                            progress_callback(completed, total)
+                        if df is not None:
+                            yield code, df
+                        del df
+    finally:
+        flush_manifest()
+        stats.breaker_tripped = breaker is not None and breaker.is_open
+        _report_stats(stats, unique_codes, outcomes)
+
+
 def fetch_all_prices(
-    codes: list[str], start: str, end: str, progress_callback=None
+    codes: list[str],
+    start: str,
+    end: str,
+    progress_callback=None,
+    max_workers: int = 1,
+    rate_limit: float | None = None,
+    columns: list[str] | None = None,
+    downcast: bool = False,
+    stats: FetchStats | None = None,
+    breaker_threshold: int | None = BREAKER_THRESHOLD,
+    use_negative_cache: bool = True,
+    limiter: TokenBucket | None = None,
 ) -> dict[str, pd.DataFrame]:
-    """여러 종목의 가격 데이터를 딕셔너리로 반환한다."""
-    result: dict[str, pd.DataFrame] = {}
-    for i, code in enumerate(codes):
-        try:
-            df = fetch_price_data(code, start, end)
-            if df is not None and not df.empty:
-                result[code] = df
-        except Exception as e:
-            logger.warning("Failed to fetch %s: %s", code, e)
-        if progress_callback:
-            progress_callback(i + 1, len(codes))
-    return result
+    """여러 종목의 가격 데이터를 딕셔너리로 반환한다.
 
+    Args:
+        codes: 종목코드 리스트
+        start: 시작일
+        end: 종료일
+        progress_callback: (current, total) 콜백. 항상 호출 스레드에서 호출된다.
+        max_workers: 동시 수집 워커 수 (1이면 순차 수집)
+        rate_limit: 전체 워커가 공유하는 초당 최대 요청 수 (None이면 무제한)
+        columns: 읽을 컬럼 (예: ["Close"]). None이면 전체 컬럼
+        downcast: 가격은 float32, 거래량은 int32/int64로 변환
+        stats: 주어지면 수집 결과와 메모리 절감량을 기록한다
+        breaker_threshold: 이 횟수만큼 연속 실패하면 남은 종목은 캐시에서만 읽는다
+            (None이면 차단기를 쓰지 않는다)
+        use_negative_cache: 최근 실패한 종목은 만료 전까지 요청하지 않고 캐시에서만 읽는다
+        limiter: 여러 번의 호출이 함께 쓸 속도 제한기. 주어지면 rate_limit 대신 사용한다
 
-def fetch_kospi_index(start: str, end: str) -> pd.DataFrame:
-    """KOSPI 지수(KS11) 데이터를 반환한다."""
-    cached = load_from_cache("KS11", start, end)
-    if cached is not None:
-        return cached
+    Returns:
+        {종목코드: 가격 DataFrame}. 수집 순서와 무관하게 codes 순서를 유지한다.
+    """
+    frames = dict(iter_prices(
+        codes, start, end,
+        progress_callback=progress_callback,
+        max_workers=max_workers,
+        rate_limit=rate_limit,
+        columns=columns,
+        downcast=downcast,
+        stats=stats,
+        breaker_threshold=breaker_threshold,
+        use_negative_cache=use_negative_cache,
+        limiter=limiter,
+    ))
+    return {code: frames[code] for code in dict.fromkeys(codes) if code in frames}
 
-    df = _retry(fdr.DataReader, "KS11", start, end)
-    if df is not None and not df.empty:
-        save_to_cache("KS11", start, end, df)
-    return df
 
+def _report_stats(stats: FetchStats, codes: list[str], outcomes: dict[str, str]) -> None:
+    """종목별 수집 결과를 stats에 기록하고 요약 로그를 남긴다."""
+    stats.requested = len(codes)
+    stats.failed = [code for code in codes if outcomes.get(code) == "failed"]
+    stats.negative_skipped = [code for code in codes if outcomes.get(code) == "negative"]
+    stats.breaker_skipped = [code for code in codes if outcomes.get(code) == "breaker"]
+    logger.info(
+        "Fetched %d/%d codes (%d failed, %d skipped by negative cache, %d skipped by open breaker): "
+        "%.1f MB in memory, %.1f MB saved",
+        stats.loaded, stats.requested, len(stats.failed),
+        len(stats.negative_skipped), len(stats.breaker_skipped),
+        stats.loaded_bytes / 1e6, stats.saved_bytes / 1e6,
+    )
 
-def fetch_nasdaq_index(start: str, end: str) -> pd.DataFrame:
-    """NASDAQ Composite(IXIC) 지수 데이터를 반환한다."""
-    cached = load_from_cache("IXIC", start, end)
-    if cached is not None:
-        return cached
 
-    df = _retry(fdr.DataReader, "IXIC", start, end)
-    if df is not None and not df.empty:
-        save_to_cache("IXIC", start, end, df)
-    return df
+def fetch_kospi_index(start: str, end: str) -> pd.DataFrame | None:
+    """KOSPI 지수(KS11) 데이터를 반환한다."""
+    return _fetch_with_cache("KS11", "KS11", start, end)
 
 
-def fetch_exchange_rate(start: str, end: str) -> pd.DataFrame:
-    """USD/KRW 일별 환율 데이터를 반환한다."""
-    cached = load_from_cache("USD_KRW", start, end)
-    if cached is not None:
-        return cached
+def fetch_nasdaq_index(start: str, end: str) -> pd.DataFrame | None:
+    """NASDAQ Composite(IXIC) 지수 데이터를 반환한다."""
+    return _fetch_with_cache("IXIC", "IXIC", start, end)
 
-    df = _retry(fdr.DataReader, "USD/KRW", start, end)
-    if df is not None and not df.empty:
-        save_to_cache("USD_KRW", start, end, df)
-    return df
+
+def fetch_exchange_rate(start: str, end: str) -> pd.DataFrame | None:
+    """USD/KRW 일별 환율 데이터를 반환한다."""
+    return _fetch_with_cache("USD/KRW", "USD_KRW", start, end)
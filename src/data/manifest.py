@@ -0,0 +1,197 @@
+"""캐시 매니페스트 모듈 - 캐시 항목 색인 및 용량 기반 LRU 정리.
+
+캐시 디렉터리의 manifest.json에 항목별 종목코드, 보관 구간, 행 수, 파일 크기,
+마지막 접근 시각, 내용 체크섬을 기록한다. 프로세스당 한 번만 읽고, 이후 조회는
+메모리 안의 딕셔너리로 처리한다.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+# 지수/환율 시계열 - 용량 정리 대상에서 제외한다
+PINNED_KEYS = frozenset({"KS11", "IXIC", "USD_KRW"})
+
+# 이 개수나 시간(초)만큼 변경이 쌓이면 자동 저장한다
+FLUSH_EVERY_RECORDS = 100
+FLUSH_EVERY_SECONDS = 5.0
+
+
+def file_checksum(data: bytes) -> str:
+    """내용 체크섬(sha256)을 반환한다."""
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass
+class ManifestEntry:
+    """캐시 항목 하나의 메타데이터."""
+    code: str
+    start: str
+    end: str
+    rows: int
+    nbytes: int
+    last_access: float
+    checksum: str
+
+
+class CacheManifest:
+    """캐시 디렉터리 하나에 대한 매니페스트.
+
+    스레드 안전하며, 변경 사항은 메모리에 모았다가 flush()에서 한 번에 저장한다.
+    저장 시 디스크의 최신 매니페스트와 병합하므로 여러 프로세스가 같은 캐시를
+    써도 서로의 항목을 지우지 않는다.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / MANIFEST_FILE
+        self.entries: dict[str, ManifestEntry] = self._read_disk()
+        self._removed: set[str] = set()
+        self._dirty = False
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    def _read_disk(self) -> dict[str, ManifestEntry]:
+        if not self.path.exists():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable cache manifest %s: %s", self.path, e)
+            return {}
+        return {code: ManifestEntry(**item) for code, item in raw.get("entries", {}).items()}
+
+    def get(self, code: str) -> ManifestEntry | None:
+        """항목을 반환한다. 없으면 None."""
+        return self.entries.get(code)
+
+    def record(self, code: str, start: str, end: str, rows: int, nbytes: int, checksum: str) -> None:
+        """항목을 추가하거나 갱신한다. 변경이 충분히 쌓였으면 저장한다."""
+        with self._lock:
+            self.entries[code] = ManifestEntry(
+                code=code, start=start, end=end, rows=rows, nbytes=nbytes,
+                last_access=time.time(), checksum=checksum,
+            )
+            self._removed.discard(code)
+            self._dirty = True
+            self._pending += 1
+            if (self._pending >= FLUSH_EVERY_RECORDS
+                    or time.monotonic() - self._last_flush >= FLUSH_EVERY_SECONDS):
+                self.flush()
+
+    def touch(self, code: str) -> None:
+        """마지막 접근 시각을 갱신한다 (저장은 flush 시점)."""
+        with self._lock:
+            entry = self.entries.get(code)
+            if entry is not None:
+                entry.last_access = time.time()
+                self._dirty = True
+
+    def remove(self, code: str, delete_file: bool = False) -> None:
+        """항목을 제거한다. delete_file이면 캐시 파일도 지운다."""
+        with self._lock:
+            self.entries.pop(code, None)
+            self._removed.add(code)
+            self._dirty = True
+            if delete_file:
+                (self.cache_dir / f"{code}.parquet").unlink(missing_ok=True)
+
+    def total_bytes(self) -> int:
+        """매니페스트에 기록된 전체 캐시 크기를 반환한다."""
+        return sum(e.nbytes for e in self.entries.values())
+
+    def evict(self, budget_bytes: int, protect: set[str] | None = None) -> list[str]:
+        """전체 크기가 budget_bytes 이하가 될 때까지 오래 안 쓴 항목부터 지운다.
+
+        Args:
+            budget_bytes: 허용 디스크 용량
+            protect: 이번 정리에서 제외할 추가 종목코드 (고정 항목은 항상 제외)
+
+        Returns:
+            삭제한 종목코드 리스트
+        """
+        protected = PINNED_KEYS | (protect or set())
+        evicted: list[str] = []
+        with self._lock:
+            total = self.total_bytes()
+            if total <= budget_bytes:
+                return evicted
+            candidates = sorted(
+                (e for e in self.entries.values() if e.code not in protected),
+                key=lambda e: e.last_access,
+            )
+            for entry in candidates:
+                if total <= budget_bytes:
+                    break
+                self.remove(entry.code, delete_file=True)
+                total -= entry.nbytes
+                evicted.append(entry.code)
+            if evicted:
+                logger.info("Evicted %d cache entries to fit %d bytes", len(evicted), budget_bytes)
+                self.flush()
+        return evicted
+
+    def flush(self) -> None:
+        """변경 사항이 있으면 디스크 매니페스트와 병합해 저장한다."""
+        with self._lock:
+            if not self._dirty:
+                return
+            merged = {
+                code: entry for code, entry in self._read_disk().items()
+                if code not in self._removed
+            }
+            for code, entry in self.entries.items():
+                on_disk = merged.get(code)
+                if on_disk is not None and on_disk.checksum == entry.checksum:
+                    entry.last_access = max(entry.last_access, on_disk.last_access)
+                merged[code] = entry
+            self.entries = merged
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            payload = {"entries": {code: asdict(e) for code, e in sorted(merged.items())}}
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+
+_manifests: dict[Path, CacheManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_manifest(cache_dir: Path) -> CacheManifest:
+    """캐시 디렉터리의 매니페스트를 반환한다. 프로세스당 디렉터리별로 한 번만 읽는다."""
+    key = Path(cache_dir).resolve()
+    with _manifests_lock:
+        manifest = _manifests.get(key)
+        if manifest is None:
+            manifest = CacheManifest(cache_dir)
+            _manifests[key] = manifest
+        return manifest
+
+
+def flush_all() -> None:
+    """열려 있는 모든 매니페스트를 저장한다."""
+    with _manifests_lock:
+        manifests = list(_manifests.values())
+    for manifest in manifests:
+        try:
+            manifest.flush()
+        except OSError as e:
+            logger.warning("Failed to flush cache manifest %s: %s", manifest.path, e)
+
+
+atexit.register(flush_all)
@@ -0,0 +1,131 @@
+"""실패 종목 네거티브 캐시 모듈.
+
+상장폐지되었거나 공급자가 지원하지 않는 종목은 매번 재시도 대기(1s + 2s)만
+소모하고 실패한다. 재시도까지 실패한 종목을 만료 시각과 함께 기록해 두고,
+만료 전까지는 네트워크 요청 없이 건너뛴다. 기록은 캐시 디렉터리의
+negative.json에 저장한다.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+NEGATIVE_CACHE_FILE = "negative.json"
+NEGATIVE_TTL = 24 * 60 * 60  # seconds
+
+
+@dataclass
+class NegativeEntry:
+    """실패 종목 하나의 기록."""
+    code: str
+    error: str
+    failures: int
+    expires_at: float
+
+
+class NegativeCache:
+    """캐시 디렉터리 하나에 대한 실패 종목 기록. 스레드 안전하다.
+
+    연속으로 실패할 때마다 만료 시간을 두 배로 늘린다 (최대 max_ttl).
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float = NEGATIVE_TTL, max_ttl: float | None = None):
+        self.cache_dir = Path(cache_dir)
+        self.path = self.cache_dir / NEGATIVE_CACHE_FILE
+        self.ttl = ttl
+        self.max_ttl = max_ttl if max_ttl is not None else 7 * ttl
+        self.entries: dict[str, NegativeEntry] = self._read_disk()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _read_disk(self) -> dict[str, NegativeEntry]:
+        if not self.path.exists():
+            return {}
+        try:
+            raw = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable negative cache %s: %s", self.path, e)
+            return {}
+        return {code: NegativeEntry(**item) for code, item in raw.items()}
+
+    def is_blocked(self, code: str, now: float | None = None) -> bool:
+        """code가 만료되지 않은 실패 기록을 가지고 있으면 True."""
+        entry = self.entries.get(code)
+        return entry is not None and entry.expires_at > (now if now is not None else time.time())
+
+    def add(self, code: str, error: str) -> NegativeEntry:
+        """실패를 기록한다. 이미 기록된 종목이면 만료 시간을 두 배로 늘린다."""
+        with self._lock:
+            previous = self.entries.get(code)
+            failures = previous.failures + 1 if previous is not None else 1
+            ttl = min(self.ttl * 2 ** (failures - 1), self.max_ttl)
+            entry = NegativeEntry(code=code, error=error[:200], failures=failures,
+                                  expires_at=time.time() + ttl)
+            self.entries[code] = entry
+            self._dirty = True
+            return entry
+
+    def discard(self, code: str) -> None:
+        """기록을 지운다 (수집에 성공했거나 실패 원인이 종목이 아닐 때)."""
+        with self._lock:
+            if self.entries.pop(code, None) is not None:
+                self._dirty = True
+
+    def purge_expired(self) -> list[str]:
+        """만료된 기록을 지우고 지운 종목코드를 반환한다."""
+        now = time.time()
+        with self._lock:
+            expired = [code for code, e in self.entries.items() if e.expires_at <= now]
+            for code in expired:
+                del self.entries[code]
+            if expired:
+                self._dirty = True
+        return expired
+
+    def flush(self) -> None:
+        """변경 사항이 있으면 저장한다."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            payload = {code: asdict(e) for code, e in sorted(self.entries.items())}
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+_caches: dict[Path, NegativeCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_negative_cache(cache_dir: Path) -> NegativeCache:
+    """캐시 디렉터리의 네거티브 캐시를 반환한다. 프로세스당 디렉터리별로 한 번만 읽는다."""
+    key = Path(cache_dir).resolve()
+    with _caches_lock:
+        negative = _caches.get(key)
+        if negative is None:
+            negative = NegativeCache(cache_dir)
+            _caches[key] = negative
+        return negative
+
+
+def flush_all() -> None:
+    """열려 있는 모든 네거티브 캐시를 저장한다."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for negative in caches:
+        try:
+            negative.flush()
+        except OSError as e:
+            logger.warning("Failed to flush negative cache %s: %s", negative.path, e)
+
+
+atexit.register(flush_all)
@@ -0,0 +1,109 @@
+"""메모리 매핑 기반 날짜 × 종목 가격 패널 모듈.
+
+종가를 (날짜 수, 종목 수) float64 행렬 하나로 보관한다. 디스크에는 .npy 파일로
+저장하고 np.load(mmap_mode="r")로 열기 때문에 역직렬화나 복사 없이 바로 읽으며,
+같은 머신의 여러 프로세스가 OS 페이지 캐시를 공유한다.
+
+행렬은 Fortran(열 우선) 순서로 저장해 종목 하나의 시계열이 연속 메모리가 된다.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PANEL_DIR = Path(".panel")
+
+_CLOSE_FILE = "close.npy"
+_DATES_FILE = "dates.npy"
+_META_FILE = "meta.json"
+
+
+@dataclass
+class PricePanel:
+    """날짜 × 종목 종가 패널. 거래가 없는 칸은 NaN."""
+    dates: pd.DatetimeIndex
+    codes: list[str]
+    close: np.ndarray  # shape (len(dates), len(codes))
+    start: str = ""
+    end: str = ""
+
+    def column_index(self) -> dict[str, int]:
+        """{종목코드: 열 번호} 매핑을 반환한다."""
+        return {code: j for j, code in enumerate(self.codes)}
+
+    def to_price_data(self) -> dict[str, pd.DataFrame]:
+        """run_backtest 입력 형태의 {종목코드: DataFrame}을 반환한다.
+
+        종목의 유효 구간 안에 빈 날이 없으면 패널 메모리를 그대로 참조하는
+        뷰를 만들고, 거래정지 등으로 중간이 빈 종목만 복사한다.
+        """
+        dates = self.dates
+        result: dict[str, pd.DataFrame] = {}
+        for j, code in enumerate(self.codes):
+            column = self.close[:, j]
+            valid = ~np.isnan(column)
+            rows = np.flatnonzero(valid)
+            if len(rows) == 0:
+                continue
+            first, last = rows[0], rows[-1] + 1
+            if len(rows) == last - first:
+                values, index = column[first:last], dates[first:last]
+            else:
+                values, index = column[rows], dates[rows]
+            result[code] = pd.DataFrame({"Close": values}, index=index, copy=False)
+        return result
+
+
+def build_panel(
+    price_data: dict[str, pd.DataFrame], start: str = "", end: str = ""
+) -> PricePanel:
+    """{종목코드: DataFrame}에서 종가 패널을 만든다. 열 순서는 딕셔너리 순서를 따른다."""
+    codes = [code for code, df in price_data.items() if "Close" in df.columns and not df.empty]
+    all_dates: set[pd.Timestamp] = set()
+    for code in codes:
+        all_dates.update(price_data[code].index)
+    dates = pd.DatetimeIndex(sorted(all_dates), name="Date").as_unit("ns")
+
+    close = np.full((len(dates), len(codes)), np.nan, dtype=np.float64, order="F")
+    for j, code in enumerate(codes):
+        series = price_data[code]["Close"]
+        close[dates.get_indexer(series.index), j] = series.to_numpy(dtype=np.float64)
+    return PricePanel(dates=dates, codes=codes, close=close, start=start, end=end)
+
+
+def save_panel(panel: PricePanel, path: str | Path) -> None:
+    """패널을 디렉터리에 .npy + 메타데이터 JSON으로 저장한다."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / _CLOSE_FILE, np.asfortranarray(panel.close, dtype=np.float64))
+    np.save(path / _DATES_FILE, panel.dates.as_unit("ns").asi8)
+    meta = {"codes": list(panel.codes), "start": panel.start, "end": panel.end}
+    (path / _META_FILE).write_text(json.dumps(meta, ensure_ascii=False))
+
+
+def open_panel(path: str | Path) -> PricePanel | None:
+    """저장된 패널을 메모리 매핑으로 연다. 패널이 없으면 None."""
+    path = Path(path)
+    if not (path / _META_FILE).exists():
+        return None
+    meta = json.loads((path / _META_FILE).read_text())
+    close = np.load(path / _CLOSE_FILE, mmap_mode="r")
+    dates = np.load(path / _DATES_FILE, mmap_mode="r")
+    return PricePanel(
+        dates=pd.DatetimeIndex(dates.view("datetime64[ns]"), name="Date", copy=False),
+        codes=meta["codes"],
+        close=close,
+        start=meta.get("start", ""),
+        end=meta.get("end", ""),
+    )
+
+
+def load_panel(path: str | Path, start: str, end: str) -> PricePanel | None:
+    """저장된 패널이 같은 기간으로 만들어졌으면 열고, 아니면 None을 반환한다."""
+    panel = open_panel(path)
+    if panel is None or panel.start != start or panel.end != end:
+        return None
+    return panel
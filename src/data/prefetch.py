@@ -0,0 +1,211 @@
+"""캐시 사전 수집(prefetch) 모듈 - UI 없이 시장 전체 가격을 미리 받아둔다.
+
+시장별 진행 상황을 CACHE_DIR/prefetch/<시장>.json 체크포인트로 저장한다. 중간에
+중단된 실행은 다음 실행에서 끝낸 종목을 건너뛰고 이어서 받으며, 같은 구간을
+이미 끝낸 시장은 종목 목록에 새로 추가된 종목만 받는다.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from src.data import cache
+from src.data.fetcher import (
+    DEFAULT_MAX_WORKERS,
+    FetchStats,
+    TokenBucket,
+    fetch_all_prices,
+    fetch_exchange_rate,
+    fetch_kospi_index,
+    fetch_nasdaq_index,
+    fetch_stock_listing,
+)
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_SUBDIR = "prefetch"
+DEFAULT_CHECKPOINT_EVERY = 50  # 종목 수
+
+
+@dataclass
+class PrefetchCheckpoint:
+    """시장 하나의 사전 수집 진행 상황."""
+    market: str
+    start: str
+    end: str
+    listing: list[str] = field(default_factory=list)  # 마지막으로 본 종목 목록
+    done: list[str] = field(default_factory=list)     # 수집을 끝낸 종목
+    failed: list[str] = field(default_factory=list)   # 마지막 시도에서 실패한 종목
+    updated_at: float = 0.0
+
+
+@dataclass
+class PrefetchStats:
+    """사전 수집 실행 요약."""
+    market: str
+    listed: int = 0      # 현재 종목 목록의 종목 수
+    added: int = 0       # 이전 체크포인트 이후 새로 상장된 종목 수
+    removed: int = 0     # 이전 체크포인트 이후 목록에서 빠진 종목 수
+    skipped: int = 0     # 이미 끝나 건너뛴 종목 수
+    fetched: int = 0     # 이번 실행에서 수집한 종목 수
+    failed: list[str] = field(default_factory=list)
+    blocked: list[str] = field(default_factory=list)  # 네거티브 캐시/회로 차단으로 요청하지 않은 종목
+    nbytes: int = 0      # 이번 실행에서 공급자에서 새로 받은 데이터 크기
+    elapsed: float = 0.0
+
+    @property
+    def codes_per_sec(self) -> float:
+        attempted = self.fetched + len(self.failed)
+        return attempted / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.nbytes / 1e6 / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        """한 줄 요약 문자열을 반환한다."""
+        return (
+            f"{self.market}: {self.fetched} fetched, {self.skipped} skipped, "
+            f"{len(self.failed)} failed, {len(self.blocked)} blocked (listing {self.listed}, +{self.added}/-{self.removed}) "
+            f"in {self.elapsed:.1f}s - {self.codes_per_sec:.1f} codes/s, {self.mb_per_sec:.2f} MB/s"
+        )
+
+
+def get_checkpoint_path(market: str) -> Path:
+    """시장별 체크포인트 파일 경로를 반환한다."""
+    return cache.CACHE_DIR / PREFETCH_SUBDIR / f"{market}.json"
+
+
+def load_checkpoint(market: str) -> PrefetchCheckpoint | None:
+    """저장된 체크포인트를 읽는다. 없거나 읽을 수 없으면 None."""
+    path = get_checkpoint_path(market)
+    if not path.exists():
+        return None
+    try:
+        return PrefetchCheckpoint(**json.loads(path.read_text()))
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning("Ignoring unreadable prefetch checkpoint %s: %s", path, e)
+        return None
+
+
+def save_checkpoint(checkpoint: PrefetchCheckpoint) -> None:
+    """체크포인트를 원자적으로 저장한다."""
+    path = get_checkpoint_path(checkpoint.market)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    checkpoint.updated_at = time.time()
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(asdict(checkpoint), ensure_ascii=False))
+    os.replace(tmp_path, path)
+
+
+def _listing_codes(market: str, ttl: float) -> list[str]:
+    listing = fetch_stock_listing(market, ttl=ttl)
+    if listing is None or listing.empty:
+        return []
+    column = "Code" if "Code" in listing.columns else "Symbol"
+    return listing[column].astype(str).tolist()
+
+
+def _prefetch_benchmarks(market: str, start: str, end: str) -> None:
+    """시장 지수(와 NASDAQ의 경우 환율)를 함께 받아둔다."""
+    fetchers = [fetch_kospi_index] if market == "KOSPI" else [fetch_nasdaq_index, fetch_exchange_rate]
+    for fetch in fetchers:
+        try:
+            fetch(start, end)
+        except Exception as e:
+            logger.warning("Failed to prefetch %s for %s: %s", fetch.__name__, market, e)
+
+
+def prefetch_market(
+    market: str,
+    start: str,
+    end: str,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limit: float | None = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    restart: bool = False,
+    listing_ttl: float = 0.0,
+    progress_callback=None,
+) -> PrefetchStats:
+    """시장의 종목 목록과 전체 종목 가격을 캐시에 받아둔다.
+
+    checkpoint_every 종목마다 체크포인트를 저장한다. 같은 구간의 체크포인트가
+    있으면 끝낸 종목은 건너뛰고, 종목 목록에 새로 추가된 종목과 아직 못 받은
+    종목만 수집한다. 구간이 바뀌었거나 restart면 처음부터 다시 수집한다.
+    네거티브 캐시에 있는 종목은 만료될 때까지 blocked로 집계하고 넘어간다.
+
+    Args:
+        market: "KOSPI" 또는 "NASDAQ"
+        start: 시작일
+        end: 종료일
+        max_workers: 동시 수집 워커 수
+        rate_limit: 초당 최대 요청 수 (None이면 무제한)
+        checkpoint_every: 체크포인트 저장 간격 (종목 수)
+        restart: True이면 기존 체크포인트를 무시한다
+        listing_ttl: 종목 목록 스냅샷 유효 시간 (초, 기본값 0이면 항상 새로 받는다)
+        progress_callback: (current, total) 콜백
+
+    Returns:
+        PrefetchStats
+    """
+    stats = PrefetchStats(market=market)
+    started = time.perf_counter()
+
+    codes = _listing_codes(market, listing_ttl)
+    stats.listed = len(codes)
+    checkpoint = None if restart else load_checkpoint(market)
+    if checkpoint is not None and (checkpoint.start, checkpoint.end) != (start, end):
+        logger.info("%s checkpoint covers %s~%s; starting over for %s~%s",
+                    market, checkpoint.start, checkpoint.end, start, end)
+        checkpoint = None
+
+    if checkpoint is None:
+        checkpoint = PrefetchCheckpoint(market=market, start=start, end=end)
+    else:
+        previous = set(checkpoint.listing)
+        current = set(codes)
+        stats.added = len(current - previous)
+        stats.removed = len(previous - current)
+        if stats.added or stats.removed:
+            logger.info("%s listing changed: +%d/-%d codes", market, stats.added, stats.removed)
+    checkpoint.listing = codes
+    listed = set(codes)
+    checkpoint.done = [code for code in checkpoint.done if code in listed]
+
+    done = set(checkpoint.done)
+    pending = [code for code in codes if code not in done]
+    stats.skipped = len(codes) - len(pending)
+    checkpoint.failed = []
+
+    # 묶음마다 새 제한기를 만들면 경계마다 버스트가 생기므로 실행 전체가 하나를 쓴다
+    limiter = TokenBucket(rate_limit) if rate_limit else None
+    chunk_size = max(1, checkpoint_every)
+    for offset in range(0, len(pending), chunk_size):
+        chunk = pending[offset:offset + chunk_size]
+        fetch_stats = FetchStats()
+        frames = fetch_all_prices(
+            chunk, start, end, max_workers=max_workers, limiter=limiter,
+            columns=["Close"], stats=fetch_stats,
+        )
+        loaded = [code for code in chunk if code in frames]
+        del frames
+
+        stats.fetched += len(loaded)
+        stats.failed.extend(fetch_stats.failed)
+        stats.blocked.extend(fetch_stats.negative_skipped + fetch_stats.breaker_skipped)
+        stats.nbytes += fetch_stats.fetched_bytes
+        checkpoint.done.extend(loaded)
+        checkpoint.failed.extend(fetch_stats.failed)
+        save_checkpoint(checkpoint)
+        if progress_callback:
+            progress_callback(min(offset + chunk_size, len(pending)), len(pending))
+
+    if not pending:
+        save_checkpoint(checkpoint)
+    _prefetch_benchmarks(market, start, end)
+    stats.elapsed = time.perf_counter() - started
+    logger.info(stats.summary())
+    return stats
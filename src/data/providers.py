@@ -0,0 +1,74 @@
+"""데이터 공급자 인터페이스 모듈.
+
+fetcher의 종목 목록/가격/지수/환율 수집은 모두 현재 공급자를 거친다. 기본 공급자는
+FinanceDataReader이며, set_provider()나 use_provider()로 다른 공급자
+(예: src.data.synthetic.SyntheticProvider)로 교체할 수 있다.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+import FinanceDataReader as fdr
+import pandas as pd
+
+
+class DataProvider(ABC):
+    """시장 데이터 공급자.
+
+    Attributes:
+        name: 공급자 이름
+        cacheable: False이면 fetcher가 로컬 캐시를 읽거나 쓰지 않는다
+    """
+    name: str = "provider"
+    cacheable: bool = True
+
+    @abstractmethod
+    def stock_listing(self, market: str) -> pd.DataFrame:
+        """시장의 상장 종목 목록을 반환한다 (fdr.StockListing과 같은 형태)."""
+
+    @abstractmethod
+    def data_reader(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+        """종목/지수/환율 심볼의 일별 데이터를 반환한다 (fdr.DataReader와 같은 형태).
+
+        지수는 "KS11", "IXIC", 환율은 "USD/KRW" 심볼을 사용한다.
+        """
+
+
+class FdrProvider(DataProvider):
+    """FinanceDataReader 기반 공급자."""
+    name = "fdr"
+    cacheable = True
+
+    def stock_listing(self, market: str) -> pd.DataFrame:
+        return fdr.StockListing(market)
+
+    def data_reader(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+        return fdr.DataReader(symbol, start, end)
+
+
+_provider: DataProvider = FdrProvider()
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> DataProvider:
+    """현재 데이터 공급자를 반환한다."""
+    return _provider
+
+
+def set_provider(provider: DataProvider) -> DataProvider:
+    """데이터 공급자를 교체하고 이전 공급자를 반환한다."""
+    global _provider
+    with _provider_lock:
+        previous, _provider = _provider, provider
+    return previous
+
+
+@contextmanager
+def use_provider(provider: DataProvider):
+    """with 블록 안에서만 provider를 사용한다."""
+    previous = set_provider(provider)
+    try:
+        yield provider
+    finally:
+        set_provider(previous)
@@ -0,0 +1,222 @@
+"""시장 단위 통합 Parquet 가격 저장소 모듈.
+
+시장 전체 종목을 하나의 Arrow 데이터셋에 보관한다. 디렉터리는
+market=<시장>/year=<연도> 형태로 파티셔닝하고 종목코드는 Code 컬럼으로 둔다.
+종목마다 파일을 여는 대신 한 번의 스캔으로 시장 전체를 읽는다.
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from src.data import cache
+
+STORE_DIR = Path(".store")
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+# 지수/환율 캐시 키 - 종목 데이터셋으로 옮기지 않는다
+NON_EQUITY_KEYS = frozenset({"KS11", "IXIC", "USD_KRW"})
+
+_LEGACY_CACHE_NAME = re.compile(r"^(?P<code>.+)_\d{4}-\d{2}-\d{2}_\d{4}-\d{2}-\d{2}$")
+_PARTITIONING = ds.partitioning(
+    pa.schema([("market", pa.string()), ("year", pa.int32())]), flavor="hive",
+)
+
+
+def _resolve_root(root: str | Path | None) -> Path:
+    return Path(root) if root is not None else STORE_DIR
+
+
+def _open_dataset(root: Path) -> ds.Dataset | None:
+    if not root.exists():
+        return None
+    dataset = ds.dataset(root, format="parquet", partitioning=_PARTITIONING)
+    if "Code" not in dataset.schema.names:
+        return None
+    return dataset
+
+
+def _to_long_frame(price_data: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """{종목코드: DataFrame}을 Code/Date 컬럼을 가진 long 포맷으로 변환한다."""
+    frames = []
+    for code, df in price_data.items():
+        if df is None or df.empty:
+            continue
+        long_df = df.rename_axis("Date").reset_index()
+        long_df.insert(0, "Code", code)
+        frames.append(long_df)
+    if not frames:
+        return pd.DataFrame(columns=["Code", "Date"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _split_by_code(df: pd.DataFrame, codes: list[str] | None) -> dict[str, pd.DataFrame]:
+    """Code 기준으로 정렬된 long 포맷 DataFrame을 종목별 DataFrame으로 나눈다."""
+    if df.empty:
+        return {}
+    code_values = df.pop("Code").to_numpy()
+    df = df.set_index("Date")
+    bounds = np.flatnonzero(code_values[1:] != code_values[:-1]) + 1
+    starts = np.concatenate([[0], bounds])
+    stops = np.concatenate([bounds, [len(df)]])
+
+    result = {
+        code_values[a]: df.iloc[a:b]
+        for a, b in zip(starts, stops)
+    }
+    if codes is None:
+        return result
+    return {code: result[code] for code in codes if code in result}
+
+
+def read_market(
+    market: str,
+    start: str | None = None,
+    end: str | None = None,
+    codes: list[str] | None = None,
+    columns: list[str] | None = None,
+    root: str | Path | None = None,
+) -> dict[str, pd.DataFrame]:
+    """시장 전체 가격 데이터를 한 번에 읽어 run_backtest 입력 형태로 반환한다.
+
+    Args:
+        market: 시장명 (예: "KOSPI")
+        start: 시작일 (포함)
+        end: 종료일 (포함)
+        codes: 읽을 종목코드. 주어지면 반환 딕셔너리도 이 순서를 따른다.
+        columns: 읽을 가격 컬럼 (None이면 전체)
+        root: 저장소 루트 디렉터리
+
+    Returns:
+        {종목코드: 가격 DataFrame}
+    """
+    dataset = _open_dataset(_resolve_root(root))
+    if dataset is None:
+        return {}
+
+    expr = ds.field("market") == market
+    if start is not None:
+        start_ts = pd.Timestamp(start)
+        expr &= (ds.field("year") >= start_ts.year) & (ds.field("Date") >= start_ts)
+    if end is not None:
+        end_ts = pd.Timestamp(end)
+        expr &= (ds.field("year") <= end_ts.year) & (ds.field("Date") <= end_ts)
+    if codes is not None:
+        expr &= ds.field("Code").isin(codes)
+
+    if columns is not None:
+        read_columns = ["Code", "Date"] + [c for c in columns if c not in ("Code", "Date")]
+    else:
+        read_columns = [name for name in dataset.schema.names if name not in ("market", "year")]
+
+    table = dataset.to_table(columns=read_columns, filter=expr)
+    table = table.sort_by([("Code", "ascending"), ("Date", "ascending")])
+    return _split_by_code(table.to_pandas(), codes)
+
+
+def write_market(
+    market: str,
+    price_data: dict[str, pd.DataFrame],
+    root: str | Path | None = None,
+    compression: str = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> int:
+    """종목별 가격 데이터를 시장 데이터셋에 병합 저장한다.
+
+    새 데이터가 포함하는 연도 파티션만 다시 쓰며, 같은 (종목, 날짜)는 새 값으로 덮어쓴다.
+
+    Args:
+        market: 시장명
+        price_data: {종목코드: 가격 DataFrame}
+        root: 저장소 루트 디렉터리
+        compression: Parquet 압축 코덱 ("zstd", "snappy", "lz4", "gzip", "none")
+        row_group_size: row group 당 최대 행 수
+
+    Returns:
+        저장된 행 수
+    """
+    root = _resolve_root(root)
+    combined = _to_long_frame(price_data)
+    if combined.empty:
+        return 0
+
+    years = sorted(combined["Date"].dt.year.unique().tolist())
+    existing = read_market(market, start=f"{years[0]}-01-01", end=f"{years[-1]}-12-31", root=root)
+    if existing:
+        combined = pd.concat([_to_long_frame(existing), combined], ignore_index=True)
+        combined = combined.drop_duplicates(subset=["Code", "Date"], keep="last")
+
+    combined = combined.sort_values(["Code", "Date"], kind="stable")
+    combined["market"] = market
+    combined["year"] = combined["Date"].dt.year.astype("int32")
+
+    table = pa.Table.from_pandas(combined, preserve_index=False)
+    file_format = ds.ParquetFileFormat()
+    ds.write_dataset(
+        table,
+        root,
+        format=file_format,
+        partitioning=_PARTITIONING,
+        file_options=file_format.make_write_options(compression=compression),
+        max_rows_per_group=row_group_size,
+        min_rows_per_group=min(row_group_size, len(combined)),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+    )
+    return len(combined)
+
+
+def infer_market(code: str) -> str:
+    """종목코드 형태로 시장을 추정한다. 숫자로 시작하면 KOSPI, 아니면 NASDAQ."""
+    return "KOSPI" if code[:1].isdigit() else "NASDAQ"
+
+
+def migrate_cache(
+    cache_dir: str | Path | None = None,
+    root: str | Path | None = None,
+    market_map: dict[str, str] | None = None,
+    compression: str = DEFAULT_COMPRESSION,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> dict[str, int]:
+    """종목별 Parquet 캐시 파일을 시장 단위 데이터셋으로 옮긴다.
+
+    종목별 캐시({code}.parquet)와 예전 구간별 캐시({code}_{start}_{end}.parquet)를
+    모두 읽으며, 같은 종목의 여러 파일은 날짜 기준으로 병합한다.
+
+    Args:
+        cache_dir: 기존 캐시 디렉터리 (기본값: cache.CACHE_DIR)
+        root: 저장소 루트 디렉터리
+        market_map: {종목코드: 시장명}. 없는 종목은 infer_market으로 추정한다.
+        compression: Parquet 압축 코덱
+        row_group_size: row group 당 최대 행 수
+
+    Returns:
+        {시장명: 옮긴 종목 수}
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else cache.CACHE_DIR
+    market_map = market_map or {}
+
+    frames_by_code: dict[str, list[pd.DataFrame]] = {}
+    for path in sorted(cache_dir.glob("*.parquet")):
+        match = _LEGACY_CACHE_NAME.match(path.stem)
+        code = match.group("code") if match else path.stem
+        if code in NON_EQUITY_KEYS:
+            continue
+        frames_by_code.setdefault(code, []).append(pd.read_parquet(path))
+
+    by_market: dict[str, dict[str, pd.DataFrame]] = {}
+    for code, frames in frames_by_code.items():
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        market = market_map.get(code) or infer_market(code)
+        by_market.setdefault(market, {})[code] = df
+
+    for market, price_data in by_market.items():
+        write_market(market, price_data, root=root,
+                     compression=compression, row_group_size=row_group_size)
+    return {market: len(price_data) for market, price_data in by_market.items()}
@@ -0,0 +1,208 @@
+"""합성 시장 데이터 공급자 모듈 - 네트워크 없이 대규모 테스트용.
+
+시드가 같으면 항상 같은 데이터를 생성한다. 종목 가격은 시장 팩터와 종목 고유
+충격(t 분포)을 섞은 로그 수익률 경로로 만들고, 상장일/거래정지/가격 제한폭을
+반영한다. 종목별 경로는 고정된 기준일부터 생성하므로 어떤 구간을 요청해도
+같은 종목은 같은 값을 갖는다.
+
+사용 예:
+    from src.data.providers import use_provider
+    from src.data.synthetic import SyntheticProvider
+
+    with use_provider(SyntheticProvider(seed=7, n_kospi=5000, n_nasdaq=0)):
+        listing = fetch_stock_listing("KOSPI")
+"""
+
+import string
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from src.data.providers import DataProvider
+
+CALENDAR_ORIGIN = "1995-01-02"
+CALENDAR_END = "2035-12-31"
+
+_INDEX_MARKET = {"KS11": "KOSPI", "IXIC": "NASDAQ"}
+_FX_SYMBOL = "USD/KRW"
+
+
+def _nasdaq_symbol(i: int) -> str:
+    """0, 1, 2, ... 를 AAAA, AAAB, AAAC, ... 형태의 심볼로 변환한다."""
+    letters = string.ascii_uppercase
+    chars = []
+    for _ in range(4):
+        i, r = divmod(i, 26)
+        chars.append(letters[r])
+    return "".join(reversed(chars))
+
+
+class SyntheticProvider(DataProvider):
+    """결정적(seeded) 합성 시장 데이터 공급자.
+
+    Args:
+        seed: 난수 시드
+        n_kospi: KOSPI 종목 수
+        n_nasdaq: NASDAQ 종목 수
+        as_of: 종목 목록(시가총액)의 기준일
+        halt_prob: 종목별 일간 거래정지 확률
+    """
+    name = "synthetic"
+    cacheable = False
+
+    def __init__(
+        self,
+        seed: int = 0,
+        n_kospi: int = 950,
+        n_nasdaq: int = 3000,
+        as_of: str = "2024-12-31",
+        halt_prob: float = 0.002,
+    ):
+        self.seed = seed
+        self.n_kospi = n_kospi
+        self.n_nasdaq = n_nasdaq
+        self.as_of = pd.Timestamp(as_of)
+        self.halt_prob = halt_prob
+        self._symbols = {
+            "KOSPI": [f"{i + 1:06d}" for i in range(n_kospi)],
+            "NASDAQ": [_nasdaq_symbol(i) for i in range(n_nasdaq)],
+        }
+        self._market_of = {
+            symbol: market for market, symbols in self._symbols.items() for symbol in symbols
+        }
+        self._calendars: dict[str, pd.DatetimeIndex] = {}
+        self._market_rets: dict[str, np.ndarray] = {}
+        self._fx: pd.DataFrame | None = None
+
+    def _rng(self, *keys: str) -> np.random.Generator:
+        return np.random.default_rng([self.seed] + [zlib.crc32(k.encode()) for k in keys])
+
+    def _calendar(self, market: str) -> pd.DatetimeIndex:
+        """시장별 거래일 - 평일에서 시장별 휴장일(약 3%)을 뺀다."""
+        if market not in self._calendars:
+            days = pd.bdate_range(CALENDAR_ORIGIN, CALENDAR_END, name="Date")
+            holidays = self._rng("calendar", market).random(len(days)) < 0.03
+            self._calendars[market] = days[~holidays]
+        return self._calendars[market]
+
+    def _market_returns(self, market: str) -> np.ndarray:
+        """시장 팩터 일간 로그 수익률 (60거래일 단위 변동성 국면 전환 포함)."""
+        if market not in self._market_rets:
+            n = len(self._calendar(market))
+            rng = self._rng("market", market)
+            regimes = rng.choice([0.007, 0.011, 0.022], size=n // 60 + 1, p=[0.5, 0.4, 0.1])
+            self._market_rets[market] = rng.normal(0.0002, 1.0, n) * np.repeat(regimes, 60)[:n]
+        return self._market_rets[market]
+
+    def _close_path(self, symbol: str, market: str) -> tuple[np.ndarray, float, np.random.Generator]:
+        """종목의 종가 경로, 고유 변동성, 이어서 쓸 난수 생성기를 반환한다."""
+        market_ret = self._market_returns(market)
+        n = len(market_ret)
+        rng = self._rng("stock", symbol)
+
+        beta = rng.uniform(0.5, 1.5)
+        idio_vol = rng.uniform(0.01, 0.035)
+        drift = rng.normal(0.0, 0.0001)
+        shocks = rng.standard_t(4, n) * idio_vol / np.sqrt(2.0)
+        log_ret = drift + beta * market_ret + shocks
+        if market == "KOSPI":
+            log_ret = np.clip(log_ret, np.log(0.7), np.log(1.3))  # 가격 제한폭 ±30%
+            first_price = np.exp(rng.uniform(np.log(1_000), np.log(300_000)))
+        else:
+            first_price = np.exp(rng.uniform(np.log(2), np.log(500)))
+
+        close = first_price * np.exp(np.cumsum(log_ret))
+        close = np.round(close) if market == "KOSPI" else np.round(close, 2)
+        close = np.maximum(close, 1.0 if market == "KOSPI" else 0.01)
+        return close, idio_vol, rng
+
+    def _stock_history(self, symbol: str, market: str) -> pd.DataFrame:
+        """종목 전체 이력(CALENDAR_ORIGIN~CALENDAR_END)을 생성한다."""
+        calendar = self._calendar(market)
+        close, idio_vol, rng = self._close_path(symbol, market)
+        n = len(calendar)
+
+        gap = rng.normal(0, idio_vol / 3, n)
+        open_ = np.concatenate([[close[0]], close[:-1]]) * np.exp(gap)
+        wick = np.abs(rng.normal(0, idio_vol / 2, (2, n)))
+        high = np.maximum(open_, close) * (1 + wick[0])
+        low = np.minimum(open_, close) * (1 - wick[1])
+        volume = np.round(rng.lognormal(np.log(200_000), 1.0, n)).astype(np.int64)
+
+        df = pd.DataFrame({
+            "Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume,
+        }, index=calendar)
+        df["Change"] = df["Close"].pct_change()
+
+        # 상장일: 70%는 기준일부터, 나머지는 이후 임의 시점에 상장
+        listed_from = 0 if rng.random() < 0.7 else int(rng.integers(0, n // 2))
+        keep = np.arange(n) >= listed_from
+        keep &= rng.random(n) >= self.halt_prob
+        return df[keep]
+
+    def _index_history(self, symbol: str) -> pd.DataFrame:
+        market = _INDEX_MARKET[symbol]
+        calendar = self._calendar(market)
+        base = 1_000.0 if market == "KOSPI" else 2_000.0
+        close = base * np.exp(np.cumsum(self._market_returns(market)))
+        rng = self._rng("index", symbol)
+        wick = np.abs(rng.normal(0, 0.004, (2, len(close))))
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        return pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, close) * (1 + wick[0]),
+            "Low": np.minimum(open_, close) * (1 - wick[1]),
+            "Close": close,
+            "Volume": np.round(rng.lognormal(np.log(5e8), 0.3, len(close))).astype(np.int64),
+        }, index=calendar)
+
+    def _fx_history(self) -> pd.DataFrame:
+        """USD/KRW - 1200원 근처로 회귀하는 평균회귀 과정."""
+        if self._fx is not None:
+            return self._fx
+        calendar = pd.bdate_range(CALENDAR_ORIGIN, CALENDAR_END, name="Date")
+        rng = self._rng("fx", _FX_SYMBOL)
+        shocks = rng.normal(0, 6.0, len(calendar))
+        rate = np.empty(len(calendar))
+        rate[0] = 1_150.0
+        for i in range(1, len(calendar)):
+            rate[i] = rate[i - 1] + 0.01 * (1_200.0 - rate[i - 1]) + shocks[i]
+        open_ = np.concatenate([[rate[0]], rate[:-1]])
+        self._fx = pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, rate) + 2.0,
+            "Low": np.minimum(open_, rate) - 2.0,
+            "Close": rate,
+        }, index=calendar)
+        return self._fx
+
+    def stock_listing(self, market: str) -> pd.DataFrame:
+        """as_of 기준 상장 종목 목록을 시가총액 내림차순으로 반환한다."""
+        if market not in self._symbols:
+            raise ValueError(f"Unsupported market: {market}")
+        as_of_pos = self._calendar(market).searchsorted(self.as_of, side="right") - 1
+        rows = []
+        for i, symbol in enumerate(self._symbols[market]):
+            close_path, _, _ = self._close_path(symbol, market)
+            shares = int(self._rng("shares", symbol).lognormal(np.log(3e7), 1.2))
+            close = float(close_path[as_of_pos])
+            rows.append((symbol, f"{market} 합성종목 {i + 1:04d}", close, shares, close * shares))
+
+        df = pd.DataFrame(rows, columns=["Code", "Name", "Close", "Stocks", "Marcap"])
+        df = df.sort_values("Marcap", ascending=False, kind="stable").reset_index(drop=True)
+        if market == "KOSPI":
+            df.insert(2, "Market", "KOSPI")
+            return df
+        return df.rename(columns={"Code": "Symbol", "Marcap": "MarketCap"}).assign(Industry="Synthetic")
+
+    def data_reader(self, symbol: str, start: str, end: str) -> pd.DataFrame:
+        if symbol in _INDEX_MARKET:
+            history = self._index_history(symbol)
+        elif symbol == _FX_SYMBOL:
+            history = self._fx_history()
+        elif symbol in self._market_of:
+            history = self._stock_history(symbol, self._market_of[symbol])
+        else:
+            raise ValueError(f"Unknown symbol: {symbol}")
+        return history.loc[pd.Timestamp(start):pd.Timestamp(end)].copy()
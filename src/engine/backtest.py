@@ -1,16 +1,28 @@
 """백테스팅 코어 엔진 - 일별 루프 기반 시뮬레이션."""
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 
 import numpy as np
 import pandas as pd
 
+from src.data.panel import PricePanel
 from src.engine.portfolio import Portfolio, DailySnapshot, Trade
-from src.engine.signals import (
-    detect_consecutive_falls,
-    detect_consecutive_rises,
-    detect_emergency_sell,
+from src.engine.equity import EquityCurve, as_equity_curve
+from src.engine.dense import (
+    MarketPanel,
+    _trailing_returns,
+    build_market_panel,
+    build_market_panel_from_prices,
+    iter_panel_loop,
+    run_panel_loop,
 )
+from src.engine.kernel import run_kernel_loop
+from src.engine.market_cap import build_market_cap_panel, listing_shares
+from src.engine.pipeline import PackedMarket
+from src.engine.signal_cache import SignalArrays, get_signal_cache
+from src.engine.signals import compute_signals
+from src.engine.trade_log import TradeLog, as_trade_log
 
 
 @dataclass
@@ -27,24 +39,29 @@ class BacktestParams:
     min_balance: float      # 매수 후 최소 잔고
     sort_method: str = "market_cap"  # "market_cap" or "return_rate"
     kospi_ratio: int = 100  # KOSPI 투자 비율 (0~100, 나머지는 NASDAQ)
+    # "pandas", "panel" (날짜 × 종목 배열) 또는 "numba" (컴파일 커널), 결과 동일.
+    # iter_backtest와 stop_rules를 준 run_backtest는 이 값과 관계없이 panel로 실행한다.
+    engine: str = "pandas"
 
 
 @dataclass
 class BacktestResult:
     """백테스트 결과."""
-    daily_snapshots: list[DailySnapshot] = field(default_factory=list)
-    trades: list[Trade] = field(default_factory=list)
+    daily_snapshots: EquityCurve = field(default_factory=EquityCurve)
+    trades: TradeLog = field(default_factory=TradeLog)
     kospi_index: pd.DataFrame | None = None
     nasdaq_index: pd.DataFrame | None = None
     exchange_rate_df: pd.DataFrame | None = None
     initial_exchange_rate: float = 0.0
-    kospi_snapshots: list[DailySnapshot] = field(default_factory=list)
-    nasdaq_snapshots: list[DailySnapshot] = field(default_factory=list)
+    kospi_snapshots: EquityCurve = field(default_factory=EquityCurve)
+    nasdaq_snapshots: EquityCurve = field(default_factory=EquityCurve)
     final_return_pct: float = 0.0
     mdd_pct: float = 0.0
     total_trades: int = 0
     win_rate_pct: float = 0.0
     total_fee: float = 0.0
+    stopped_on: str | None = None  # 조기 종료 규칙으로 멈춘 날 (끝까지 실행했으면 None)
+    market_snapshots: dict[str, EquityCurve] = field(default_factory=dict)  # 다중 시장: 시장별 현지 통화 스냅샷
 
 
 def _precompute_signals(
@@ -58,59 +75,141 @@ def _precompute_signals(
     for code, df in price_data.items():
         if "Close" not in df.columns or df.empty:
             continue
-        close = df["Close"]
-        signals[code] = {
-            "buy": detect_consecutive_rises(close, n_rise),
-            "sell_fall": detect_consecutive_falls(close, m_fall),
-            "sell_emergency": detect_emergency_sell(close, y_pct),
-        }
+        signals[code] = compute_signals(df["Close"], n_rise, m_fall, y_pct)
     return signals
 
 
 def _get_trading_dates(price_data: dict[str, pd.DataFrame]) -> pd.DatetimeIndex:
     """전체 종목 데이터에서 거래일 유니온을 구한다."""
-    all_dates: set[pd.Timestamp] = set()
-    for df in price_data.values():
-        all_dates.update(df.index)
-    return pd.DatetimeIndex(sorted(all_dates))
+    indexes = [df.index for df in price_data.values() if len(df.index)]
+    if not indexes:
+        return pd.DatetimeIndex([])
+    # 종목 인덱스와 같은 단위로 만들어 get_indexer에서 단위 변환이 없도록 한다
+    units = {index.unit for index in indexes}
+    unit = units.pop() if len(units) == 1 else "ns"
+    stamps = np.unique(np.concatenate([index.as_unit(unit).asi8 for index in indexes]))
+    return pd.DatetimeIndex(stamps.view(f"datetime64[{unit}]"))
 
 
-def _rank_buy_candidates(
-    candidates: list[tuple[str, str, float]],
+def _returns_n(params: BacktestParams) -> int | None:
+    """return_rate 정렬이면 n봉 수익률 행렬의 n (매수 시그널 연속 상승 일수)."""
+    return params.n_rise_days if params.sort_method == "return_rate" else None
+
+
+def _cap_rank(
+    params: BacktestParams,
+    listing_df: pd.DataFrame | None,
+    listing_history: list[tuple[str, pd.DataFrame]] | None,
+    panel: MarketPanel,
+) -> np.ndarray | None:
+    """market_cap 정렬이면 거래일별 시가총액 순위 (종목 목록이 없으면 None).
+
+    listing_history가 있으면 거래일마다 그 시점의 스냅샷을, 없으면 listing_df를
+    시작일 기준 스냅샷 하나로 쓴다.
+    """
+    listings = _cap_listings(params, listing_df, listing_history)
+    if listings is None:
+        return None
+    return build_market_cap_panel(panel.close, panel.dates, panel.codes, listings).rank
+
+
+def _cap_listings(
+    params: BacktestParams,
+    listing_df: pd.DataFrame | None,
+    listing_history: list[tuple[str, pd.DataFrame]] | None,
+) -> list[tuple[str, pd.DataFrame]] | None:
+    """market_cap 정렬에 쓸 종목 목록 스냅샷들. 정렬 방식이 다르거나 목록이 없으면 None."""
+    if params.sort_method != "market_cap":
+        return None
+    return listing_history or ([(params.start_date, listing_df)] if listing_df is not None else None)
+
+
+def _build_date_index(
+    signals: dict[str, dict[str, pd.Series]],
+    price_data: dict[str, pd.DataFrame],
+    priority: dict[str, np.ndarray] | None = None,
+) -> dict[pd.Timestamp, list[str]]:
+    """{거래일: 매수 시그널이 뜬 종목코드 리스트} 역색인을 한 번에 만든다.
+
+    가격 행이 있는 날만 담는다. priority(_priority_keys)가 있으면 리스트를 그날의
+    우선순위 값 내림차순(같은 값은 시그널 순서, NaN은 마지막)으로 미리 정렬해 두고,
+    없으면 시그널 딕셔너리 순서다. 일별 루프는 앞에서부터 필요한 만큼만 꺼낸다.
+    """
+    index: dict[pd.Timestamp, list[str]] = defaultdict(list)
+    values: dict[pd.Timestamp, list[float]] = defaultdict(list)
+    for code, sig in signals.items():
+        if code not in price_data:
+            continue
+        buy = sig["buy"]
+        dates = buy.index[buy.to_numpy(dtype=bool)]
+        dates = dates[dates.isin(price_data[code].index)]
+        for date in dates:
+            index[date].append(code)
+        if priority is not None:
+            keys = priority[code][price_data[code].index.get_indexer(dates)]
+            for date, value in zip(dates, keys.tolist()):
+                values[date].append(value)
+    if priority is not None:
+        for date, codes in index.items():
+            if len(codes) > 1:
+                order = np.argsort(-np.array(values[date]), kind="stable")
+                index[date] = [codes[i] for i in order]
+    return dict(index)
+
+
+def _priority_keys(
+    params: BacktestParams,
     price_data: dict[str, pd.DataFrame],
+    codes: list[str],
     listing_df: pd.DataFrame | None,
-    sort_method: str,
-    current_date: pd.Timestamp,
-    n_rise: int,
-) -> list[tuple[str, str, float]]:
-    """매수 후보를 정렬한다.
+    listing_history: list[tuple[str, pd.DataFrame]] | None,
+) -> dict[str, np.ndarray] | None:
+    """pandas 루프의 매수 우선순위 값 {종목코드: 가격 행 순서의 값 배열} (클수록 먼저).
 
-    Args:
-        candidates: [(code, name, price), ...]
-        sort_method: "market_cap" 또는 "return_rate"
+    return_rate면 n봉 수익률, market_cap이면 그날 기준 스냅샷의 상장주식수 × 종가
+    (주식수를 모르면 고정 시가총액, 첫 스냅샷보다 이른 날은 첫 스냅샷). 정렬할 기준이
+    없으면 None이며 시그널 순서로 산다. 패널 엔진의 정렬 배열과 따로 계산한다.
     """
-    if sort_method == "market_cap" and listing_df is not None:
-        cap_map = {}
-        if "Code" in listing_df.columns and "Marcap" in listing_df.columns:
-            cap_map = dict(zip(listing_df["Code"], listing_df["Marcap"]))
-        elif "Code" in listing_df.columns and "MarketCap" in listing_df.columns:
-            cap_map = dict(zip(listing_df["Code"], listing_df["MarketCap"]))
-        candidates.sort(key=lambda x: cap_map.get(x[0], 0), reverse=True)
-    elif sort_method == "return_rate":
-        def get_return(item):
-            code = item[0]
-            if code in price_data:
-                df = price_data[code]
-                close = df["Close"]
-                idx = close.index.get_indexer([current_date], method="ffill")
-                if idx[0] >= n_rise:
-                    start_price = close.iloc[idx[0] - n_rise]
-                    end_price = close.iloc[idx[0]]
-                    if start_price > 0:
-                        return (end_price - start_price) / start_price
-            return 0.0
-        candidates.sort(key=get_return, reverse=True)
-    return candidates
+    if params.sort_method == "return_rate":
+        return {code: _trailing_returns(price_data[code]["Close"].to_numpy(), params.n_rise_days)
+                for code in codes}
+    listings = _cap_listings(params, listing_df, listing_history)
+    if listings is None:
+        return None
+    listings = sorted(listings, key=lambda item: pd.Timestamp(item[0]))
+    snapshot_dates = pd.DatetimeIndex([pd.Timestamp(as_of) for as_of, _ in listings])
+    shares, fixed = (np.stack(columns) for columns in zip(*(listing_shares(df, codes) for _, df in listings)))
+    keys = {}
+    for j, code in enumerate(codes):
+        close = price_data[code]["Close"]
+        snapshot = np.maximum(snapshot_dates.searchsorted(close.index, side="right") - 1, 0)
+        code_shares = shares[snapshot, j]
+        keys[code] = np.where(np.isnan(code_shares), fixed[snapshot, j], close.to_numpy() * code_shares)
+    return keys
+
+
+def _trade_metrics(trades: TradeLog | list[Trade]) -> tuple[float, float]:
+    """(승률 %, 수수료 합계)를 거래 기록의 열에서 바로 계산한다."""
+    trades = as_trade_log(trades)
+    sells = trades.sell_mask()
+    n_sells = int(sells.sum())
+    if n_sells:
+        wins = int((trades.data["profit"][sells] > 0).sum())
+        win_rate = wins / n_sells * 100
+    else:
+        win_rate = 0.0
+    return win_rate, trades.total_fee()
+
+
+def _return_and_mdd(total_values: np.ndarray, initial_cash: float) -> tuple[float, float]:
+    """(최종 수익률 %, MDD %). pandas cummax/min처럼 NaN은 건너뛴다."""
+    final_return = (total_values[-1] - initial_cash) / initial_cash * 100
+    cummax = np.fmax.accumulate(total_values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = (total_values - cummax) / cummax * 100
+    drawdown = drawdown[~np.isnan(drawdown)]
+    mdd = drawdown.min() if len(drawdown) else np.nan
+    return final_return, mdd
 
 
 def _compute_metrics(portfolio: Portfolio, initial_cash: float) -> dict:
@@ -119,21 +218,9 @@ def _compute_metrics(portfolio: Portfolio, initial_cash: float) -> dict:
     if not snapshots:
         return {"final_return_pct": 0.0, "mdd_pct": 0.0, "win_rate_pct": 0.0}
 
-    total_values = pd.Series([s.total_value for s in snapshots])
-    final_return = (total_values.iloc[-1] - initial_cash) / initial_cash * 100
-
-    cummax = total_values.cummax()
-    drawdown = (total_values - cummax) / cummax * 100
-    mdd = drawdown.min()
+    final_return, mdd = _return_and_mdd(snapshots.total_value, initial_cash)
 
-    sell_trades = [t for t in portfolio.trades if t.side == "SELL"]
-    if sell_trades:
-        wins = sum(1 for t in sell_trades if t.profit > 0)
-        win_rate = wins / len(sell_trades) * 100
-    else:
-        win_rate = 0.0
-
-    total_fee = sum(t.fee for t in portfolio.trades)
+    win_rate, total_fee = _trade_metrics(portfolio.trades)
 
     return {
         "final_return_pct": round(final_return, 2),
@@ -143,46 +230,27 @@ def _compute_metrics(portfolio: Portfolio, initial_cash: float) -> dict:
     }
 
 
-def run_backtest(
+def _run_pandas_loop(
     params: BacktestParams,
     price_data: dict[str, pd.DataFrame],
-    listing_df: pd.DataFrame | None = None,
-    kospi_df: pd.DataFrame | None = None,
+    signals: dict[str, dict[str, pd.Series]],
+    trading_dates: pd.DatetimeIndex,
+    portfolio: Portfolio,
+    name_map: dict[str, str],
+    listing_df: pd.DataFrame | None,
+    listing_history: list[tuple[str, pd.DataFrame]] | None = None,
     progress_callback=None,
-) -> BacktestResult:
-    """백테스트를 실행한다.
-
-    Args:
-        params: 백테스트 파라미터
-        price_data: {종목코드: 가격 DataFrame} 딕셔너리
-        listing_df: KOSPI 상장 종목 목록 (시총 정렬용)
-        kospi_df: KOSPI 지수 DataFrame (벤치마크)
-        progress_callback: (current, total) 콜백
-
-    Returns:
-        BacktestResult
-    """
-    portfolio = Portfolio(cash=params.initial_cash, fee_rate=params.fee_rate)
-
-    # 종목코드 → 종목명 매핑
-    name_map: dict[str, str] = {}
-    if listing_df is not None:
-        if "Code" in listing_df.columns and "Name" in listing_df.columns:
-            name_map = dict(zip(listing_df["Code"], listing_df["Name"]))
-
-    # 시그널 사전 계산
-    signals = _precompute_signals(
-        price_data, params.n_rise_days, params.m_fall_days, params.y_emergency_pct
-    )
-
-    trading_dates = _get_trading_dates(price_data)
+) -> None:
+    """종목별 pandas 시계열을 날짜 라벨로 조회하는 기본 일별 루프."""
     total_days = len(trading_dates)
+    priority = _priority_keys(params, price_data, list(signals), listing_df, listing_history)
+    date_index = _build_date_index(signals, price_data, priority)
 
     for day_idx, date in enumerate(trading_dates):
         date_str = date.strftime("%Y-%m-%d")
 
-        # ── SELL Phase ──
-        codes_to_sell: set[str] = set()
+        # ── SELL Phase ── (보유 순서대로)
+        codes_to_sell: list[str] = []
         for code in list(portfolio.holdings.keys()):
             if code not in signals:
                 continue
@@ -190,89 +258,277 @@ def run_backtest(
 
             # 연속 하락 매도
             if date in sig["sell_fall"].index and sig["sell_fall"].get(date, False):
-                codes_to_sell.add(code)
+                codes_to_sell.append(code)
             # 긴급 매도
             elif date in sig["sell_emergency"].index and sig["sell_emergency"].get(date, False):
-                codes_to_sell.add(code)
+                codes_to_sell.append(code)
 
         for code in codes_to_sell:
             if code not in price_data or date not in price_data[code].index:
                 continue
-            price = price_data[code].loc[date, "Close"]
+            price = float(price_data[code].loc[date, "Close"])
             name = name_map.get(code, code)
             portfolio.sell_all(date_str, code, name, price)
 
-        # ── BUY Phase ──
-        buy_candidates: list[tuple[str, str, float]] = []
-        for code, sig in signals.items():
+        # ── BUY Phase ── (우선순위 순 후보를 현금이 허락하는 만큼만 꺼낸다)
+        for code in date_index.get(date, ()):
             if code in portfolio.holdings:
                 continue
-            if date not in sig["buy"].index:
-                continue
-            if not sig["buy"].get(date, False):
-                continue
-            if code not in price_data or date not in price_data[code].index:
-                continue
-            price = price_data[code].loc[date, "Close"]
-            name = name_map.get(code, code)
-            buy_candidates.append((code, name, price))
-
-        buy_candidates = _rank_buy_candidates(
-            buy_candidates, price_data, listing_df,
-            params.sort_method, date, params.n_rise_days,
-        )
-
-        for code, name, price in buy_candidates:
             if portfolio.cash < params.min_balance:
                 break
-            portfolio.buy(date_str, code, name, price,
-                         params.max_buy_amount, params.min_balance)
+            price = float(price_data[code].loc[date, "Close"])
+            portfolio.buy(date_str, code, name_map.get(code, code), price,
+                          params.max_buy_amount, params.min_balance)
 
         # ── SNAPSHOT ──
         current_prices = {}
         for code in portfolio.holdings:
             if code in price_data and date in price_data[code].index:
-                current_prices[code] = price_data[code].loc[date, "Close"]
+                current_prices[code] = float(price_data[code].loc[date, "Close"])
         portfolio.snapshot(date_str, current_prices)
 
         if progress_callback:
             progress_callback(day_idx + 1, total_days)
 
-    metrics = _compute_metrics(portfolio, params.initial_cash)
 
+def _unpack_price_data(
+    params: BacktestParams, price_data, keep_panel: bool = False,
+) -> tuple[dict[str, pd.DataFrame] | PricePanel, dict | None]:
+    """run_backtest 입력을 ({종목코드: DataFrame}, 미리 계산된 시그널 또는 None)으로 바꾼다.
+
+    keep_panel이면 PricePanel은 풀지 않고 그대로 돌려준다 (패널 루프는 종가 행렬을 바로 쓴다).
+    """
+    signals = None
+    if isinstance(price_data, PackedMarket):
+        if price_data.matches(params.n_rise_days, params.m_fall_days, params.y_emergency_pct):
+            signals = price_data.signals
+        price_data = price_data.price_data
+    elif isinstance(price_data, PricePanel) and not keep_panel:
+        price_data = price_data.to_price_data()
+    return price_data, signals
+
+
+def _listing_name_map(listing_df: pd.DataFrame | None) -> dict[str, str]:
+    """종목코드 → 종목명 매핑."""
+    if listing_df is not None and "Code" in listing_df.columns and "Name" in listing_df.columns:
+        return dict(zip(listing_df["Code"], listing_df["Name"]))
+    return {}
+
+
+def _cached_signals(params: BacktestParams, price_data: dict[str, pd.DataFrame]):
+    """시그널 캐시에서 찾는다. (캐시, 키, 찾은 SignalArrays 또는 None)을 반환한다."""
+    signal_cache = get_signal_cache()
+    if signal_cache is None:
+        return None, None, None
+    method = "series" if params.engine == "pandas" else "panel"
+    cache_key = signal_cache.key(price_data, params.n_rise_days, params.m_fall_days, params.y_emergency_pct, method)
+    return signal_cache, cache_key, signal_cache.get(cache_key)
+
+
+def _build_panel(
+    params: BacktestParams,
+    price_data: dict[str, pd.DataFrame] | PricePanel,
+    signals: dict | None,
+) -> MarketPanel:
+    """패널 엔진 입력을 만든다. 미리 계산된 시그널이 없으면 시그널 캐시를 거친다.
+
+    PricePanel은 DataFrame으로 풀지 않고 종가 행렬에서 바로 만든다 (시그널 캐시는 거치지 않는다).
+    """
+    if isinstance(price_data, PricePanel):
+        return build_market_panel_from_prices(
+            price_data, n_rise=params.n_rise_days, m_fall=params.m_fall_days,
+            y_pct=params.y_emergency_pct, returns_n=_returns_n(params),
+        )
+    signal_cache = cache_key = cached = None
+    if signals is None:
+        signal_cache, cache_key, cached = _cached_signals(params, price_data)
+    # 캐시에도 없으면 패널 전체를 한 번에 계산한다
+    panel = build_market_panel(
+        price_data, _get_trading_dates(price_data), signals,
+        n_rise=params.n_rise_days, m_fall=params.m_fall_days, y_pct=params.y_emergency_pct,
+        returns_n=_returns_n(params), cached=cached,
+    )
+    if cache_key is not None and panel.computed is not None:
+        signal_cache.put(cache_key, panel.computed)
+    return panel
+
+
+def run_backtest(
+    params: BacktestParams,
+    price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket,
+    listing_df: pd.DataFrame | None = None,
+    kospi_df: pd.DataFrame | None = None,
+    progress_callback=None,
+    listing_history: list[tuple[str, pd.DataFrame]] | None = None,
+    stop_rules: list | None = None,
+) -> BacktestResult:
+    """백테스트를 실행한다.
+
+    Args:
+        params: 백테스트 파라미터
+        price_data: {종목코드: 가격 DataFrame} 딕셔너리, 메모리 매핑 PricePanel,
+            또는 시그널까지 계산된 PackedMarket (src.engine.pipeline.stream_market)
+        listing_df: KOSPI 상장 종목 목록 (시총 정렬용)
+        kospi_df: KOSPI 지수 DataFrame (벤치마크)
+        progress_callback: (current, total) 콜백
+        listing_history: [(기준일, 종목 목록), ...] 스냅샷들. 있으면 시가총액 정렬에
+            거래일마다 그 시점의 상장주식수를 쓴다 (없으면 listing_df 하나).
+        stop_rules: 조기 종료 규칙 (iter_backtest 참고). 주어지면 iter_backtest로
+            실행하고 규칙이 맞은 날까지의 결과를 반환한다. 이때 params.engine이
+            pandas나 numba여도 panel 루프를 쓴다 (결과는 같고 속도만 다르다).
+
+    Returns:
+        BacktestResult
+    """
+    if stop_rules:
+        stream = iter_backtest(params, price_data, listing_df, kospi_df, progress_callback,
+                               listing_history, stop_rules)
+        while True:
+            try:
+                next(stream)
+            except StopIteration as stop:
+                return stop.value
+
+    panel_engine = params.engine in ("panel", "numba")
+    price_data, signals = _unpack_price_data(params, price_data, keep_panel=panel_engine)
+    portfolio = Portfolio(cash=params.initial_cash, fee_rate=params.fee_rate)
+    name_map = _listing_name_map(listing_df)
+
+    if panel_engine:
+        panel = _build_panel(params, price_data, signals)
+        cap_rank = _cap_rank(params, listing_df, listing_history, panel)
+        # numba가 없으면 run_kernel_loop는 run_panel_loop로 실행한다
+        loop = run_kernel_loop if params.engine == "numba" else run_panel_loop
+        loop(
+            panel, portfolio, name_map, params.max_buy_amount, params.min_balance,
+            cap_rank=cap_rank, progress_callback=progress_callback,
+        )
+    elif params.engine == "pandas":
+        # 미리 계산된 시그널이 없으면 시그널 캐시에서 찾는다
+        if signals is None:
+            signal_cache, cache_key, cached = _cached_signals(params, price_data)
+            if cached is not None:
+                signals = cached.to_series(price_data)
+            else:
+                signals = _precompute_signals(
+                    price_data, params.n_rise_days, params.m_fall_days, params.y_emergency_pct)
+                if cache_key is not None:
+                    signal_cache.put(cache_key, SignalArrays.from_series(signals))
+        _run_pandas_loop(params, price_data, signals, _get_trading_dates(price_data), portfolio,
+                         name_map, listing_df, listing_history, progress_callback)
+    else:
+        raise ValueError(f"Unknown engine: {params.engine}")
+
+    return _backtest_result(portfolio, params, kospi_df)
+
+
+def _backtest_result(
+    portfolio: Portfolio, params: BacktestParams, kospi_df: pd.DataFrame | None, stopped_on: str | None = None,
+) -> BacktestResult:
     return BacktestResult(
         daily_snapshots=portfolio.daily_snapshots,
         trades=portfolio.trades,
         kospi_index=kospi_df,
         total_trades=len(portfolio.trades),
-        **metrics,
+        stopped_on=stopped_on,
+        **_compute_metrics(portfolio, params.initial_cash),
     )
 
 
+@dataclass
+class BacktestStep:
+    """iter_backtest가 거래일마다 내보내는 값.
+
+    Attributes:
+        day: 거래일 번호 (0부터)
+        total_days: 전체 거래일 수
+        snapshot: 그날의 자산 현황
+        trades: 그날 체결된 거래 (매도 먼저, 그다음 매수)
+        drawdown_pct: 그날까지의 최고 평가액 대비 하락률 (%, 0 이하)
+    """
+    day: int
+    total_days: int
+    snapshot: DailySnapshot
+    trades: list[Trade]
+    drawdown_pct: float
+
+
+@dataclass
+class MaxDrawdownStop:
+    """최고 평가액 대비 pct% 이상 떨어지면 멈춘다."""
+    pct: float
+
+    def __call__(self, step: BacktestStep) -> bool:
+        return step.drawdown_pct <= -self.pct
+
+
+@dataclass
+class MinEquityStop:
+    """총 평가액이 value 아래로 내려가면 멈춘다."""
+    value: float
+
+    def __call__(self, step: BacktestStep) -> bool:
+        return step.snapshot.total_value < self.value
+
+
+def iter_backtest(
+    params: BacktestParams,
+    price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket,
+    listing_df: pd.DataFrame | None = None,
+    kospi_df: pd.DataFrame | None = None,
+    progress_callback=None,
+    listing_history: list[tuple[str, pd.DataFrame]] | None = None,
+    stop_rules: list | None = None,
+):
+    """백테스트를 거래일 단위로 진행하며 BacktestStep을 내보내는 제너레이터.
+
+    인자는 run_backtest와 같다. 엔진은 params.engine과 관계없이 패널 루프이며
+    결과는 run_backtest와 같다. stop_rules의 각 규칙은 BacktestStep을 받아 True를
+    반환하면 그날까지로 실행을 끝낸다 (MaxDrawdownStop, MinEquityStop 또는 임의의
+    호출 가능 객체). 호출자가 순회를 그만두어도 된다.
+
+    제너레이터의 반환값(StopIteration.value)은 그때까지의 BacktestResult이며, 규칙으로
+    멈췄으면 stopped_on에 그날 날짜가 들어 있다.
+    """
+    price_data, signals = _unpack_price_data(params, price_data, keep_panel=True)
+    portfolio = Portfolio(cash=params.initial_cash, fee_rate=params.fee_rate)
+    panel = _build_panel(params, price_data, signals)
+    cap_rank = _cap_rank(params, listing_df, listing_history, panel)
+    total_days = len(panel.dates)
+
+    peak = 0.0
+    traded = 0
+    stopped_on = None
+    for t in iter_panel_loop(panel, portfolio, _listing_name_map(listing_df),
+                             params.max_buy_amount, params.min_balance, cap_rank):
+        snapshot = portfolio.daily_snapshots[-1]
+        peak = max(peak, snapshot.total_value)
+        drawdown = (snapshot.total_value - peak) / peak * 100 if peak > 0 else 0.0
+        step = BacktestStep(day=t, total_days=total_days, snapshot=snapshot,
+                            trades=portfolio.trades[traded:], drawdown_pct=drawdown)
+        traded = len(portfolio.trades)
+        if progress_callback:
+            progress_callback(t + 1, total_days)
+        yield step
+        if stop_rules and any(rule(step) for rule in stop_rules):
+            stopped_on = snapshot.date
+            break
+
+    return _backtest_result(portfolio, params, kospi_df, stopped_on)
+
+
 def _compute_metrics_from_snapshots(
-    snapshots: list[DailySnapshot],
-    trades: list[Trade],
+    snapshots: EquityCurve | list[DailySnapshot],
+    trades: TradeLog | list[Trade],
     initial_cash: float,
 ) -> dict:
     """스냅샷 리스트와 거래 리스트로부터 지표를 계산한다."""
     if not snapshots:
         return {"final_return_pct": 0.0, "mdd_pct": 0.0, "win_rate_pct": 0.0, "total_fee": 0.0}
 
-    total_values = pd.Series([s.total_value for s in snapshots])
-    final_return = (total_values.iloc[-1] - initial_cash) / initial_cash * 100
-
-    cummax = total_values.cummax()
-    drawdown = (total_values - cummax) / cummax * 100
-    mdd = drawdown.min()
-
-    sell_trades = [t for t in trades if t.side == "SELL"]
-    if sell_trades:
-        wins = sum(1 for t in sell_trades if t.profit > 0)
-        win_rate = wins / len(sell_trades) * 100
-    else:
-        win_rate = 0.0
+    final_return, mdd = _return_and_mdd(as_equity_curve(snapshots).total_value, initial_cash)
 
-    total_fee = sum(t.fee for t in trades)
+    win_rate, total_fee = _trade_metrics(trades)
 
     return {
         "final_return_pct": round(final_return, 2),
@@ -282,38 +538,63 @@ def _compute_metrics_from_snapshots(
     }
 
 
-def _lookup_by_date(snapshots: list[DailySnapshot], date_str: str) -> DailySnapshot | None:
-    """날짜 문자열로 스냅샷을 검색한다. 정확히 없으면 직전 값을 반환."""
-    last = None
-    for s in snapshots:
-        if s.date <= date_str:
-            last = s
-        else:
-            break
-    return last
+def _asof_rows(dates: np.ndarray, calendar: np.ndarray) -> np.ndarray:
+    """calendar 각 날짜에서 dates(오름차순)의 직전 행 번호. 앞선 행이 없으면 -1."""
+    return np.searchsorted(dates, calendar, side="right") - 1
+
+
+def _rates_on(exchange_rate_df: pd.DataFrame, calendar) -> np.ndarray:
+    """calendar 각 날짜의 환율 배열. 정확히 없으면 직전 값(ffill), 직전 값도 없으면 첫 값."""
+    close = exchange_rate_df["Close"]
+    if not close.index.is_monotonic_increasing:
+        close = close.sort_index(kind="stable")
+    rows = _asof_rows(close.index, pd.DatetimeIndex(calendar))
+    values = close.to_numpy(dtype=np.float64)
+    return np.where(rows >= 0, values[rows], float(exchange_rate_df["Close"].iloc[0]))
 
 
 def _lookup_rate_by_date(exchange_rate_df: pd.DataFrame, date: pd.Timestamp) -> float:
     """거래일 환율을 조회한다. 정확히 없으면 직전 값(ffill)을 사용."""
-    if date in exchange_rate_df.index:
-        return float(exchange_rate_df.loc[date, "Close"])
-    # ffill: 해당 날짜 이전 가장 가까운 값
-    mask = exchange_rate_df.index <= date
-    if mask.any():
-        return float(exchange_rate_df.loc[mask, "Close"].iloc[-1])
-    return float(exchange_rate_df["Close"].iloc[0])
+    return float(_rates_on(exchange_rate_df, [date])[0])
+
+
+def _combine_snapshots(
+    curves: list[EquityCurve], exchange_rates: list[pd.DataFrame | None],
+) -> EquityCurve:
+    """여러 시장의 일별 스냅샷을 날짜 유니온 위에서 기준 통화로 합산한다.
+
+    각 시장 스냅샷과 환율은 정렬된 배열의 searchsorted로 한 번에 직전 값을
+    찾는다 (아직 시작 전인 시장은 0). exchange_rates[i]가 있으면 i번째 시장의
+    현금/주식을 그날 환율로 환산하고, None이면 기준 통화로 보고 그대로 더한다.
+    """
+    calendar = np.unique(np.concatenate([curve.dates for curve in curves]))
+    combined_cash = combined_stock = None
+    for curve, exchange_rate_df in zip(curves, exchange_rates):
+        rows = _asof_rows(curve.dates, calendar)
+        cash, stock = (
+            np.where(rows >= 0, column[rows] if len(column) else 0.0, 0.0)
+            for column in (curve.cash, curve.stock_value)
+        )
+        if exchange_rate_df is not None:
+            rate = _rates_on(exchange_rate_df, calendar)
+            cash, stock = cash * rate, stock * rate
+        combined_cash = cash if combined_cash is None else combined_cash + cash
+        combined_stock = stock if combined_stock is None else combined_stock + stock
+    return EquityCurve.from_arrays(calendar, combined_cash, combined_stock, combined_cash + combined_stock)
 
 
 def run_dual_market_backtest(
     params: BacktestParams,
-    kospi_price_data: dict[str, pd.DataFrame],
-    nasdaq_price_data: dict[str, pd.DataFrame],
+    kospi_price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket,
+    nasdaq_price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket,
     kospi_listing_df: pd.DataFrame | None,
     nasdaq_listing_df: pd.DataFrame | None,
     kospi_df: pd.DataFrame | None,
     nasdaq_df: pd.DataFrame | None,
     exchange_rate_df: pd.DataFrame,
     progress_callback=None,
+    kospi_listing_history: list[tuple[str, pd.DataFrame]] | None = None,
+    nasdaq_listing_history: list[tuple[str, pd.DataFrame]] | None = None,
 ) -> BacktestResult:
     """KOSPI + NASDAQ 이중 시장 백테스트를 실행한다.
 
@@ -344,16 +625,17 @@ def run_dual_market_backtest(
         min_balance=params.min_balance,
         sort_method=params.sort_method,
         kospi_ratio=100,
+        engine=params.engine,
     )
 
     kospi_result = run_backtest(
         kospi_params, kospi_price_data, kospi_listing_df, kospi_df,
         progress_callback=lambda cur, tot: progress_callback(cur, tot * 2) if progress_callback else None,
+        listing_history=kospi_listing_history,
     )
 
     # KOSPI 거래에 market 태그
-    for t in kospi_result.trades:
-        t.market = "KOSPI"
+    kospi_result.trades.set_market("KOSPI")
 
     # NASDAQ 백테스트 (USD 기준)
     nasdaq_max_buy = params.max_buy_amount / start_rate if start_rate > 0 else 0.0
@@ -371,56 +653,33 @@ def run_dual_market_backtest(
         min_balance=nasdaq_min_balance,
         sort_method=params.sort_method,
         kospi_ratio=0,
+        engine=params.engine,
     )
 
     nasdaq_result = run_backtest(
         nasdaq_params, nasdaq_price_data, nasdaq_listing_df, nasdaq_df,
         progress_callback=lambda cur, tot: progress_callback(tot + cur, tot * 2) if progress_callback else None,
+        listing_history=nasdaq_listing_history,
     )
 
     # NASDAQ 거래에 market 태그
-    for t in nasdaq_result.trades:
-        t.market = "NASDAQ"
-
-    # 일별 합산: 모든 날짜 유니온 구하기
-    all_date_strs: set[str] = set()
-    for s in kospi_result.daily_snapshots:
-        all_date_strs.add(s.date)
-    for s in nasdaq_result.daily_snapshots:
-        all_date_strs.add(s.date)
-    sorted_dates = sorted(all_date_strs)
-
-    combined_snapshots: list[DailySnapshot] = []
-    for date_str in sorted_dates:
-        k_snap = _lookup_by_date(kospi_result.daily_snapshots, date_str)
-        n_snap = _lookup_by_date(nasdaq_result.daily_snapshots, date_str)
-        rate = _lookup_rate_by_date(exchange_rate_df, pd.Timestamp(date_str))
-
-        k_cash = k_snap.cash if k_snap else 0.0
-        k_stock = k_snap.stock_value if k_snap else 0.0
-        n_cash = (n_snap.cash if n_snap else 0.0) * rate
-        n_stock = (n_snap.stock_value if n_snap else 0.0) * rate
-
-        combined_cash = k_cash + n_cash
-        combined_stock = k_stock + n_stock
-        combined_snapshots.append(DailySnapshot(
-            date=date_str,
-            cash=combined_cash,
-            stock_value=combined_stock,
-            total_value=combined_cash + combined_stock,
-        ))
+    nasdaq_result.trades.set_market("NASDAQ")
+
+    # 일별 합산: 날짜 유니온 위에 두 시장과 환율을 직전 값으로 맞춘다
+    combined_snapshots = _combine_snapshots(
+        [kospi_result.daily_snapshots, nasdaq_result.daily_snapshots], [None, exchange_rate_df],
+    )
 
     # 합산 거래 및 수수료 (NASDAQ 수수료는 환율 반영)
-    all_trades = kospi_result.trades + nasdaq_result.trades
-    all_trades.sort(key=lambda t: t.date)
+    all_trades = TradeLog.concat([kospi_result.trades, nasdaq_result.trades]).sorted_by_date()
 
     # 합산 메트릭 계산
     metrics = _compute_metrics_from_snapshots(
         combined_snapshots, all_trades, params.initial_cash,
     )
     # 수수료는 KRW 기준으로 합산 (NASDAQ 수수료 * 시작 환율)
-    kospi_fee = sum(t.fee for t in kospi_result.trades)
-    nasdaq_fee = sum(t.fee for t in nasdaq_result.trades) * start_rate
+    kospi_fee = kospi_result.trades.total_fee()
+    nasdaq_fee = nasdaq_result.trades.total_fee() * start_rate
     metrics["total_fee"] = round(kospi_fee + nasdaq_fee, 0)
 
     return BacktestResult(
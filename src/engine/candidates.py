@@ -0,0 +1,59 @@
+"""매수 후보 역색인 모듈.
+
+매일 전 종목을 훑어 매수 후보를 모으고 전부 정렬하는 대신, 실행 전에 한 번
+거래일별 매수 시그널 종목을 우선순위 순으로 모아 둔다. 일별 루프는 그 목록을
+앞에서부터 필요한 만큼만 꺼내 쓰므로 하루 비용이 전체 종목 수가 아니라 실제로
+살펴본 후보 수에 비례한다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class BuyIndex:
+    """거래일별 매수 후보 열 번호 (CSR 형태).
+
+    거래일 t의 후보는 columns[offsets[t]:offsets[t + 1]]이며 이미 우선순위 순이다.
+    """
+    offsets: np.ndarray  # int64, 길이 거래일 수 + 1
+    columns: np.ndarray  # int64
+
+    def day(self, t: int) -> np.ndarray:
+        """거래일 t의 후보 열 번호 (우선순위 순)."""
+        return self.columns[self.offsets[t]:self.offsets[t + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+def build_buy_index(
+    buy: np.ndarray,
+    order: np.ndarray | None = None,
+    keys: np.ndarray | None = None,
+) -> BuyIndex:
+    """(거래일 수, 종목 수) 매수 시그널 배열에서 역색인을 만든다.
+
+    Args:
+        buy: 매수 시그널 bool 배열
+        order: 고정 우선순위 열 순서. 없으면 열 순서.
+        keys: (거래일 수, 종목 수) 우선순위 값 (예: n봉 수익률). 주어지면 거래일별로
+            이 값의 내림차순, 같은 값은 열 순서로 정렬한다 (order보다 우선).
+            Python의 안정 정렬 reverse=True와 같은 순서다.
+    """
+    n_days, n_codes = buy.shape
+    if keys is not None:
+        rows, cols = np.nonzero(buy)
+        perm = np.lexsort((cols, -keys[rows, cols], rows))
+        rows, cols = rows[perm], cols[perm]
+    elif order is not None:
+        order = np.asarray(order, dtype=np.int64)
+        rows, positions = np.nonzero(buy[:, order])
+        cols = order[positions]
+    else:
+        rows, cols = np.nonzero(buy)
+
+    offsets = np.zeros(n_days + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_days), out=offsets[1:])
+    return BuyIndex(offsets=offsets, columns=cols.astype(np.int64, copy=False))
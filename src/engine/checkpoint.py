@@ -0,0 +1,300 @@
+"""백테스트 체크포인트 모듈 - 끝난 실행을 저장해 두고 새 거래일만 이어서 실행한다.
+
+장 마감마다 몇 년치 run_backtest를 처음부터 다시 돌리는 대신, 실행이 끝난 시점의
+엔진 상태(현금, 보유 종목, 거래 내역, 일별 스냅샷, 종목별 스트릭 상태, n봉 수익률용
+최근 종가)를 .npz 파일 하나로 저장한다. 다음 실행은 마지막 거래일 이후의 봉만
+패널 엔진으로 처리하며, 전체 구간을 한 번에 실행한 결과와 같은 거래와 스냅샷을 만든다.
+
+    checkpoint = BacktestCheckpoint.new(params)
+    extend_backtest(checkpoint, price_data, listing_df)
+    save_checkpoint(checkpoint, path)
+    ...
+    checkpoint = load_checkpoint(path)
+    result = extend_backtest(checkpoint, new_bars, listing_df)
+"""
+
+import dataclasses
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import PricePanel
+from src.engine.backtest import (
+    BacktestParams,
+    BacktestResult,
+    _backtest_result,
+    _cap_rank,
+    _get_trading_dates,
+    _returns_n,
+)
+from src.engine.dense import MarketPanel, run_panel_loop, trailing_return_matrix
+from src.engine.kernel import run_kernel_loop
+from src.engine.pipeline import PackedMarket
+from src.engine.equity import EquityCurve
+from src.engine.portfolio import Holding, Portfolio
+from src.engine.signals import StreakState, panel_signals
+from src.engine.trade_log import TradeLog
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 4
+
+_SNAPSHOT_FIELDS = ("dates", "cash", "stock_value", "total_value")
+
+
+@dataclass
+class BacktestCheckpoint:
+    """이어서 실행할 수 있는 백테스트 상태.
+
+    Attributes:
+        params: 백테스트 파라미터 (end_date는 마지막으로 처리한 거래일)
+        codes: 열 순서의 종목코드 (새 종목은 뒤에 붙는다)
+        names: codes 순서의 종목명
+        last_date: 마지막으로 처리한 거래일 "YYYY-MM-DD" (처음이면 None)
+        portfolio: 현금, 보유 종목, 거래 내역, 일별 스냅샷
+        streak: 종목별 연속 상승/하락 상태 (panel_signals 이어 계산용)
+        tail_close: (n_rise_days, 종목 수) 종목별 최근 종가. 아래쪽이 최신이다.
+        tail_valid: tail_close 중 값이 있는 칸
+    """
+    params: BacktestParams
+    codes: list[str]
+    names: list[str]
+    last_date: str | None
+    portfolio: Portfolio
+    streak: StreakState
+    tail_close: np.ndarray
+    tail_valid: np.ndarray
+
+    @classmethod
+    def new(cls, params: BacktestParams) -> "BacktestCheckpoint":
+        """아직 아무 거래일도 처리하지 않은 상태."""
+        n = params.n_rise_days
+        return cls(
+            params=params,
+            codes=[],
+            names=[],
+            last_date=None,
+            portfolio=Portfolio(cash=params.initial_cash, fee_rate=params.fee_rate),
+            streak=StreakState.empty(0),
+            tail_close=np.full((n, 0), np.nan),
+            tail_valid=np.zeros((n, 0), dtype=bool),
+        )
+
+    def result(self, kospi_df: pd.DataFrame | None = None) -> BacktestResult:
+        """지금까지의 실행 결과를 run_backtest와 같은 형태로 만든다."""
+        return _backtest_result(self.portfolio, self.params, kospi_df)
+
+    def _add_codes(self, codes: list[str], name_map: dict[str, str]) -> None:
+        known = set(self.codes)
+        added = [code for code in codes if code not in known]
+        if not added:
+            return
+        self.codes += added
+        self.names += [name_map.get(code, code) for code in added]
+        empty = StreakState.empty(len(added))
+        for attr in ("prev_close", "has_prev", "up", "down"):
+            setattr(self.streak, attr, np.concatenate([getattr(self.streak, attr), getattr(empty, attr)]))
+        n = self.tail_close.shape[0]
+        self.tail_close = np.hstack([self.tail_close, np.full((n, len(added)), np.nan)])
+        self.tail_valid = np.hstack([self.tail_valid, np.zeros((n, len(added)), dtype=bool)])
+
+
+def _new_bars(
+    price_data: dict[str, pd.DataFrame], codes: list[str], last_date: str | None
+) -> tuple[pd.DatetimeIndex, np.ndarray, np.ndarray]:
+    """last_date 이후의 봉만 (거래일, 종가, 데이터 행 여부) 배열로 정렬한다."""
+    dates = _get_trading_dates(price_data)
+    if last_date is not None:
+        dates = dates[dates > pd.Timestamp(last_date)]
+    close = np.full((len(dates), len(codes)), np.nan, dtype=np.float64)
+    valid = np.zeros(close.shape, dtype=bool)
+    if len(dates) == 0:
+        return dates, close, valid
+    # 종목 날짜는 모두 달력에 있으므로 get_indexer 대신 정수 시각으로 위치를 찾는다
+    unit = dates.unit
+    stamps = dates.asi8
+    for j, code in enumerate(codes):
+        df = price_data.get(code)
+        if df is None or "Close" not in df.columns:
+            continue
+        index = df.index.as_unit(unit).asi8
+        first = np.searchsorted(index, stamps[0])
+        rows = np.searchsorted(stamps, index[first:])
+        close[rows, j] = df["Close"].to_numpy(dtype=np.float64)[first:]
+        valid[rows, j] = True
+    return dates, close, valid
+
+
+def _tail(close: np.ndarray, valid: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """종목별로 데이터 행 중 마지막 n개를 아래쪽으로 모은다."""
+    tail_close = np.full((n, close.shape[1]), np.nan)
+    tail_valid = np.zeros(tail_close.shape, dtype=bool)
+    if n <= 0:
+        return tail_close, tail_valid
+    remaining = np.cumsum(valid[::-1], axis=0)[::-1]  # 그 행을 포함해 뒤에 남은 데이터 행 수
+    rows, cols = np.nonzero(valid & (remaining <= n))
+    slots = n - remaining[rows, cols]
+    tail_close[slots, cols] = close[rows, cols]
+    tail_valid[slots, cols] = True
+    return tail_close, tail_valid
+
+
+def extend_backtest(
+    checkpoint: BacktestCheckpoint,
+    price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket,
+    listing_df: pd.DataFrame | None = None,
+    kospi_df: pd.DataFrame | None = None,
+    progress_callback=None,
+    listing_history: list[tuple[str, pd.DataFrame]] | None = None,
+) -> BacktestResult:
+    """checkpoint.last_date 이후의 봉으로 백테스트를 이어서 실행하고 checkpoint를 갱신한다.
+
+    price_data에 이미 처리한 날짜가 섞여 있어도 무시한다. 시그널은 저장된 스트릭
+    상태에서 panel_signals로 이어 계산하므로 엔진은 params.engine이 "numba"면
+    컴파일 커널, 그 밖에는 패널 루프다 (세 엔진의 결과는 같다). 종가는 float64로
+    계산한다. 처음 보는 종목은 기존 열 뒤에 붙으므로, 전체 구간을 한 번에 실행한
+    결과와 같으려면 그 실행의 종목 순서에서도 뒤에 있어야 한다.
+
+    Args:
+        checkpoint: BacktestCheckpoint.new 또는 load_checkpoint 결과
+        price_data: 새 봉이 담긴 {종목코드: 가격 DataFrame} (run_backtest와 같은 형태)
+        listing_df, listing_history: 종목명과 시가총액 정렬용 종목 목록 (run_backtest와 같다)
+        kospi_df: KOSPI 지수 DataFrame (벤치마크)
+        progress_callback: (current, total) 콜백
+
+    Returns:
+        처음부터 지금까지의 BacktestResult
+    """
+    if isinstance(price_data, PackedMarket):
+        price_data = price_data.price_data
+    elif isinstance(price_data, PricePanel):
+        price_data = price_data.to_price_data()
+
+    params = checkpoint.params
+    name_map: dict[str, str] = {}
+    if listing_df is not None and "Code" in listing_df.columns and "Name" in listing_df.columns:
+        name_map = dict(zip(listing_df["Code"], listing_df["Name"]))
+
+    checkpoint._add_codes(
+        [code for code, df in price_data.items() if "Close" in df.columns and not df.empty], name_map
+    )
+    codes = checkpoint.codes
+    dates, close, valid = _new_bars(price_data, codes, checkpoint.last_date)
+    if len(dates) == 0:
+        return checkpoint.result(kospi_df)
+
+    signals = panel_signals(close, params.n_rise_days, params.m_fall_days, params.y_emergency_pct,
+                            valid=valid, state=checkpoint.streak)
+    n = checkpoint.tail_close.shape[0]
+    joined_close = np.vstack([checkpoint.tail_close, close])
+    joined_valid = np.vstack([checkpoint.tail_valid, valid])
+    returns = None
+    if _returns_n(params) is not None:
+        returns = trailing_return_matrix(joined_close, joined_valid, n)[n:]
+
+    panel = MarketPanel(
+        dates=dates, codes=codes, close=close, valid=valid,
+        buy=signals["buy"], sell=signals["sell_fall"] | signals["sell_emergency"], returns=returns,
+    )
+    loop = run_kernel_loop if params.engine == "numba" else run_panel_loop
+    loop(
+        panel, checkpoint.portfolio, dict(zip(codes, checkpoint.names)),
+        params.max_buy_amount, params.min_balance,
+        cap_rank=_cap_rank(params, listing_df, listing_history, panel),
+        progress_callback=progress_callback,
+    )
+
+    checkpoint.tail_close, checkpoint.tail_valid = _tail(joined_close, joined_valid, n)
+    checkpoint.last_date = dates[-1].strftime("%Y-%m-%d")
+    checkpoint.params = dataclasses.replace(params, end_date=checkpoint.last_date)
+    return checkpoint.result(kospi_df)
+
+
+def save_checkpoint(checkpoint: BacktestCheckpoint, path: str | Path) -> None:
+    """체크포인트를 열 단위 배열의 .npz 파일 하나로 저장한다 (임시 파일에 쓴 뒤 교체)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    portfolio = checkpoint.portfolio
+    holdings = list(portfolio.holdings.values())
+    meta = {
+        "version": CHECKPOINT_VERSION,
+        "params": dataclasses.asdict(checkpoint.params),
+        "last_date": checkpoint.last_date,
+        "cash": portfolio.cash,
+        "stock_value": portfolio.stock_value,
+    }
+    arrays = {
+        "codes": np.array(checkpoint.codes, dtype=str),
+        "names": np.array(checkpoint.names, dtype=str),
+        "hold_code": np.array([h.code for h in holdings], dtype=str),
+        "hold_name": np.array([h.name for h in holdings], dtype=str),
+        "hold_qty": np.array([h.quantity for h in holdings], dtype=np.int64),
+        "hold_avg": np.array([h.avg_price for h in holdings], dtype=np.float64),
+        # 평가액 합계는 차이로 갱신되므로 종목별 평가액과 합계를 그대로 이어 쓴다
+        "hold_value": np.array([portfolio.market_values.get(h.code, 0.0) for h in holdings], dtype=np.float64),
+        "streak_prev_close": checkpoint.streak.prev_close,
+        "streak_has_prev": checkpoint.streak.has_prev,
+        "streak_up": checkpoint.streak.up,
+        "streak_down": checkpoint.streak.down,
+        "tail_close": checkpoint.tail_close,
+        "tail_valid": checkpoint.tail_valid,
+    }
+    # 거래 기록은 TradeLog의 구조화 배열과 문자열 풀을 그대로 저장한다
+    arrays["trades"] = portfolio.trades.data
+    arrays["trade_strings"] = np.array(portfolio.trades.strings, dtype=str)
+    # 일별 스냅샷도 EquityCurve의 열을 그대로 저장한다 (날짜는 1970-01-01 기준 일수)
+    for name in _SNAPSHOT_FIELDS:
+        column = getattr(portfolio.daily_snapshots, name)
+        arrays[f"snap_{name}"] = column.view(np.int64) if name == "dates" else column
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp.npz")
+    np.savez(tmp_path, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str | Path) -> BacktestCheckpoint | None:
+    """저장된 체크포인트를 읽는다. 파일이 없거나 읽을 수 없으면 None."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != CHECKPOINT_VERSION:
+                logger.warning("Ignoring checkpoint %s with version %s", path, meta.get("version"))
+                return None
+            columns = {key: data[key] for key in data.files if key != "meta"}
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+        return None
+
+    params = BacktestParams(**meta["params"])
+    portfolio = Portfolio(cash=meta["cash"], fee_rate=params.fee_rate)
+    for code, name, qty, avg, value in zip(columns["hold_code"].tolist(), columns["hold_name"].tolist(),
+                                           columns["hold_qty"].tolist(), columns["hold_avg"].tolist(),
+                                           columns["hold_value"].tolist()):
+        portfolio.holdings[code] = Holding(code=code, name=name, quantity=qty, avg_price=avg)
+        portfolio.market_values[code] = value
+    portfolio.stock_value = meta["stock_value"]
+    portfolio.trades = TradeLog.from_arrays(columns["trades"], columns["trade_strings"].tolist())
+    portfolio.daily_snapshots = EquityCurve.from_arrays(*(columns[f"snap_{name}"] for name in _SNAPSHOT_FIELDS))
+    return BacktestCheckpoint(
+        params=params,
+        codes=columns["codes"].tolist(),
+        names=columns["names"].tolist(),
+        last_date=meta["last_date"],
+        portfolio=portfolio,
+        streak=StreakState(
+            prev_close=columns["streak_prev_close"],
+            has_prev=columns["streak_has_prev"],
+            up=columns["streak_up"],
+            down=columns["streak_down"],
+        ),
+        tail_close=columns["tail_close"],
+        tail_valid=columns["tail_valid"],
+    )
@@ -0,0 +1,283 @@
+"""날짜 × 종목 밀집 배열 실행 엔진 모듈.
+
+모든 종목을 한 번만 거래일 달력에 맞춰 (거래일 수, 종목 수) NumPy 배열로
+정렬한다. 일별 루프는 pandas 라벨 조회 없이 정수 행/열 인덱스만 사용하며,
+같은 입력에 대해 기본(pandas) 엔진과 같은 거래와 일별 스냅샷을 만든다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import PricePanel
+from src.engine.candidates import BuyIndex, build_buy_index
+from src.engine.portfolio import Portfolio
+from src.engine.signal_cache import SignalArrays
+from src.engine.signals import compute_signals, panel_signals
+
+
+@dataclass
+class MarketPanel:
+    """거래일 × 종목 배열. 열 순서는 시그널(없으면 가격) 딕셔너리 순서를 따른다.
+
+    Attributes:
+        dates: 거래일 달력
+        codes: 열 순서의 종목코드
+        close: 종가 (빈 칸은 NaN)
+        valid: 해당 거래일에 종목 데이터 행이 있는지 여부
+        buy: 매수 시그널
+        sell: 매도 시그널 (연속 하락 또는 급락)
+        returns: 종목 자체 시계열 기준 n봉 수익률 (return_rate 정렬에만 사용)
+        computed: 패널을 만들며 새로 계산한 시그널 (시그널 캐시 저장용)
+    """
+    dates: pd.DatetimeIndex
+    codes: list[str]
+    close: np.ndarray
+    valid: np.ndarray
+    buy: np.ndarray
+    sell: np.ndarray
+    returns: np.ndarray | None = None
+    computed: SignalArrays | None = None
+
+
+def _trailing_returns(values: np.ndarray, n: int) -> np.ndarray:
+    """n봉 전 대비 수익률. 앞쪽 n봉과 기준가가 0 이하인 경우는 0.
+
+    원래 dtype 그대로 계산한 뒤 float64로 바꾸므로 pandas 엔진의 스칼라 계산과
+    값이 같다.
+    """
+    result = np.zeros(len(values), dtype=np.float64)
+    if n <= 0 or len(values) <= n:
+        return result
+    start, end = values[:-n], values[n:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result[n:] = np.where(start > 0, (end - start) / start, 0.0)
+    return result
+
+
+def trailing_return_matrix(close: np.ndarray, valid: np.ndarray, n: int) -> np.ndarray:
+    """(거래일 수, 종목 수) 종가 배열 전체의 n봉 수익률을 한 번에 계산한다.
+
+    종목마다 자기 데이터 행(valid)만 이어 붙인 1차원 배열에서 n칸 앞 값과 비교하므로
+    종목별 _trailing_returns와 같은 값이다 (float64 종가 기준). 데이터 행이 없는
+    칸은 0.
+    """
+    result = np.zeros(close.shape, dtype=np.float64)
+    if n <= 0:
+        return result
+    mask = valid.T
+    values = close.T[mask]
+    counts = mask.sum(axis=1)
+    segment_start = np.repeat(np.cumsum(counts) - counts, counts)
+    previous = np.arange(len(values)) - n
+    has_previous = previous >= segment_start
+    start = values[np.where(has_previous, previous, 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result.T[mask] = np.where(has_previous & (start > 0), (values - start) / start, 0.0)
+    return result
+
+
+def build_market_panel(
+    price_data: dict[str, pd.DataFrame],
+    dates: pd.DatetimeIndex,
+    signals: dict[str, dict[str, pd.Series]] | None = None,
+    n_rise: int = 0,
+    m_fall: int = 0,
+    y_pct: float = 0.0,
+    returns_n: int | None = None,
+    cached: SignalArrays | None = None,
+) -> MarketPanel:
+    """종목별 가격/시그널을 거래일 달력 위의 배열로 정렬한다.
+
+    signals가 없으면 panel_signals로 전 종목 시그널을 한 번에 계산한다. 단
+    float32 등 float64/정수가 아닌 종가가 섞여 있으면 기준 구현과 같은 값을
+    내도록 종목별 compute_signals를 사용한다. 새로 계산한 시그널은
+    MarketPanel.computed에 담아 돌려준다.
+
+    Args:
+        price_data: {종목코드: 가격 DataFrame}
+        dates: 거래일 달력 (모든 종목 날짜의 유니온)
+        signals: 미리 계산된 {종목코드: {"buy", "sell_fall", "sell_emergency": bool Series}}
+        n_rise, m_fall, y_pct: signals가 없을 때 사용할 시그널 파라미터
+        returns_n: 주어지면 n봉 수익률 배열도 만든다 (return_rate 정렬용, trailing_return_matrix)
+        cached: 시그널 캐시에서 찾은 시그널 (signals가 없을 때만 사용)
+    """
+    if signals is not None:
+        codes = list(signals)
+    elif cached is not None:
+        codes = cached.codes
+    else:
+        codes = [code for code, df in price_data.items() if "Close" in df.columns and not df.empty]
+    shape = (len(dates), len(codes))
+    close = np.full(shape, np.nan, dtype=np.float64)
+    valid = np.zeros(shape, dtype=bool)
+
+    exact_dtypes = True
+    for j, code in enumerate(codes):
+        series = price_data[code]["Close"]
+        rows = dates.get_indexer(series.index)
+        values = series.to_numpy()
+        close[rows, j] = values
+        valid[rows, j] = True
+        exact_dtypes &= values.dtype == np.float64 or np.issubdtype(values.dtype, np.integer)
+
+    returns = None
+    if returns_n is not None and exact_dtypes:
+        returns = trailing_return_matrix(close, valid, returns_n)
+    elif returns_n is not None:
+        # float32 등은 원래 dtype으로 계산해야 기준 구현과 값이 같다
+        returns = np.zeros(shape, dtype=np.float64)
+        for j, code in enumerate(codes):
+            series = price_data[code]["Close"]
+            returns[dates.get_indexer(series.index), j] = _trailing_returns(series.to_numpy(), returns_n)
+
+    computed = None
+    if signals is None and cached is not None:
+        dense = cached.to_panel(valid)
+        buy = dense["buy"]
+        sell = dense["sell_fall"] | dense["sell_emergency"]
+    elif signals is None and exact_dtypes:
+        dense = panel_signals(close, n_rise, m_fall, y_pct, valid=valid)
+        computed = SignalArrays.from_panel(codes, valid, dense)
+        buy = dense["buy"]
+        sell = dense["sell_fall"] | dense["sell_emergency"]
+    else:
+        if signals is None:
+            signals = {
+                code: compute_signals(price_data[code]["Close"], n_rise, m_fall, y_pct)
+                for code in codes
+            }
+            computed = SignalArrays.from_series(signals)
+        buy = np.zeros(shape, dtype=bool)
+        sell = np.zeros(shape, dtype=bool)
+        for j, code in enumerate(codes):
+            sig = signals[code]
+            buy[dates.get_indexer(sig["buy"].index), j] = sig["buy"].to_numpy(dtype=bool)
+            for key in ("sell_fall", "sell_emergency"):
+                sell[dates.get_indexer(sig[key].index), j] |= sig[key].to_numpy(dtype=bool)
+
+    return MarketPanel(dates=dates, codes=codes, close=close, valid=valid,
+                       buy=buy, sell=sell, returns=returns, computed=computed)
+
+
+def build_market_panel_from_prices(
+    prices: PricePanel,
+    n_rise: int,
+    m_fall: int,
+    y_pct: float,
+    returns_n: int | None = None,
+) -> MarketPanel:
+    """메모리 매핑 PricePanel의 종가 행렬로 바로 MarketPanel을 만든다.
+
+    종목별 DataFrame으로 풀었다가 다시 쌓지 않으므로 종가 행렬을 복사하지 않는다.
+    결과는 to_price_data()를 build_market_panel에 넣은 것과 같다. 종가가 NaN인 칸은
+    데이터 행이 아니며, 데이터가 한 칸도 없는 날짜/종목이 있을 때만 그 행/열을 뺀
+    사본을 만든다. 시그널은 panel_signals로 계산한다.
+    """
+    close = prices.close
+    valid = ~np.isnan(close)
+    rows, cols = valid.any(axis=1), valid.any(axis=0)
+    dates, codes = prices.dates, list(prices.codes)
+    if not rows.all() or not cols.all():
+        close, valid = close[np.ix_(rows, cols)], valid[np.ix_(rows, cols)]
+        dates, codes = dates[rows], [code for code, keep in zip(codes, cols) if keep]
+
+    returns = trailing_return_matrix(close, valid, returns_n) if returns_n is not None else None
+    dense = panel_signals(close, n_rise, m_fall, y_pct, valid=valid)
+    return MarketPanel(dates=dates, codes=codes, close=close, valid=valid,
+                       buy=dense["buy"], sell=dense["sell_fall"] | dense["sell_emergency"],
+                       returns=returns, computed=SignalArrays.from_panel(codes, valid, dense))
+
+
+def panel_buy_index(panel: MarketPanel, cap_rank: np.ndarray | None = None) -> BuyIndex:
+    """패널의 매수 후보 역색인을 run_panel_loop의 우선순위로 만든다.
+
+    cap_rank가 있으면 거래일별 시가총액 순위 순, 없고 panel.returns가 있으면
+    거래일별 n봉 수익률 내림차순, 둘 다 없으면 열 순서. 같은 값은 열 순서.
+    """
+    if cap_rank is not None:
+        return build_buy_index(panel.buy, keys=-cap_rank)
+    return build_buy_index(panel.buy, keys=panel.returns)
+
+
+def iter_panel_loop(
+    panel: MarketPanel,
+    portfolio: Portfolio,
+    name_map: dict[str, str],
+    max_buy_amount: float,
+    min_balance: float,
+    cap_rank: np.ndarray | None = None,
+):
+    """run_panel_loop의 제너레이터 버전. 거래일 t의 스냅샷을 기록할 때마다 t를 내보낸다.
+
+    호출자는 portfolio.daily_snapshots[-1]과 새로 늘어난 portfolio.trades로 그날의
+    결과를 보고, 더 진행하지 않으려면 순회를 멈추면 된다.
+    """
+    codes = panel.codes
+    column = {code: j for j, code in enumerate(codes)}
+    names = [name_map.get(code, code) for code in codes]
+    close, valid, sell = panel.close, panel.valid, panel.sell
+    buy_index = panel_buy_index(panel, cap_rank)
+    offsets, columns = buy_index.offsets.tolist(), buy_index.columns
+    date_strs = panel.dates.strftime("%Y-%m-%d")
+    holdings = portfolio.holdings
+    held = np.zeros(len(codes), dtype=bool)
+    held[[column[code] for code in holdings]] = True
+
+    for t, date_str in enumerate(date_strs):
+        # ── SELL Phase ── (보유 순서대로)
+        sell_row = sell[t]
+        for code in [code for code in holdings if sell_row[column[code]]]:
+            j = column[code]
+            if valid[t, j] and portfolio.sell_all(date_str, code, names[j], float(close[t, j])):
+                held[j] = False
+
+        # ── BUY Phase ── (우선순위 순 후보를 현금이 허락하는 만큼만 꺼낸다)
+        for k in range(offsets[t], offsets[t + 1]):
+            j = columns[k]
+            if held[j]:
+                continue
+            if portfolio.cash < min_balance:
+                break
+            if portfolio.buy(date_str, codes[j], names[j], float(close[t, j]),
+                             max_buy_amount, min_balance):
+                held[j] = True
+
+        # ── SNAPSHOT ── (보유 종목 중 데이터 행 여부나 종가가 전날과 다른 종목만 다시 평가한다.
+        # 매수/매도한 종목은 Portfolio가 체결가로 갱신하고, 첫날은 전부 평가한다)
+        row, present = close[t], valid[t]
+        prev_row, prev_present = (close[t - 1], valid[t - 1]) if t else (row, ~present)
+        for code in holdings:
+            j = column[code]
+            if present[j] != prev_present[j] or (present[j] and not row[j] == prev_row[j]):
+                portfolio.mark(code, float(row[j]) if present[j] else None)
+        portfolio.record_snapshot(date_str)
+        yield t
+
+
+def run_panel_loop(
+    panel: MarketPanel,
+    portfolio: Portfolio,
+    name_map: dict[str, str],
+    max_buy_amount: float,
+    min_balance: float,
+    cap_rank: np.ndarray | None = None,
+    progress_callback=None,
+) -> None:
+    """밀집 배열 위에서 일별 매도 → 매수 → 스냅샷 루프를 실행한다.
+
+    Args:
+        panel: build_market_panel 결과
+        portfolio: 거래를 기록할 포트폴리오
+        name_map: {종목코드: 종목명}
+        max_buy_amount: 종목당 최대 매수 금액
+        min_balance: 매수 후 최소 잔고
+        cap_rank: 거래일별 시가총액 순위 (MarketCapPanel.rank). 주어지면 시가총액
+            순으로 매수한다. 없고 panel.returns가 있으면 n봉 수익률 순, 둘 다 없으면 열 순서.
+        progress_callback: (current, total) 콜백
+    """
+    total_days = len(panel.dates)
+    for t in iter_panel_loop(panel, portfolio, name_map, max_buy_amount, min_balance, cap_rank):
+        if progress_callback:
+            progress_callback(t + 1, total_days)
@@ -0,0 +1,161 @@
+"""열 단위 자산 곡선 모듈.
+
+거래일마다 DailySnapshot과 날짜 문자열을 만드는 대신, 미리 잡아 두고 두 배씩
+늘리는 datetime64[D] / float64 배열에 일별 현금, 주식 평가액, 총 자산을 기록한다.
+지표 계산과 차트는 배열이나 DataFrame을 그대로 쓰고, 기존 호출자를 위해
+순회/인덱싱은 DailySnapshot을 만들어 돌려준다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.engine.trade_log import date_to_day, day_to_date
+
+_INITIAL_CAPACITY = 256
+
+
+@dataclass
+class DailySnapshot:
+    """일별 자산 현황."""
+    date: str
+    cash: float
+    stock_value: float
+    total_value: float
+
+
+class EquityCurve:
+    """열 단위 일별 자산 곡선. list[DailySnapshot]처럼 len/순회/인덱싱/비교할 수 있다."""
+
+    __slots__ = ("_dates", "_cash", "_stock", "_total", "_size")
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._dates = np.empty(capacity, dtype="datetime64[D]")
+        self._cash = np.empty(capacity, dtype=np.float64)
+        self._stock = np.empty(capacity, dtype=np.float64)
+        self._total = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    @classmethod
+    def from_snapshots(cls, snapshots) -> "EquityCurve":
+        """list[DailySnapshot] (또는 EquityCurve)에서 만든다."""
+        curve = cls(max(_INITIAL_CAPACITY, len(snapshots)))
+        for s in snapshots:
+            curve.record(s.date, s.cash, s.stock_value, s.total_value)
+        return curve
+
+    @classmethod
+    def from_arrays(cls, dates, cash, stock_value, total_value=None) -> "EquityCurve":
+        """날짜 (datetime64 또는 1970-01-01 기준 일수)와 금액 배열에서 만든다."""
+        curve = cls(max(_INITIAL_CAPACITY, len(dates)))
+        curve.extend_columns(dates, cash, stock_value, total_value)
+        return curve
+
+    # ── 기록 ──
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._cash):
+            return
+        capacity = max(needed, 2 * len(self._cash), _INITIAL_CAPACITY)
+        for attr in self.__slots__[:-1]:
+            old = getattr(self, attr)
+            grown = np.empty(capacity, dtype=old.dtype)
+            grown[:self._size] = old[:self._size]
+            setattr(self, attr, grown)
+
+    def record(self, date: str, cash: float, stock_value: float, total_value: float | None = None) -> None:
+        """하루를 기록한다. total_value가 없으면 cash + stock_value."""
+        self._reserve(1)
+        i = self._size
+        self._dates.view(np.int64)[i] = date_to_day(date)
+        self._cash[i] = cash
+        self._stock[i] = stock_value
+        self._total[i] = cash + stock_value if total_value is None else total_value
+        self._size += 1
+
+    def extend_columns(self, dates, cash, stock_value, total_value=None) -> None:
+        """여러 날을 한 번에 기록한다. dates는 datetime64 또는 1970-01-01 기준 일수."""
+        dates = np.asarray(dates)
+        if not np.issubdtype(dates.dtype, np.datetime64):
+            dates = dates.astype(np.int64).view("datetime64[D]")
+        n = len(dates)
+        self._reserve(n)
+        block = slice(self._size, self._size + n)
+        self._dates[block] = dates
+        self._cash[block] = cash
+        self._stock[block] = stock_value
+        self._total[block] = np.add(cash, stock_value) if total_value is None else total_value
+        self._size += n
+
+    # ── 열 단위 조회 ──
+
+    @property
+    def dates(self) -> np.ndarray:
+        """datetime64[D] 배열 (복사하지 않은 뷰)."""
+        return self._dates[:self._size]
+
+    @property
+    def cash(self) -> np.ndarray:
+        return self._cash[:self._size]
+
+    @property
+    def stock_value(self) -> np.ndarray:
+        return self._stock[:self._size]
+
+    @property
+    def total_value(self) -> np.ndarray:
+        return self._total[:self._size]
+
+    def date_strings(self) -> list[str]:
+        """"YYYY-MM-DD" 날짜 목록."""
+        return [day_to_date(day) for day in self.dates.view(np.int64).tolist()]
+
+    def to_frame(self) -> pd.DataFrame:
+        """날짜 인덱스에 cash / stock_value / total_value 컬럼을 가진 DataFrame."""
+        return pd.DataFrame(
+            {"cash": self.cash, "stock_value": self.stock_value, "total_value": self.total_value},
+            index=pd.DatetimeIndex(self.dates, name="Date"),
+        )
+
+    # ── list[DailySnapshot] 호환 ──
+
+    def _snapshots(self, rows: slice) -> list[DailySnapshot]:
+        days = self._dates[:self._size][rows].view(np.int64).tolist()
+        return [
+            DailySnapshot(date=day_to_date(day), cash=cash, stock_value=stock, total_value=total)
+            for day, cash, stock, total in zip(
+                days, self.cash[rows].tolist(), self.stock_value[rows].tolist(), self.total_value[rows].tolist(),
+            )
+        ]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        return iter(self._snapshots(slice(None)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._snapshots(index)
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("snapshot index out of range")
+        return self._snapshots(slice(index, index + 1))[0]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (EquityCurve, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"EquityCurve({len(self)} days)"
+
+
+def as_equity_curve(snapshots) -> EquityCurve:
+    """EquityCurve는 그대로, list[DailySnapshot]은 EquityCurve로 바꿔 반환한다."""
+    return snapshots if isinstance(snapshots, EquityCurve) else EquityCurve.from_snapshots(snapshots)
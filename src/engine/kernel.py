@@ -0,0 +1,298 @@
+"""Numba 컴파일 시뮬레이션 커널 모듈 (선택 기능).
+
+run_panel_loop의 매도 → 매수 → 스냅샷 루프와 Portfolio.buy/sell_all의 현금 계산을
+NumPy 배열만 다루는 함수 하나로 옮긴다. 같은 연산 순서(내림 수량, 수수료 재계산,
+보유 순서 매도, 안정 정렬 매수 순서, 평가액 합계의 차이 갱신)를 그대로 따르므로 거래와 일별 스냅샷이
+Python 엔진과 비트 단위로 같다.
+
+numba가 설치되어 있지 않으면 run_kernel_loop는 run_panel_loop로 대신 실행한다.
+"""
+
+import logging
+
+import numpy as np
+
+from src.engine.dense import MarketPanel, panel_buy_index, run_panel_loop
+from src.engine.portfolio import Holding, Portfolio
+from src.engine.trade_log import SIDE_BUY, SIDE_SELL, days_of
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba는 선택 의존성
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+NUMBA_AVAILABLE = numba is not None
+
+_INITIAL_TRADE_CAPACITY = 1024
+
+
+def _grow(values: np.ndarray, size: int) -> np.ndarray:
+    grown = np.empty(size, dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+def _simulate(
+    close, valid, sell, cand_offsets, cand_cols,
+    cash, fee_rate, max_buy_amount, min_balance,
+    held_cols, held_qty, held_avg, held_val, stock_value,
+):
+    """일별 루프 본체. numba가 있으면 그대로 컴파일된다.
+
+    Args:
+        close, valid, sell: MarketPanel 배열 (거래일 수, 종목 수)
+        cand_offsets, cand_cols: 우선순위 순 매수 후보 역색인 (BuyIndex)
+        cash, fee_rate, max_buy_amount, min_balance: Portfolio/BacktestParams 값
+        held_cols, held_qty, held_avg, held_val: 시작 보유 종목과 평가액 (보유 순서)
+        stock_value: 시작 평가액 합계 (Portfolio.stock_value)
+
+    Returns:
+        (거래 열 배열 8개, 일별 현금, 일별 평가액, 최종 현금, 최종 보유 4개 배열, 최종 평가액 합계)
+    """
+    n_days, n_codes = close.shape
+    fee_mult = fee_rate / 100
+
+    # 보유 종목 - 매수 순서를 유지하는 열 번호 목록
+    hold_cols = np.empty(n_codes, dtype=np.int64)
+    hold_qty = np.empty(n_codes, dtype=np.int64)
+    hold_avg = np.empty(n_codes, dtype=np.float64)
+    hold_val = np.empty(n_codes, dtype=np.float64)
+    is_held = np.zeros(n_codes, dtype=np.bool_)
+    n_held = len(held_cols)
+    for k in range(n_held):
+        hold_cols[k] = held_cols[k]
+        hold_qty[k] = held_qty[k]
+        hold_avg[k] = held_avg[k]
+        hold_val[k] = held_val[k]
+        is_held[held_cols[k]] = True
+
+    capacity = _INITIAL_TRADE_CAPACITY
+    t_day = np.empty(capacity, dtype=np.int64)
+    t_col = np.empty(capacity, dtype=np.int64)
+    t_side = np.empty(capacity, dtype=np.int8)
+    t_price = np.empty(capacity, dtype=np.float64)
+    t_qty = np.empty(capacity, dtype=np.int64)
+    t_amount = np.empty(capacity, dtype=np.float64)
+    t_fee = np.empty(capacity, dtype=np.float64)
+    t_profit = np.empty(capacity, dtype=np.float64)
+    n_trades = 0
+
+    eq_cash = np.empty(n_days, dtype=np.float64)
+    eq_stock = np.empty(n_days, dtype=np.float64)
+
+    for t in range(n_days):
+        # ── SELL Phase ── (보유 순서대로)
+        k = 0
+        while k < n_held:
+            j = hold_cols[k]
+            if sell[t, j] and valid[t, j]:
+                price = close[t, j]
+                quantity = hold_qty[k]
+                amount = quantity * price
+                fee = amount * fee_mult
+                net_amount = amount - fee
+                profit = net_amount - (hold_avg[k] * quantity)
+                cash += net_amount
+
+                if n_trades == capacity:
+                    capacity *= 2
+                    t_day = _grow(t_day, capacity)
+                    t_col = _grow(t_col, capacity)
+                    t_side = _grow(t_side, capacity)
+                    t_price = _grow(t_price, capacity)
+                    t_qty = _grow(t_qty, capacity)
+                    t_amount = _grow(t_amount, capacity)
+                    t_fee = _grow(t_fee, capacity)
+                    t_profit = _grow(t_profit, capacity)
+                t_day[n_trades] = t
+                t_col[n_trades] = j
+                t_side[n_trades] = SIDE_SELL
+                t_price[n_trades] = price
+                t_qty[n_trades] = quantity
+                t_amount[n_trades] = amount
+                t_fee[n_trades] = fee
+                t_profit[n_trades] = profit
+                n_trades += 1
+
+                is_held[j] = False
+                old = hold_val[k]
+                for r in range(k, n_held - 1):
+                    hold_cols[r] = hold_cols[r + 1]
+                    hold_qty[r] = hold_qty[r + 1]
+                    hold_avg[r] = hold_avg[r + 1]
+                    hold_val[r] = hold_val[r + 1]
+                n_held -= 1
+                # Portfolio.sell_all과 같은 평가액 합계 갱신
+                if n_held == 0:
+                    stock_value = 0.0
+                elif np.isnan(old):
+                    stock_value = 0.0
+                    for r in range(n_held):
+                        stock_value += hold_val[r]
+                else:
+                    stock_value -= old
+            else:
+                k += 1
+
+        # ── BUY Phase ── (우선순위 순 후보를 현금이 허락하는 만큼만)
+        for p in range(cand_offsets[t], cand_offsets[t + 1]):
+            j = cand_cols[p]
+            if is_held[j]:
+                continue
+            if cash < min_balance:
+                break
+            price = close[t, j]
+
+            # Portfolio.buy와 같은 순서의 계산
+            if price <= 0:
+                continue
+            available = cash - min_balance
+            if available <= 0:
+                continue
+            buy_amount = min(max_buy_amount, available)
+            quantity = np.int64(np.floor(buy_amount / price))
+            if quantity <= 0:
+                continue
+            amount = quantity * price
+            fee = amount * fee_mult
+            total_cost = amount + fee
+            if total_cost > cash - min_balance:
+                quantity = np.int64(np.floor((available - fee) / price))
+                if quantity <= 0:
+                    continue
+                amount = quantity * price
+                fee = amount * fee_mult
+                total_cost = amount + fee
+            if total_cost > cash:
+                continue
+            cash -= total_cost
+
+            hold_cols[n_held] = j
+            hold_qty[n_held] = quantity
+            hold_avg[n_held] = price
+            hold_val[n_held] = quantity * price
+            is_held[j] = True
+            n_held += 1
+            stock_value += hold_val[n_held - 1]
+
+            if n_trades == capacity:
+                capacity *= 2
+                t_day = _grow(t_day, capacity)
+                t_col = _grow(t_col, capacity)
+                t_side = _grow(t_side, capacity)
+                t_price = _grow(t_price, capacity)
+                t_qty = _grow(t_qty, capacity)
+                t_amount = _grow(t_amount, capacity)
+                t_fee = _grow(t_fee, capacity)
+                t_profit = _grow(t_profit, capacity)
+            t_day[n_trades] = t
+            t_col[n_trades] = j
+            t_side[n_trades] = SIDE_BUY
+            t_price[n_trades] = price
+            t_qty[n_trades] = quantity
+            t_amount[n_trades] = amount
+            t_fee[n_trades] = fee
+            t_profit[n_trades] = 0.0
+            n_trades += 1
+
+        # ── SNAPSHOT ── (Portfolio.mark와 같이 보유 순서대로 평가액 차이를 더한다.
+        # 가격이 없는 날은 평균 매입가, NaN이던 평가액이 바뀌면 다시 합산)
+        for k in range(n_held):
+            j = hold_cols[k]
+            if valid[t, j]:
+                value = hold_qty[k] * close[t, j]
+            else:
+                value = hold_qty[k] * hold_avg[k]
+            old = hold_val[k]
+            hold_val[k] = value
+            if np.isnan(old):
+                stock_value = 0.0
+                for r in range(n_held):
+                    stock_value += hold_val[r]
+            else:
+                stock_value += value - old
+        eq_cash[t] = cash
+        eq_stock[t] = stock_value
+
+    return (
+        t_day[:n_trades], t_col[:n_trades], t_side[:n_trades], t_price[:n_trades],
+        t_qty[:n_trades], t_amount[:n_trades], t_fee[:n_trades], t_profit[:n_trades],
+        eq_cash, eq_stock, cash,
+        hold_cols[:n_held].copy(), hold_qty[:n_held].copy(), hold_avg[:n_held].copy(),
+        hold_val[:n_held].copy(), stock_value,
+    )
+
+
+if NUMBA_AVAILABLE:
+    _grow = numba.njit(cache=True)(_grow)
+    _simulate_jit = numba.njit(cache=True)(_simulate)
+else:
+    _simulate_jit = None
+
+
+def run_kernel_loop(
+    panel: MarketPanel,
+    portfolio: Portfolio,
+    name_map: dict[str, str],
+    max_buy_amount: float,
+    min_balance: float,
+    cap_rank: np.ndarray | None = None,
+    progress_callback=None,
+    simulate=None,
+) -> None:
+    """run_panel_loop과 같은 인자로 컴파일된 커널을 실행하고 결과를 portfolio에 반영한다.
+
+    numba가 없으면 run_panel_loop를 호출한다. simulate로 커널 함수를 바꿀 수 있다
+    (테스트에서 컴파일하지 않은 _simulate를 돌릴 때 사용).
+    """
+    simulate = simulate or _simulate_jit
+    if simulate is None:
+        logger.info("numba is not installed; using the Python panel loop")
+        run_panel_loop(panel, portfolio, name_map, max_buy_amount, min_balance,
+                       cap_rank=cap_rank, progress_callback=progress_callback)
+        return
+
+    codes = panel.codes
+    buy_index = panel_buy_index(panel, cap_rank)
+    # 배열 레이아웃마다 따로 컴파일되지 않도록 C 순서로 맞춘다
+    close, valid, sell = (np.ascontiguousarray(a) for a in (panel.close, panel.valid, panel.sell))
+
+    column = {code: j for j, code in enumerate(codes)}
+    held = list(portfolio.holdings.values())
+    (t_day, t_col, t_side, t_price, t_qty, t_amount, t_fee, t_profit,
+     eq_cash, eq_stock, cash, hold_cols, hold_qty, hold_avg, hold_val, stock_value) = simulate(
+        close, valid, sell, buy_index.offsets, buy_index.columns,
+        float(portfolio.cash), float(portfolio.fee_rate), float(max_buy_amount), float(min_balance),
+        np.array([column[h.code] for h in held], dtype=np.int64),
+        np.array([h.quantity for h in held], dtype=np.int64),
+        np.array([h.avg_price for h in held], dtype=np.float64),
+        np.array([portfolio.market_values.get(h.code, 0.0) for h in held], dtype=np.float64),
+        float(portfolio.stock_value),
+    )
+
+    names = [name_map.get(code, code) for code in codes]
+    days = days_of(panel.dates)
+    trades = portfolio.trades
+    code_ids = np.array([trades.intern(code) for code in codes], dtype=np.int32)
+    name_ids = np.array([trades.intern(name) for name in names], dtype=np.int32)
+    trades.extend_columns(
+        date=days[t_day], code=code_ids[t_col], name=name_ids[t_col], side=t_side,
+        price=t_price, quantity=t_qty, amount=t_amount, fee=t_fee, profit=t_profit,
+    )
+    portfolio.daily_snapshots.extend_columns(days, eq_cash, eq_stock)
+
+    previous = {h.code: h for h in held}
+    portfolio.cash = cash
+    portfolio.holdings = {}
+    portfolio.market_values = {}
+    for j, qty, avg, value in zip(hold_cols.tolist(), hold_qty.tolist(), hold_avg.tolist(), hold_val.tolist()):
+        code = codes[j]
+        name = previous[code].name if code in previous else names[j]
+        portfolio.holdings[code] = Holding(code=code, name=name, quantity=qty, avg_price=avg)
+        portfolio.market_values[code] = value
+    portfolio.stock_value = stock_value
+
+    if progress_callback and len(days):
+        progress_callback(len(days), len(days))
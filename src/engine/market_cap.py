@@ -0,0 +1,92 @@
+"""시점별(point-in-time) 시가총액 패널 모듈.
+
+종목 목록 하나의 Marcap으로 과거 전체 구간을 정렬하면 과거 거래일에 미래의
+시가총액을 쓰게 된다. 여기서는 거래일마다 그날 종가 × 그날 기준 상장주식수로
+시가총액을 만들고, 거래일별 순위 배열을 실행 전에 한 번 계산한다. 상장주식수는
+거래일 이전의 가장 최근 종목 목록 스냅샷에서 가져온다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class MarketCapPanel:
+    """거래일 × 종목 시가총액과 거래일별 순위.
+
+    Attributes:
+        dates: 거래일 달력
+        codes: 열 순서의 종목코드
+        cap: 시가총액 (알 수 없는 종목은 0, 종가가 없는 칸은 NaN)
+        rank: 거래일별 시가총액 내림차순 순위 (0이 가장 크다, 같은 값은 열 순서)
+    """
+    dates: pd.DatetimeIndex
+    codes: list[str]
+    cap: np.ndarray
+    rank: np.ndarray
+
+
+def listing_shares(listing_df: pd.DataFrame, codes: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """종목 목록에서 codes 순서의 (상장주식수, 고정 시가총액) 배열을 만든다.
+
+    상장주식수는 Stocks 컬럼, 없으면 시가총액 / 종가로 구한다. 주식수를 알 수
+    없고 시가총액만 있는 종목은 그 값을 고정 시가총액으로 쓴다 (주식수는 NaN).
+    목록에 없는 종목은 주식수 NaN, 고정 시가총액 0.
+    """
+    code_column = "Code" if "Code" in listing_df.columns else "Symbol"
+    cap_column = next((c for c in ("Marcap", "MarketCap") if c in listing_df.columns), None)
+    frame = listing_df.drop_duplicates(code_column).set_index(code_column)
+
+    fixed = pd.Series(0.0, index=frame.index)
+    shares = pd.Series(np.nan, index=frame.index)
+    if cap_column is not None:
+        fixed = pd.to_numeric(frame[cap_column], errors="coerce").fillna(0.0).astype(np.float64)
+    if "Stocks" in frame.columns:
+        shares = pd.to_numeric(frame["Stocks"], errors="coerce").astype(np.float64)
+    elif cap_column is not None and "Close" in frame.columns:
+        close = pd.to_numeric(frame["Close"], errors="coerce")
+        shares = (fixed / close.where(close > 0)).astype(np.float64)
+
+    return (
+        shares.reindex(codes).to_numpy(dtype=np.float64),
+        fixed.reindex(codes, fill_value=0.0).to_numpy(dtype=np.float64),
+    )
+
+
+def build_market_cap_panel(
+    close: np.ndarray,
+    dates: pd.DatetimeIndex,
+    codes: list[str],
+    listings: list[tuple[str, pd.DataFrame]],
+) -> MarketCapPanel:
+    """종가 배열과 종목 목록 스냅샷들로 시점별 시가총액 패널을 만든다.
+
+    거래일마다 그날 이전의 가장 최근 스냅샷을 쓰고, 첫 스냅샷보다 이른 거래일은
+    첫 스냅샷을 쓴다.
+
+    Args:
+        close: (거래일 수, 종목 수) 종가 (MarketPanel.close)
+        dates: 거래일 달력
+        codes: 열 순서의 종목코드
+        listings: [(기준일 "YYYY-MM-DD", 종목 목록 DataFrame), ...] 한 개 이상
+    """
+    listings = sorted(listings, key=lambda item: pd.Timestamp(item[0]))
+    snapshot_dates = pd.DatetimeIndex([pd.Timestamp(as_of) for as_of, _ in listings])
+    snapshot_of_day = np.maximum(snapshot_dates.searchsorted(dates, side="right") - 1, 0)
+
+    cap = np.empty(close.shape, dtype=np.float64)
+    for s, (_, listing_df) in enumerate(listings):
+        rows = np.flatnonzero(snapshot_of_day == s)
+        if len(rows) == 0:
+            continue
+        shares, fixed = listing_shares(listing_df, codes)
+        known = ~np.isnan(shares)
+        cap[rows] = fixed
+        cap[np.ix_(rows, np.flatnonzero(known))] = close[rows][:, known] * shares[known]
+
+    order = np.argsort(-cap, axis=1, kind="stable")
+    rank = np.empty(cap.shape, dtype=np.int32)
+    np.put_along_axis(rank, order, np.arange(cap.shape[1], dtype=np.int32)[None, :], axis=1)
+    return MarketCapPanel(dates=dates, codes=list(codes), cap=cap, rank=rank)
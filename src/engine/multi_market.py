@@ -0,0 +1,178 @@
+"""다중 시장 백테스트 모듈 - 시장별 슬리브를 프로세스 풀에서 동시에 실행한다.
+
+초기 자본을 슬리브(시장, 배분 비율, 통화, 가격 데이터, 종목 목록)별로 나누고,
+기준 통화가 아닌 슬리브는 시작일 환율로 환전해 각자 독립적으로 시뮬레이션한다.
+시장끼리는 합산 전까지 서로 영향을 주지 않으므로 워커 프로세스에서 동시에
+실행하며, 가격은 sweep과 같이 PricePanel(.npy)로 저장해 워커가 메모리 매핑으로 연다.
+합산 시 통화별 환율 시계열로 각 슬리브를 기준 통화로 환산하고, 어느 슬리브에도
+배분하지 않은 자본은 기준 통화 현금으로 더한다.
+"""
+
+import dataclasses
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from src.data.panel import PricePanel, open_panel, save_panel
+from src.engine.backtest import (
+    BacktestParams,
+    BacktestResult,
+    _combine_snapshots,
+    _compute_metrics_from_snapshots,
+    _lookup_rate_by_date,
+    run_backtest,
+)
+from src.engine.equity import EquityCurve
+from src.engine.pipeline import PackedMarket
+from src.engine.sweep import _as_panel
+from src.engine.trade_log import TradeLog
+
+
+@dataclass
+class MarketSleeve:
+    """다중 시장 백테스트의 시장 하나.
+
+    Attributes:
+        market: 시장 이름 (거래 기록의 market 태그, 예: "KOSPI", "NYSE")
+        ratio: 초기 자본 중 이 시장에 배분할 비율 (%)
+        currency: 가격 통화 (예: "KRW", "USD")
+        price_data: 가격 데이터 (run_backtest와 같음)
+        listing_df: 종목 목록 (시가총액 정렬용)
+        index_df: 시장 지수 (결과 표시용)
+        listing_history: 종목 목록 이력 (run_backtest 참고)
+    """
+    market: str
+    ratio: float
+    currency: str
+    price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket
+    listing_df: pd.DataFrame | None = None
+    index_df: pd.DataFrame | None = None
+    listing_history: list[tuple[str, pd.DataFrame]] | None = None
+
+
+def _sleeve_params(params: BacktestParams, sleeve: MarketSleeve, start_rate: float) -> BacktestParams:
+    """슬리브 몫의 자본과 매수 한도를 시작일 환율로 슬리브 통화에 맞춘 파라미터."""
+    def local(amount: float) -> float:
+        return amount / start_rate if start_rate > 0 else 0.0
+
+    return dataclasses.replace(
+        params,
+        initial_cash=local(params.initial_cash * sleeve.ratio / 100.0),
+        max_buy_amount=local(params.max_buy_amount),
+        min_balance=local(params.min_balance),
+        kospi_ratio=100,
+    )
+
+
+def _run_sleeve(task: tuple) -> BacktestResult:
+    """워커에서 슬리브 하나를 실행한다. 가격은 저장된 패널을 메모리 매핑으로 연다."""
+    params, panel_path, listing_df, listing_history = task
+    return run_backtest(params, open_panel(panel_path), listing_df, listing_history=listing_history)
+
+
+def run_multi_market_backtest(
+    params: BacktestParams,
+    sleeves: list[MarketSleeve],
+    exchange_rates: dict[str, pd.DataFrame] | None = None,
+    base_currency: str = "KRW",
+    max_workers: int | None = None,
+    work_dir: str | Path | None = None,
+    progress_callback=None,
+) -> BacktestResult:
+    """여러 시장 슬리브를 동시에 실행하고 기준 통화로 합산한다.
+
+    params.kospi_ratio는 쓰지 않고 슬리브의 ratio로 자본을 나눈다. ratio 합계가
+    100보다 작으면 나머지는 기준 통화 현금으로 그대로 남아 합산 스냅샷의 현금에
+    들어간다. 결과의 daily_snapshots는 기준 통화 합산 스냅샷, market_snapshots는
+    시장별 현지 통화 스냅샷이며, 수수료 합계는 시작일 환율로 환산한다. 시장 이름이
+    "KOSPI", "NASDAQ"인 슬리브의 지수는 kospi_index, nasdaq_index에도 넣는다.
+    가격 데이터는 워커 수와 관계없이 run_sweep과 같이 PricePanel로 바꿔 종가만
+    사용한다 (PackedMarket의 시그널은 쓰지 않는다).
+
+    Args:
+        params: 백테스트 파라미터 (initial_cash, 매수 한도는 기준 통화)
+        sleeves: 시장 슬리브 목록 (ratio 합계는 100 이하, 나머지는 현금)
+        exchange_rates: {통화: 환율 DataFrame ("Close" = 통화 1단위의 기준 통화 가격)}
+        base_currency: 기준 통화. 이 통화의 슬리브는 환전하지 않는다.
+        max_workers: 워커 프로세스 수 (기본값 CPU 수). 1이면 현재 프로세스에서 차례로 실행한다.
+        work_dir: 공유 패널을 저장할 디렉터리 (기본값 임시 디렉터리, 끝나면 삭제)
+        progress_callback: (완료한 슬리브 수, 전체 슬리브 수) 콜백
+
+    Raises:
+        ValueError: 슬리브가 없거나, 시장 이름이 겹치거나, 비율 합계가 100을 넘거나,
+            환율이 없는 통화가 있을 때
+    """
+    exchange_rates = exchange_rates or {}
+    if not sleeves:
+        raise ValueError("At least one market sleeve is required")
+    markets = [sleeve.market for sleeve in sleeves]
+    if len(set(markets)) != len(markets):
+        raise ValueError(f"Duplicate market sleeves: {', '.join(markets)}")
+    total_ratio = sum(sleeve.ratio for sleeve in sleeves)
+    if total_ratio > 100:
+        raise ValueError("Sleeve ratios add up to more than 100")
+    missing = sorted({s.currency for s in sleeves if s.currency != base_currency} - set(exchange_rates))
+    if missing:
+        raise ValueError(f"Missing exchange rates for: {', '.join(missing)}")
+
+    fx = [exchange_rates.get(s.currency) if s.currency != base_currency else None for s in sleeves]
+    start = pd.Timestamp(params.start_date)
+    start_rates = [_lookup_rate_by_date(df, start) if df is not None else 1.0 for df in fx]
+    sleeve_params = [_sleeve_params(params, s, rate) for s, rate in zip(sleeves, start_rates)]
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(sleeves))
+    results: list[BacktestResult | None] = [None] * len(sleeves)
+    if max_workers == 1:
+        for i, (sleeve, p) in enumerate(zip(sleeves, sleeve_params)):
+            # 워커와 같은 입력이 되도록 패널을 거친다 (float64 종가, 시그널은 다시 계산)
+            results[i] = run_backtest(p, _as_panel(sleeve.price_data).to_price_data(), sleeve.listing_df,
+                                      listing_history=sleeve.listing_history)
+            if progress_callback:
+                progress_callback(i + 1, len(sleeves))
+    else:
+        with tempfile.TemporaryDirectory(prefix="markets-", dir=work_dir) as tmp:
+            tasks = []
+            for i, (sleeve, p) in enumerate(zip(sleeves, sleeve_params)):
+                panel_path = str(Path(tmp) / f"sleeve-{i}")
+                save_panel(_as_panel(sleeve.price_data), panel_path)
+                tasks.append((p, panel_path, sleeve.listing_df, sleeve.listing_history))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(_run_sleeve, task): i for i, task in enumerate(tasks)}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    if progress_callback:
+                        progress_callback(done, len(sleeves))
+
+    for sleeve, result in zip(sleeves, results):
+        result.trades.set_market(sleeve.market)
+    all_trades = TradeLog.concat([result.trades for result in results]).sorted_by_date()
+    combined_snapshots = _combine_snapshots([result.daily_snapshots for result in results], fx)
+    reserve = params.initial_cash * (100 - total_ratio) / 100.0
+    if reserve > 0:
+        # 슬리브에 배분하지 않은 자본은 기준 통화 현금으로 남아 있다
+        cash = combined_snapshots.cash + reserve
+        stock = combined_snapshots.stock_value
+        combined_snapshots = EquityCurve.from_arrays(combined_snapshots.dates, cash, stock, cash + stock)
+
+    metrics = _compute_metrics_from_snapshots(combined_snapshots, all_trades, params.initial_cash)
+    # 수수료는 기준 통화로 합산 (슬리브 수수료 * 시작일 환율)
+    metrics["total_fee"] = round(sum(
+        result.trades.total_fee() * rate for result, rate in zip(results, start_rates)
+    ), 0)
+
+    index_by_market = {sleeve.market: sleeve.index_df for sleeve in sleeves}
+    return BacktestResult(
+        daily_snapshots=combined_snapshots,
+        trades=all_trades,
+        kospi_index=index_by_market.get("KOSPI"),
+        nasdaq_index=index_by_market.get("NASDAQ"),
+        exchange_rate_df=exchange_rates.get("USD"),
+        initial_exchange_rate=start_rates[markets.index("NASDAQ")] if "NASDAQ" in markets else 0.0,
+        market_snapshots={sleeve.market: result.daily_snapshots for sleeve, result in zip(sleeves, results)},
+        total_trades=len(all_trades),
+        **metrics,
+    )
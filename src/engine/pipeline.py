@@ -0,0 +1,115 @@
+"""수집 → 시그널 계산 스트리밍 파이프라인 모듈.
+
+fetch_all_prices로 모든 종목을 받은 뒤 시그널을 계산하면 원본 DataFrame 전체와
+시그널 Series가 동시에 메모리에 올라간다. stream_market은 종목 하나가 캐시나
+네트워크에서 도착하는 즉시 종가만 복사해 시그널을 계산하고 원본은 버린다.
+수집은 워커 스레드에서, 계산은 호출 스레드에서 진행되므로 둘이 겹친다.
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from src.data.fetcher import DEFAULT_MAX_WORKERS, FetchStats, iter_prices
+from src.engine.signals import compute_signals
+
+
+@dataclass
+class PackedMarket:
+    """시그널까지 계산된 시장 데이터 - run_backtest에 그대로 넘길 수 있다.
+
+    Attributes:
+        n_rise, m_fall, y_pct: 시그널 계산에 쓴 파라미터
+        price_data: {종목코드: 종가만 담은 DataFrame}
+        signals: {종목코드: {"buy", "sell_fall", "sell_emergency": bool Series}}
+        with_signals: False이면 종가만 패킹하고 시그널은 run_backtest(시그널 캐시)에 맡긴다
+    """
+    n_rise: int
+    m_fall: int
+    y_pct: float
+    price_data: dict[str, pd.DataFrame] = field(default_factory=dict)
+    signals: dict[str, dict[str, pd.Series]] = field(default_factory=dict)
+    with_signals: bool = True
+
+    def matches(self, n_rise: int, m_fall: int, y_pct: float) -> bool:
+        """같은 시그널 파라미터로 계산되었으면 True."""
+        return self.with_signals and (self.n_rise, self.m_fall, self.y_pct) == (n_rise, m_fall, y_pct)
+
+    def add(self, code: str, df: pd.DataFrame) -> bool:
+        """종목 하나를 패킹해 추가한다. 종가가 없으면 False.
+
+        종가는 원본과 메모리를 공유하지 않도록 복사하므로, 호출한 쪽이 df를
+        버리면 원본의 다른 컬럼도 함께 해제된다.
+        """
+        if df is None or df.empty or "Close" not in df.columns:
+            return False
+        close = pd.DataFrame(
+            {"Close": df["Close"].to_numpy(dtype=np.float64, copy=True)},
+            index=df.index, copy=False,
+        )
+        self.price_data[code] = close
+        if self.with_signals:
+            self.signals[code] = compute_signals(close["Close"], self.n_rise, self.m_fall, self.y_pct)
+        return True
+
+    def reorder(self, codes: list[str]) -> None:
+        """종목 순서를 codes 순서로 맞춘다 (fetch_all_prices 결과와 같은 순서)."""
+        self.price_data = {code: self.price_data[code] for code in codes if code in self.price_data}
+        self.signals = {code: self.signals[code] for code in codes if code in self.signals}
+
+    @property
+    def nbytes(self) -> int:
+        """패킹된 종가와 시그널이 차지하는 메모리 (인덱스 포함, bytes)."""
+        total = 0
+        for code, close in self.price_data.items():
+            total += int(close.memory_usage(index=True).sum())
+            total += sum(sig.to_numpy().nbytes for sig in self.signals.get(code, {}).values())
+        return total
+
+
+def stream_market(
+    codes: list[str],
+    start: str,
+    end: str,
+    n_rise: int,
+    m_fall: int,
+    y_pct: float,
+    progress_callback=None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    rate_limit: float | None = None,
+    stats: FetchStats | None = None,
+    with_signals: bool = True,
+) -> PackedMarket:
+    """종목 가격을 수집하면서 곧바로 시그널을 계산해 PackedMarket으로 모은다.
+
+    Args:
+        codes: 종목코드 리스트
+        start: 시작일
+        end: 종료일
+        n_rise: 매수 시그널 연속 상승 일수
+        m_fall: 매도 시그널 연속 하락 일수
+        y_pct: 긴급 매도 급락 비율 (%)
+        progress_callback: (current, total) 콜백
+        max_workers: 동시 수집 워커 수
+        rate_limit: 초당 최대 요청 수 (None이면 무제한)
+        stats: 주어지면 수집 요약을 기록한다
+        with_signals: False이면 종가만 모은다. 파라미터만 바꿔 반복 실행할 때는
+            run_backtest가 시그널 캐시(src.engine.signal_cache)에서 시그널을 찾는다.
+
+    Returns:
+        PackedMarket. 종목 순서는 codes 순서를 따른다.
+    """
+    packed = PackedMarket(n_rise=n_rise, m_fall=m_fall, y_pct=y_pct, with_signals=with_signals)
+    for code, df in iter_prices(
+        codes, start, end,
+        progress_callback=progress_callback,
+        max_workers=max_workers,
+        rate_limit=rate_limit,
+        columns=["Close"],
+        stats=stats,
+    ):
+        packed.add(code, df)
+        del df
+    packed.reorder(list(dict.fromkeys(codes)))
+    return packed
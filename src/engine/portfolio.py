@@ -3,23 +3,11 @@
 from dataclasses import dataclass, field
 from math import floor
 
-
-@dataclass
-class Trade:
-    """개별 거래 기록."""
-    date: str
-    code: str
-    name: str
-    side: str  # "BUY" or "SELL"
-    price: float
-    quantity: int
-    amount: float
-    fee: float
-    profit: float = 0.0  # 매도 시 실현 손익
-    market: str = "KOSPI"  # "KOSPI" or "NASDAQ"
+from src.engine.equity import DailySnapshot, EquityCurve
+from src.engine.trade_log import Trade, TradeLog
 
 
-@dataclass
+@dataclass(slots=True)
 class Holding:
     """보유 종목 정보."""
     code: str
@@ -28,23 +16,25 @@ class Holding:
     avg_price: float  # 평균 매입 단가
 
 
-@dataclass
-class DailySnapshot:
-    """일별 자산 현황."""
-    date: str
-    cash: float
-    stock_value: float
-    total_value: float
-
-
 @dataclass
 class Portfolio:
-    """포트폴리오 전체 상태."""
+    """포트폴리오 전체 상태.
+
+    market_values는 보유 종목별 마지막 평가액 (수량 × 평가 단가)이며 holdings와 같은
+    순서다. stock_value는 그 합계로, 전부 다시 더하지 않고 매수/매도/mark 때마다
+    바뀐 종목의 차이(새 평가액 - 이전 평가액)만 더해 유지한다. 값이 바뀐 종목만
+    mark로 다시 평가한 뒤 record_snapshot으로 그날을 기록할 수 있다. 같은 값으로
+    mark하면 차이가 0이라 합계는 그대로다. 평가액이 NaN이던 종목이 바뀌거나 빠지면
+    합계를 보유 순서대로 다시 더하고, 보유 종목이 없어지면 0으로 되돌린다.
+    holdings를 직접 고친 뒤에는 mark_all로 다시 맞춘다.
+    """
     cash: float
     fee_rate: float  # 수수료율 (예: 0.015는 0.015%)
     holdings: dict[str, Holding] = field(default_factory=dict)
-    trades: list[Trade] = field(default_factory=list)
-    daily_snapshots: list[DailySnapshot] = field(default_factory=list)
+    trades: TradeLog = field(default_factory=TradeLog)
+    daily_snapshots: EquityCurve = field(default_factory=EquityCurve)
+    market_values: dict[str, float] = field(default_factory=dict, repr=False, compare=False)
+    stock_value: float = field(default=0.0, repr=False, compare=False)
 
     def buy(self, date: str, code: str, name: str, price: float,
             max_amount: float, min_balance: float) -> bool:
@@ -99,11 +89,9 @@ class Portfolio:
             self.holdings[code] = Holding(
                 code=code, name=name, quantity=quantity, avg_price=price
             )
+        self._set_value(code, self.holdings[code].quantity * price)
 
-        self.trades.append(Trade(
-            date=date, code=code, name=name, side="BUY",
-            price=price, quantity=quantity, amount=amount, fee=fee,
-        ))
+        self.trades.record(date, code, name, "BUY", price, quantity, amount, fee)
         return True
 
     def sell_all(self, date: str, code: str, name: str, price: float) -> bool:
@@ -125,30 +113,51 @@ class Portfolio:
 
         self.cash += net_amount
         del self.holdings[code]
+        old = self.market_values.pop(code, 0.0)
+        if not self.holdings:
+            self.stock_value = 0.0
+        elif old != old:  # NaN
+            self.stock_value = sum(self.market_values.values(), 0.0)
+        else:
+            self.stock_value -= old
 
-        self.trades.append(Trade(
-            date=date, code=code, name=name, side="SELL",
-            price=price, quantity=quantity, amount=amount, fee=fee,
-            profit=profit,
-        ))
+        self.trades.record(date, code, name, "SELL", price, quantity, amount, fee, profit)
         return True
 
+    def _set_value(self, code: str, value: float) -> None:
+        """종목 평가액을 바꾸고 합계에 차이만 반영한다."""
+        old = self.market_values.get(code, 0.0)
+        self.market_values[code] = value
+        if old != old:  # NaN은 차이로 뺄 수 없으므로 다시 더한다
+            self.stock_value = sum(self.market_values.values(), 0.0)
+        else:
+            self.stock_value += value - old
+
+    def mark(self, code: str, price: float | None) -> None:
+        """보유 종목 하나를 price로 다시 평가한다 (None이면 평균 매입 단가)."""
+        h = self.holdings[code]
+        self._set_value(code, h.quantity * (h.avg_price if price is None else price))
+
+    def mark_all(self, prices: dict[str, float]) -> None:
+        """모든 보유 종목을 보유 순서대로 다시 평가하고 합계를 새로 더한다 (가격이 없으면 평균 매입 단가)."""
+        self.market_values = {
+            code: h.quantity * prices.get(code, h.avg_price)
+            for code, h in self.holdings.items()
+        }
+        self.stock_value = sum(self.market_values.values(), 0.0)
+
+    def record_snapshot(self, date: str) -> None:
+        """stock_value 합계로 일별 자산 현황을 기록한다."""
+        self.daily_snapshots.record(date, self.cash, self.stock_value, self.cash + self.stock_value)
+
     def snapshot(self, date: str, prices: dict[str, float]) -> DailySnapshot:
-        """일별 자산 현황을 기록하고 반환한다.
+        """모든 보유 종목을 보유 순서대로 mark해 일별 자산 현황을 기록하고 반환한다.
 
         Args:
             date: 기준일
             prices: {종목코드: 종가} 딕셔너리
         """
-        stock_value = sum(
-            h.quantity * prices.get(h.code, h.avg_price)
-            for h in self.holdings.values()
-        )
-        snap = DailySnapshot(
-            date=date,
-            cash=self.cash,
-            stock_value=stock_value,
-            total_value=self.cash + stock_value,
-        )
-        self.daily_snapshots.append(snap)
-        return snap
+        for code in self.holdings:
+            self.mark(code, prices.get(code))
+        self.record_snapshot(date)
+        return self.daily_snapshots[-1]
@@ -0,0 +1,238 @@
+"""시그널 메모이제이션 모듈 - 가격 데이터 지문과 시그널 파라미터로 캐시한다.
+
+같은 가격 데이터와 같은 (n_rise_days, m_fall_days, y_emergency_pct)로 다시
+실행하면 현금 설정이나 정렬 방식만 바뀌어도 시그널은 그대로다. 시그널을 종목별
+bool 배열을 이어 붙인 SignalArrays 형태로 보관하며, 프로세스 안의 LRU 계층과
+선택적인 디스크(.npz) 계층을 둔다. 종목별 구현(pandas 엔진)과 패널 구현(panel /
+numba 엔진)은 float32 종가의 경계값 판정이 다를 수 있으므로 항목을 따로 둔다.
+
+지문을 만들려면 실행마다 전 종목 종가를 해시해야 하므로 기본값은 꺼져 있다.
+파라미터만 바꿔 반복 실행하는 곳(예: run_sweep)에서 set_signal_cache로 켠다.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 16
+DEFAULT_MAX_DISK_ENTRIES = 64
+SIGNAL_CACHE_SUBDIR = "signals"  # 디스크 계층을 켤 때 CACHE_DIR 아래 디렉터리
+
+SIGNAL_KEYS = ("buy", "sell_fall", "sell_emergency")
+
+
+@dataclass
+class SignalArrays:
+    """전 종목 시그널을 종목 순서대로 이어 붙인 bool 배열.
+
+    종목 codes[i]의 시그널은 [offsets[i], offsets[i + 1]) 구간이며, 종목 가격
+    데이터의 행 순서와 같다.
+    """
+    codes: list[str]
+    offsets: np.ndarray  # int64, 길이 len(codes) + 1
+    buy: np.ndarray
+    sell_fall: np.ndarray
+    sell_emergency: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.buy.nbytes + self.sell_fall.nbytes + self.sell_emergency.nbytes
+
+    @classmethod
+    def from_series(cls, signals: dict[str, dict[str, pd.Series]]) -> "SignalArrays":
+        """{종목코드: {키: bool Series}} 형태에서 만든다."""
+        codes = list(signals)
+        lengths = [len(signals[code]["buy"]) for code in codes]
+        offsets = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)]).astype(np.int64)
+        arrays = {
+            key: np.concatenate([signals[code][key].to_numpy(dtype=bool) for code in codes])
+            if codes else np.zeros(0, dtype=bool)
+            for key in SIGNAL_KEYS
+        }
+        return cls(codes=codes, offsets=offsets, **arrays)
+
+    def to_series(self, price_data: dict[str, pd.DataFrame]) -> dict[str, dict[str, pd.Series]]:
+        """종목별 가격 인덱스를 붙여 {종목코드: {키: bool Series}}로 되돌린다."""
+        result = {}
+        for i, code in enumerate(self.codes):
+            index = price_data[code].index
+            a, b = self.offsets[i], self.offsets[i + 1]
+            result[code] = {
+                key: pd.Series(getattr(self, key)[a:b], index=index, copy=False)
+                for key in SIGNAL_KEYS
+            }
+        return result
+
+    @classmethod
+    def from_panel(cls, codes: list[str], valid: np.ndarray, panel: dict[str, np.ndarray]) -> "SignalArrays":
+        """(거래일 수, 종목 수) 시그널 배열에서 데이터 행(valid)만 종목 순서대로 모은다."""
+        counts = valid.sum(axis=0)
+        offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)]).astype(np.int64)
+        mask = valid.T
+        return cls(codes=list(codes), offsets=offsets,
+                   **{key: panel[key].T[mask] for key in SIGNAL_KEYS})
+
+    def to_panel(self, valid: np.ndarray) -> dict[str, np.ndarray]:
+        """from_panel의 역변환 - valid 칸에 시그널을 채운 (거래일 수, 종목 수) 배열."""
+        mask = valid.T
+        result = {}
+        for key in SIGNAL_KEYS:
+            dense = np.zeros(mask.shape, dtype=bool)
+            dense[mask] = getattr(self, key)
+            result[key] = dense.T
+        return result
+
+
+def fingerprint_prices(price_data: dict[str, pd.DataFrame]) -> str:
+    """종가가 있는 종목들의 코드/순서/날짜/종가로 가격 데이터 지문을 만든다."""
+    digest = hashlib.blake2b(digest_size=16)
+    for code, df in price_data.items():
+        if "Close" not in df.columns or df.empty:
+            continue
+        close = df["Close"].to_numpy()
+        digest.update(code.encode())
+        digest.update(str(close.dtype).encode())
+        digest.update(np.ascontiguousarray(df.index.asi8).tobytes())
+        digest.update(np.ascontiguousarray(close).tobytes())
+    return digest.hexdigest()
+
+
+@dataclass
+class SignalCacheStats:
+    """시그널 캐시 조회 통계."""
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+
+
+class SignalCache:
+    """시그널 캐시 - 메모리 LRU + 선택적 디스크 계층. 스레드 안전하다.
+
+    Args:
+        max_entries: 메모리에 둘 최대 항목 수
+        disk_dir: 주어지면 항목을 .npz로 저장하고 메모리에 없을 때 읽는다
+        max_disk_entries: 디스크에 둘 최대 항목 수 (오래된 파일부터 지운다)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk_dir: str | Path | None = None,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+    ):
+        self.max_entries = max_entries
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+        self.max_disk_entries = max_disk_entries
+        self.stats = SignalCacheStats()
+        self._entries: OrderedDict[str, SignalArrays] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(price_data: dict[str, pd.DataFrame], n_rise: int, m_fall: int, y_pct: float, method: str) -> str:
+        """가격 데이터 지문, 시그널 파라미터, 계산 방식("series" / "panel")으로 캐시 키를 만든다."""
+        return f"{fingerprint_prices(price_data)}-n{n_rise}-m{m_fall}-y{float(y_pct)!r}-{method}"
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.npz"
+
+    def get(self, key: str) -> SignalArrays | None:
+        """캐시된 시그널을 반환한다. 없으면 None."""
+        with self._lock:
+            arrays = self._entries.get(key)
+            if arrays is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return arrays
+        arrays = self._read_disk(key)
+        with self._lock:
+            if arrays is None:
+                self.stats.misses += 1
+                return None
+            self.stats.disk_hits += 1
+            self._remember(key, arrays)
+        return arrays
+
+    def put(self, key: str, arrays: SignalArrays) -> None:
+        """시그널을 저장한다 (디스크 계층이 있으면 파일로도 저장)."""
+        with self._lock:
+            self._remember(key, arrays)
+        self._write_disk(key, arrays)
+
+    def clear(self) -> None:
+        """메모리 계층과 통계를 비운다 (디스크 파일은 그대로 둔다)."""
+        with self._lock:
+            self._entries.clear()
+            self.stats = SignalCacheStats()
+
+    def _remember(self, key: str, arrays: SignalArrays) -> None:
+        self._entries[key] = arrays
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> SignalArrays | None:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return SignalArrays(
+                    codes=data["codes"].tolist(),
+                    offsets=data["offsets"],
+                    **{k: data[k] for k in SIGNAL_KEYS},
+                )
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable signal cache file %s: %s", path, e)
+            return None
+
+    def _write_disk(self, key: str, arrays: SignalArrays) -> None:
+        if self.disk_dir is None:
+            return
+        try:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            path = self._disk_path(key)
+            tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp.npz")
+            np.savez(tmp_path, codes=np.array(arrays.codes, dtype=str), offsets=arrays.offsets,
+                     **{k: getattr(arrays, k) for k in SIGNAL_KEYS})
+            os.replace(tmp_path, path)
+            # 다른 프로세스가 쓰는 중인 임시 파일은 건드리지 않는다
+            files = [p for p in self.disk_dir.glob("*.npz") if not p.name.endswith(".tmp.npz")]
+            files.sort(key=lambda p: p.stat().st_mtime)
+            for old in files[:max(0, len(files) - self.max_disk_entries)]:
+                old.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning("Failed to write signal cache file for %s: %s", key, e)
+
+
+_signal_cache: SignalCache | None = None
+
+
+def get_signal_cache() -> SignalCache | None:
+    """run_backtest가 사용하는 시그널 캐시를 반환한다. None(기본값)이면 캐시하지 않는다."""
+    return _signal_cache
+
+
+def set_signal_cache(signal_cache: SignalCache | None) -> SignalCache | None:
+    """시그널 캐시를 교체하고 이전 캐시를 반환한다."""
+    global _signal_cache
+    previous, _signal_cache = _signal_cache, signal_cache
+    return previous
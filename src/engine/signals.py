@@ -1,5 +1,12 @@
-"""매수/매도 시그널 감지 모듈 - 순수 함수 기반."""
+"""매수/매도 시그널 감지 모듈 - 순수 함수 기반.
 
+detect_* 함수는 종목 하나의 Series를 받는 기준 구현이고, streak_lengths /
+panel_signals는 (거래일 수, 종목 수) 배열 전체를 한 번에 처리하는 패널 구현이다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
 
 
@@ -40,6 +47,129 @@ def detect_emergency_sell(close_series: pd.Series, y_pct: float) -> pd.Series:
 
     Returns:
         bool Series - True인 날짜에 긴급 매도 시그널 발생
+
+    변화율은 바로 앞 행과 비교한다. 종가가 NaN인 행과 그다음 행은 NaN이 되어
+    시그널이 나지 않는다 (diff를 쓰는 연속 상승/하락과 같은 규칙). pandas 2.x의
+    pct_change 기본값은 NaN을 앞 값으로 채우므로 fill_method=None을 명시한다.
     """
-    pct_change = close_series.pct_change() * 100
+    pct_change = close_series.pct_change(fill_method=None) * 100
     return pct_change <= -y_pct
+
+
+def compute_signals(close_series: pd.Series, n: int, m: int, y_pct: float) -> dict[str, pd.Series]:
+    """종목 하나의 매수/매도 시그널을 한 번에 계산한다.
+
+    Returns:
+        {"buy": 연속 상승, "sell_fall": 연속 하락, "sell_emergency": 급락} bool Series
+    """
+    return {
+        "buy": detect_consecutive_rises(close_series, n),
+        "sell_fall": detect_consecutive_falls(close_series, m),
+        "sell_emergency": detect_emergency_sell(close_series, y_pct),
+    }
+
+
+@dataclass
+class StreakState:
+    """패널 스트릭 계산을 이어가기 위한 종목별 상태 (길이 N 배열).
+
+    Attributes:
+        prev_close: 종목별 마지막 데이터 행의 종가 (행이 없었으면 NaN)
+        has_prev: 종목별로 이전 데이터 행이 있었는지 여부
+        up: 현재 연속 상승 길이
+        down: 현재 연속 하락 길이
+    """
+    prev_close: np.ndarray
+    has_prev: np.ndarray
+    up: np.ndarray
+    down: np.ndarray
+
+    @classmethod
+    def empty(cls, n_codes: int) -> "StreakState":
+        return cls(
+            prev_close=np.full(n_codes, np.nan),
+            has_prev=np.zeros(n_codes, dtype=bool),
+            up=np.zeros(n_codes, dtype=np.int32),
+            down=np.zeros(n_codes, dtype=np.int32),
+        )
+
+
+def _panel_pass(
+    close: np.ndarray, valid: np.ndarray | None, state: StreakState | None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, StreakState]:
+    """연속 상승/하락 길이와 직전 행 대비 변화율(%)을 한 번의 행 순회로 계산한다."""
+    close = np.asarray(close, dtype=np.float64)
+    n_days, n_codes = close.shape
+    if valid is None:
+        valid = np.ones(close.shape, dtype=bool)
+    state = state if state is not None else StreakState.empty(n_codes)
+
+    up_out = np.zeros(close.shape, dtype=np.int32)
+    down_out = np.zeros(close.shape, dtype=np.int32)
+    pct_out = np.full(close.shape, np.nan)
+    prev, has_prev, up, down = state.prev_close, state.has_prev, state.up, state.down
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for t in range(n_days):
+            row, present = close[t], valid[t]
+            rose = present & has_prev & (row > prev)
+            fell = present & has_prev & (row < prev)
+            up = np.where(present, np.where(rose, up + 1, 0), up)
+            down = np.where(present, np.where(fell, down + 1, 0), down)
+            up_out[t] = np.where(present, up, 0)
+            down_out[t] = np.where(present, down, 0)
+            pct_out[t] = np.where(present & has_prev, (row / prev - 1) * 100, np.nan)
+            prev = np.where(present, row, prev)
+            has_prev = has_prev | present
+
+    state.prev_close, state.has_prev, state.up, state.down = prev, has_prev, up, down
+    return up_out, down_out, pct_out, state
+
+
+def streak_lengths(
+    close: np.ndarray, valid: np.ndarray | None = None, state: StreakState | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """(거래일 수, 종목 수) 종가 배열의 종목별 연속 상승/하락 길이를 계산한다.
+
+    각 종목은 자기 데이터 행(valid)만 이어서 비교하므로 거래정지 등으로 빠진
+    날은 건너뛴다. 빠진 날의 결과는 0이다. 종가가 NaN인 행은 상승/하락 어느
+    쪽도 아니므로 두 스트릭을 모두 끊고, 다음 행의 비교 대상도 NaN이 된다
+    (detect_* 기준 구현의 diff, pct_change(fill_method=None)와 같다).
+
+    Args:
+        close: 종가 배열
+        valid: 데이터 행이 있는 칸 (None이면 전부)
+        state: 이전 구간의 상태. 주어지면 이어서 계산하고 끝 상태로 갱신한다.
+
+    Returns:
+        (연속 상승 길이, 연속 하락 길이) int32 배열
+    """
+    up, down, _, _ = _panel_pass(close, valid, state)
+    return up, down
+
+
+def panel_signals(
+    close: np.ndarray,
+    n: int,
+    m: int,
+    y_pct: float,
+    valid: np.ndarray | None = None,
+    state: StreakState | None = None,
+) -> dict[str, np.ndarray]:
+    """compute_signals의 패널 버전 - 모든 종목의 시그널을 한 번에 계산한다.
+
+    스트릭 길이를 한 번 구한 뒤 임계값 비교만 하므로 O(거래일 수 × 종목 수)다.
+    float64로 계산하므로 float32 종가에 대해서는 급락 판정 경계값이 종목별
+    구현과 다를 수 있다.
+
+    Returns:
+        {"buy", "sell_fall", "sell_emergency": bool 배열}
+    """
+    up, down, pct, _ = _panel_pass(close, valid, state)
+    with np.errstate(invalid="ignore"):
+        emergency = pct <= -y_pct
+    return {
+        "buy": up >= n,
+        "sell_fall": down >= m,
+        "sell_emergency": emergency,
+    }
@@ -0,0 +1,201 @@
+"""파라미터 스윕 모듈 - 여러 설정의 백테스트를 프로세스 풀에서 실행한다.
+
+가격 데이터는 한 번만 PricePanel(.npy)로 저장하고, 워커 프로세스는 시작할 때
+메모리 매핑으로 연다. 작업마다 전달되는 것은 BacktestParams 하나뿐이므로 가격
+데이터를 작업마다 피클링하지 않으며, 워커들은 OS 페이지 캐시를 공유한다.
+시그널 파라미터가 같은 설정은 같은 워커 묶음으로 보내 워커의 시그널 캐시를
+재사용한다. 시그널 캐시는 기본값이 꺼져 있으므로 스윕 동안에는 켜 둔다.
+"""
+
+import dataclasses
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from src.data.panel import PricePanel, build_panel, open_panel, save_panel
+from src.engine.backtest import BacktestParams, run_backtest, run_dual_market_backtest
+from src.engine.pipeline import PackedMarket
+from src.engine.signal_cache import SignalCache, get_signal_cache, set_signal_cache
+
+SWEEP_METRICS = ("final_return_pct", "mdd_pct", "win_rate_pct", "total_trades", "total_fee", "stopped_on")
+TASKS_PER_WORKER = 4  # 워커당 작업 묶음 수 (부하 균형과 시그널 캐시 재사용 사이의 절충)
+
+_PARAM_FIELDS = frozenset(f.name for f in dataclasses.fields(BacktestParams))
+
+
+def expand_grid(base: BacktestParams, grid: dict[str, list]) -> list[BacktestParams]:
+    """base의 일부 필드를 grid 값들의 모든 조합으로 바꾼 설정 목록을 만든다.
+
+    Args:
+        base: 기준 파라미터
+        grid: {BacktestParams 필드명: 값 리스트}
+
+    Raises:
+        ValueError: BacktestParams에 없는 필드명이 있을 때
+    """
+    unknown = sorted(set(grid) - _PARAM_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown BacktestParams fields: {', '.join(unknown)}")
+    keys = list(grid)
+    return [
+        dataclasses.replace(base, **dict(zip(keys, values)))
+        for values in itertools.product(*(grid[key] for key in keys))
+    ]
+
+
+def _as_panel(price_data) -> PricePanel:
+    if isinstance(price_data, PricePanel):
+        return price_data
+    if isinstance(price_data, PackedMarket):
+        price_data = price_data.price_data
+    return build_panel(price_data)
+
+
+class _SweepInputs:
+    """워커 하나가 보관하는 시장 데이터. 가격은 메모리 매핑 패널의 뷰다."""
+
+    def __init__(self, kospi_prices, nasdaq_prices, frames: dict):
+        self.kospi_prices = kospi_prices
+        self.nasdaq_prices = nasdaq_prices
+        self.frames = frames
+
+    @classmethod
+    def open(cls, kospi_path: str, nasdaq_path: str | None, frames: dict) -> "_SweepInputs":
+        kospi = open_panel(kospi_path).to_price_data()
+        nasdaq = open_panel(nasdaq_path).to_price_data() if nasdaq_path is not None else None
+        return cls(kospi, nasdaq, frames)
+
+    def run(self, params: BacktestParams):
+        f = self.frames
+        if params.kospi_ratio == 100:
+            return run_backtest(params, self.kospi_prices, f["kospi_listing_df"], f["kospi_df"],
+                                stop_rules=f.get("stop_rules"))
+        return run_dual_market_backtest(
+            params, self.kospi_prices, self.nasdaq_prices,
+            f["kospi_listing_df"], f["nasdaq_listing_df"],
+            f["kospi_df"], f["nasdaq_df"], f["exchange_rate_df"],
+        )
+
+
+_worker_inputs: _SweepInputs | None = None
+
+
+def _init_worker(kospi_path: str, nasdaq_path: str | None, frames: dict) -> None:
+    global _worker_inputs
+    _worker_inputs = _SweepInputs.open(kospi_path, nasdaq_path, frames)
+    if get_signal_cache() is None:
+        set_signal_cache(SignalCache())
+
+
+def _run_config(inputs: _SweepInputs, index: int, params: BacktestParams) -> tuple[int, dict]:
+    started = time.perf_counter()
+    result = inputs.run(params)
+    row = {name: getattr(result, name) for name in SWEEP_METRICS}
+    row["elapsed_s"] = time.perf_counter() - started
+    return index, row
+
+
+def _run_task(task: tuple[int, BacktestParams]) -> tuple[int, dict]:
+    return _run_config(_worker_inputs, *task)
+
+
+def run_sweep(
+    base: BacktestParams,
+    grid: dict[str, list],
+    kospi_price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket,
+    kospi_listing_df: pd.DataFrame | None = None,
+    kospi_df: pd.DataFrame | None = None,
+    nasdaq_price_data: dict[str, pd.DataFrame] | PricePanel | PackedMarket | None = None,
+    nasdaq_listing_df: pd.DataFrame | None = None,
+    nasdaq_df: pd.DataFrame | None = None,
+    exchange_rate_df: pd.DataFrame | None = None,
+    max_workers: int | None = None,
+    work_dir: str | Path | None = None,
+    progress_callback=None,
+    stop_rules: list | None = None,
+) -> pd.DataFrame:
+    """grid의 모든 조합으로 백테스트를 실행하고 설정별 지표 표를 반환한다.
+
+    kospi_ratio가 100인 설정은 run_backtest로, 그 외에는 run_dual_market_backtest로
+    실행한다 (NASDAQ 데이터와 환율이 필요하다). 가격 데이터는 PricePanel과 같이
+    종가만 사용한다.
+
+    Args:
+        base: 기준 파라미터
+        grid: {BacktestParams 필드명: 값 리스트}
+        kospi_price_data, kospi_listing_df, kospi_df: KOSPI 입력 (run_backtest와 같음)
+        nasdaq_price_data, nasdaq_listing_df, nasdaq_df, exchange_rate_df: 이중 시장 입력
+        max_workers: 워커 프로세스 수 (기본값 CPU 수). 1이면 현재 프로세스에서 실행한다.
+        work_dir: 공유 패널을 저장할 디렉터리 (기본값 임시 디렉터리, 끝나면 삭제)
+        progress_callback: (완료한 설정 수, 전체 설정 수) 콜백
+        stop_rules: 조기 종료 규칙 (run_backtest 참고). KOSPI 단일 시장 설정에만 쓸 수
+            있으며 워커로 보내야 하므로 MaxDrawdownStop처럼 피클링할 수 있어야 한다.
+
+    Raises:
+        ValueError: 이중 시장 설정에 NASDAQ 데이터나 환율이 없거나, stop_rules가
+            있는데 이중 시장 설정이 섞여 있을 때
+
+    Returns:
+        설정 순서대로 grid 필드, SWEEP_METRICS, elapsed_s 컬럼을 가진 DataFrame
+    """
+    configs = expand_grid(base, grid)
+    if any(p.kospi_ratio < 100 for p in configs) and (nasdaq_price_data is None or exchange_rate_df is None):
+        raise ValueError("Dual-market configurations need nasdaq_price_data and exchange_rate_df")
+    if stop_rules and any(p.kospi_ratio < 100 for p in configs):
+        # 시장별로 따로 멈추면 합산 결과의 의미가 없으므로 받지 않는다
+        raise ValueError("stop_rules are only supported for kospi_ratio=100 configurations")
+
+    frames = {
+        "kospi_listing_df": kospi_listing_df, "kospi_df": kospi_df,
+        "nasdaq_listing_df": nasdaq_listing_df, "nasdaq_df": nasdaq_df,
+        "exchange_rate_df": exchange_rate_df, "stop_rules": stop_rules,
+    }
+    # 시그널 파라미터가 같은 설정끼리 이어지도록 정렬한다 (map은 연속 구간을 묶어 보낸다)
+    tasks = sorted(enumerate(configs),
+                   key=lambda t: (t[1].n_rise_days, t[1].m_fall_days, t[1].y_emergency_pct, t[0]))
+    max_workers = min(max_workers or os.cpu_count() or 1, max(1, len(tasks)))
+    rows: dict[int, dict] = {}
+
+    if max_workers == 1:
+        inputs = _SweepInputs(
+            _as_panel(kospi_price_data).to_price_data(),
+            _as_panel(nasdaq_price_data).to_price_data() if nasdaq_price_data is not None else None,
+            frames,
+        )
+        previous = set_signal_cache(get_signal_cache() or SignalCache())
+        try:
+            for task in tasks:
+                index, row = _run_config(inputs, *task)
+                rows[index] = row
+                if progress_callback:
+                    progress_callback(len(rows), len(tasks))
+        finally:
+            set_signal_cache(previous)
+    else:
+        with tempfile.TemporaryDirectory(prefix="sweep-", dir=work_dir) as tmp:
+            kospi_path = str(Path(tmp) / "kospi")
+            save_panel(_as_panel(kospi_price_data), kospi_path)
+            nasdaq_path = None
+            if nasdaq_price_data is not None:
+                nasdaq_path = str(Path(tmp) / "nasdaq")
+                save_panel(_as_panel(nasdaq_price_data), nasdaq_path)
+
+            chunksize = max(1, len(tasks) // (max_workers * TASKS_PER_WORKER))
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker,
+                initargs=(kospi_path, nasdaq_path, frames),
+            ) as executor:
+                for index, row in executor.map(_run_task, tasks, chunksize=chunksize):
+                    rows[index] = row
+                    if progress_callback:
+                        progress_callback(len(rows), len(tasks))
+
+    return pd.DataFrame([
+        {**{key: getattr(configs[i], key) for key in grid}, **rows[i]}
+        for i in range(len(configs))
+    ])
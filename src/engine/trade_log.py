@@ -0,0 +1,282 @@
+"""열 단위 거래 기록 모듈.
+
+거래마다 Trade 데이터클래스와 문자열 다섯 개를 만드는 대신, 미리 잡아 두고 두 배씩
+늘리는 NumPy 구조화 배열 하나에 거래를 기록한다. 종목코드/종목명/시장은 로그별
+문자열 풀의 번호로, 날짜는 1970-01-01 기준 일수(int32)로 저장한다. 지표 계산은
+배열 열을 그대로 쓰고, 기존 호출자를 위해 순회/인덱싱은 Trade를 만들어 돌려준다.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+SIDES = ("BUY", "SELL")
+SIDE_BUY = 0
+SIDE_SELL = 1
+
+TRADE_DTYPE = np.dtype([
+    ("date", np.int32),    # 1970-01-01 기준 일수
+    ("code", np.int32),    # 문자열 풀 번호
+    ("name", np.int32),    # 문자열 풀 번호
+    ("market", np.int32),  # 문자열 풀 번호
+    ("side", np.int8),     # SIDE_BUY / SIDE_SELL
+    ("price", np.float64),
+    ("quantity", np.int64),
+    ("amount", np.float64),
+    ("fee", np.float64),
+    ("profit", np.float64),
+])
+
+_INITIAL_CAPACITY = 256
+_ITER_CHUNK = 1024  # 순회할 때 한 번에 Trade로 바꾸는 행 수
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass(frozen=True)
+class Trade:
+    """개별 거래 기록. 값 객체이므로 필드를 고칠 수 없다 (FrozenInstanceError)."""
+    date: str
+    code: str
+    name: str
+    side: str  # "BUY" or "SELL"
+    price: float
+    quantity: int
+    amount: float
+    fee: float
+    profit: float = 0.0  # 매도 시 실현 손익
+    market: str = "KOSPI"  # "KOSPI" or "NASDAQ"
+
+
+@lru_cache(maxsize=None)
+def date_to_day(date_str: str) -> int:
+    """"YYYY-MM-DD"를 1970-01-01 기준 일수로 바꾼다."""
+    return date.fromisoformat(date_str).toordinal() - _EPOCH_ORDINAL
+
+
+@lru_cache(maxsize=None)
+def day_to_date(day: int) -> str:
+    """date_to_day의 역변환."""
+    return date.fromordinal(day + _EPOCH_ORDINAL).isoformat()
+
+
+def days_of(dates: pd.DatetimeIndex) -> np.ndarray:
+    """거래일 달력을 1970-01-01 기준 일수 배열로 바꾼다."""
+    return dates.values.astype("datetime64[D]").astype(np.int32)
+
+
+class TradeLog:
+    """열 단위 거래 기록. list[Trade]처럼 len/순회/인덱싱/비교/+/sort를 쓸 수 있다.
+
+    순회와 인덱싱은 기록에서 새 Trade를 만들어 돌려준다. Trade는 고칠 수 없으므로
+    (t.market = "NASDAQ"은 FrozenInstanceError) 시장 태그는 set_market을 쓰고, 다른
+    필드를 고치려면 dataclasses.replace로 바꾼 Trade들로 from_trades 새 로그를 만든다.
+    """
+
+    __slots__ = ("_data", "_size", "strings", "_ids")
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._data = np.empty(capacity, dtype=TRADE_DTYPE)
+        self._size = 0
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    @classmethod
+    def from_trades(cls, trades) -> "TradeLog":
+        """list[Trade] (또는 TradeLog)에서 만든다."""
+        log = cls(max(_INITIAL_CAPACITY, len(trades)))
+        for trade in trades:
+            log.append(trade)
+        return log
+
+    @classmethod
+    def from_arrays(cls, data: np.ndarray, strings: list[str]) -> "TradeLog":
+        """TRADE_DTYPE 배열과 문자열 풀에서 만든다 (save/load용)."""
+        log = cls(max(_INITIAL_CAPACITY, len(data)))
+        log._data[:len(data)] = data
+        log._size = len(data)
+        log.strings = list(strings)
+        log._ids = {s: i for i, s in enumerate(log.strings)}
+        return log
+
+    # ── 기록 ──
+
+    def intern(self, value: str) -> int:
+        """문자열 풀 번호를 반환한다 (없으면 추가)."""
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._data):
+            return
+        capacity = max(needed, 2 * len(self._data), _INITIAL_CAPACITY)
+        grown = np.empty(capacity, dtype=TRADE_DTYPE)
+        grown[:self._size] = self._data[:self._size]
+        self._data = grown
+
+    def record(self, date: str, code: str, name: str, side: str, price: float, quantity: int,
+               amount: float, fee: float, profit: float = 0.0, market: str = "KOSPI") -> None:
+        """거래 하나를 기록한다 (인자는 Trade 필드와 같다)."""
+        self._reserve(1)
+        self._data[self._size] = (
+            date_to_day(date), self.intern(code), self.intern(name), self.intern(market),
+            SIDES.index(side), price, quantity, amount, fee, profit,
+        )
+        self._size += 1
+
+    def append(self, trade: Trade) -> None:
+        self.record(trade.date, trade.code, trade.name, trade.side, trade.price, trade.quantity,
+                    trade.amount, trade.fee, trade.profit, trade.market)
+
+    def extend_columns(self, **columns: np.ndarray) -> None:
+        """TRADE_DTYPE 필드명별 배열로 여러 거래를 한 번에 기록한다.
+
+        code/name/market은 이 로그의 intern 번호여야 한다. 빠진 필드는 profit이면 0,
+        market이면 "KOSPI"로 채운다.
+        """
+        n = len(columns["date"])
+        self._reserve(n)
+        block = self._data[self._size:self._size + n]
+        block["profit"] = 0.0
+        block["market"] = self.intern("KOSPI")
+        for key, values in columns.items():
+            block[key] = values
+        self._size += n
+
+    def set_market(self, market: str) -> None:
+        """모든 거래의 시장 태그를 바꾼다."""
+        self.data["market"] = self.intern(market)
+
+    # ── 열 단위 조회 ──
+
+    @property
+    def data(self) -> np.ndarray:
+        """기록된 거래의 TRADE_DTYPE 배열 (복사하지 않은 뷰)."""
+        return self._data[:self._size]
+
+    def sell_mask(self) -> np.ndarray:
+        return self.data["side"] == SIDE_SELL
+
+    def total_fee(self) -> float:
+        """수수료 합계. 앞에서부터 차례로 더하므로 sum(t.fee for t in trades)와 같다."""
+        if self._size == 0:
+            return 0.0
+        return float(np.cumsum(self.data["fee"])[-1])
+
+    def to_frame(self) -> pd.DataFrame:
+        """Trade 필드명을 컬럼으로 하는 DataFrame (날짜/문자열은 풀어서 넣는다)."""
+        data = self.data
+        strings = np.array(self.strings, dtype=object)
+        return pd.DataFrame({
+            "date": [day_to_date(day) for day in data["date"].tolist()],
+            "code": strings[data["code"]] if len(data) else [],
+            "name": strings[data["name"]] if len(data) else [],
+            "side": np.array(SIDES, dtype=object)[data["side"]] if len(data) else [],
+            "price": data["price"],
+            "quantity": data["quantity"],
+            "amount": data["amount"],
+            "fee": data["fee"],
+            "profit": data["profit"],
+            "market": strings[data["market"]] if len(data) else [],
+        })
+
+    @staticmethod
+    def concat(logs: list["TradeLog"]) -> "TradeLog":
+        """여러 로그를 순서대로 이어 붙인 새 로그."""
+        result = TradeLog(max(_INITIAL_CAPACITY, sum(len(log) for log in logs)))
+        for log in logs:
+            remap = np.array([result.intern(s) for s in log.strings], dtype=np.int32)
+            data = log.data
+            result.extend_columns(**{
+                key: remap[data[key]] if key in ("code", "name", "market") and len(data) else data[key]
+                for key in TRADE_DTYPE.names
+            })
+        return result
+
+    def sorted_by_date(self) -> "TradeLog":
+        """날짜순(같은 날은 기존 순서)으로 정렬한 새 로그."""
+        order = np.argsort(self.data["date"], kind="stable")
+        return TradeLog.from_arrays(self.data[order], self.strings)
+
+    def sort(self, key=None, reverse: bool = False) -> None:
+        """list.sort처럼 제자리에서 안정 정렬한다. key는 Trade를 받는다.
+
+        모든 거래를 Trade로 만들어 key를 부르므로, 날짜순이면 sorted_by_date가 빠르다.
+        """
+        trades = list(self)
+        keys = trades if key is None else [key(trade) for trade in trades]
+        order = sorted(range(len(trades)), key=keys.__getitem__, reverse=reverse)
+        self._data[:self._size] = self.data[order]
+
+    # ── list[Trade] 호환 ──
+
+    def _trades(self, data: np.ndarray) -> list[Trade]:
+        strings = self.strings
+        return [
+            Trade(date=day_to_date(day), code=strings[code], name=strings[name], side=SIDES[side],
+                  price=price, quantity=quantity, amount=amount, fee=fee, profit=profit,
+                  market=strings[market])
+            for day, code, name, market, side, price, quantity, amount, fee, profit in data.tolist()
+        ]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        # 한 번에 전부 만들지 않고 _ITER_CHUNK 행씩 Trade로 바꾼다
+        size = self._size
+        for start in range(0, size, _ITER_CHUNK):
+            yield from self._trades(self._data[start:min(start + _ITER_CHUNK, size)])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._trades(self.data[index])
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("trade index out of range")
+        return self._trades(self._data[index:index + 1])[0]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TradeLog):
+            if len(self) != len(other):
+                return False
+            mine, theirs = self.data, other.data
+            mine_strings = np.array(self.strings, dtype=object)
+            their_strings = np.array(other.strings, dtype=object)
+            # 문자열 풀 번호는 로그마다 다르므로 풀어서 비교한다
+            return all(
+                np.array_equal(mine_strings[mine[key]], their_strings[theirs[key]])
+                if key in ("code", "name", "market") else np.array_equal(mine[key], theirs[key])
+                for key in TRADE_DTYPE.names
+            )
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __add__(self, other) -> "TradeLog":
+        """list + list처럼 두 기록을 이어 붙인 새 로그 (other는 TradeLog 또는 list[Trade])."""
+        if isinstance(other, (TradeLog, list)):
+            return TradeLog.concat([self, as_trade_log(other)])
+        return NotImplemented
+
+    def __radd__(self, other) -> "TradeLog":
+        if isinstance(other, list):
+            return TradeLog.concat([as_trade_log(other), self])
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"TradeLog({len(self)} trades)"
+
+
+def as_trade_log(trades) -> TradeLog:
+    """TradeLog는 그대로, list[Trade]는 TradeLog로 바꿔 반환한다."""
+    return trades if isinstance(trades, TradeLog) else TradeLog.from_trades(trades)
@@ -7,14 +7,18 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 import streamlit as st
 
+from src.data.cache import load_listing_history
 from src.data.fetcher import (
-    fetch_all_prices,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_RATE_LIMIT,
+    FetchStats,
     fetch_exchange_rate,
     fetch_kospi_index,
     fetch_nasdaq_index,
     fetch_stock_listing,
 )
 from src.engine.backtest import run_backtest, run_dual_market_backtest
+from src.engine.pipeline import stream_market
 from src.ui.charts import render_asset_chart, render_comparison_chart
 from src.ui.sidebar import render_sidebar
 from src.ui.tables import render_metrics, render_trade_table
@@ -28,6 +32,17 @@ st.set_page_config(
 st.title("알고리즘 거래 시뮬레이터")
 st.caption("FinanceDataReader 기반 백테스팅 엔진 (KOSPI + NASDAQ)")
 
+def load_listing(market: str, as_of: str):
+    """as_of 시점 종목 목록. 그 이전 스냅샷이 없으면 경고를 보여 주고 현재 목록을 쓴다."""
+    listing_df = fetch_stock_listing(market, as_of=as_of)
+    if listing_df is None:
+        listing_df = fetch_stock_listing(market)
+        if listing_df is not None:
+            st.warning(f"{as_of} 이전의 {market} 종목 목록 스냅샷이 없어 현재 목록을 사용합니다. "
+                       "이후 상장된 종목이 포함되고 상장폐지 종목은 빠집니다.")
+    return listing_df
+
+
 params = render_sidebar()
 
 if params is not None:
@@ -36,7 +51,7 @@ if params is not None:
 
         # KOSPI 종목 목록
         status_text.text("KOSPI 종목 목록을 불러오는 중...")
-        kospi_listing_df = fetch_stock_listing("KOSPI")
+        kospi_listing_df = load_listing("KOSPI", params.start_date)
 
         if kospi_listing_df is None or kospi_listing_df.empty:
             st.error("KOSPI 종목 목록을 불러올 수 없습니다. 네트워크 연결을 확인해주세요.")
@@ -49,7 +64,7 @@ if params is not None:
         nasdaq_codes = []
         if params.kospi_ratio < 100:
             status_text.text("NASDAQ 종목 목록을 불러오는 중...")
-            nasdaq_listing_df = fetch_stock_listing("NASDAQ")
+            nasdaq_listing_df = load_listing("NASDAQ", params.start_date)
             if nasdaq_listing_df is not None and not nasdaq_listing_df.empty:
                 nasdaq_codes = nasdaq_listing_df["Symbol"].tolist()
             else:
@@ -57,20 +72,25 @@ if params is not None:
                 st.stop()
 
         # KOSPI 가격 데이터
+        fetch_stats: dict[str, FetchStats] = {}
         progress_bar = st.progress(0, text="KOSPI 주가 데이터 수집 중...")
 
         def update_kospi_progress(current: int, total: int):
             pct = current / total
             progress_bar.progress(pct, text=f"KOSPI 주가 데이터 수집 중... ({current}/{total})")
 
-        kospi_price_data = fetch_all_prices(
-            kospi_codes, params.start_date, params.end_date,
-            progress_callback=update_kospi_progress if params.kospi_ratio > 0 else None,
+        # 종가만 남기고 원본 DataFrame은 버린다. 시그널은 종목이 도착하는 대로 수집과 겹쳐 계산한다
+        signal_args = (params.n_rise_days, params.m_fall_days, params.y_emergency_pct)
+        kospi_price_data = stream_market(
+            kospi_codes, params.start_date, params.end_date, *signal_args,
+            progress_callback=update_kospi_progress,
+            max_workers=DEFAULT_MAX_WORKERS, rate_limit=DEFAULT_RATE_LIMIT,
+            stats=fetch_stats.setdefault("KOSPI", FetchStats()),
         ) if params.kospi_ratio > 0 else {}
         progress_bar.empty()
 
         # NASDAQ 가격 데이터 (필요한 경우만)
-        nasdaq_price_data: dict = {}
+        nasdaq_price_data = {}
         if params.kospi_ratio < 100 and nasdaq_codes:
             progress_bar = st.progress(0, text="NASDAQ 주가 데이터 수집 중...")
 
@@ -78,9 +98,11 @@ if params is not None:
                 pct = current / total
                 progress_bar.progress(pct, text=f"NASDAQ 주가 데이터 수집 중... ({current}/{total})")
 
-            nasdaq_price_data = fetch_all_prices(
-                nasdaq_codes, params.start_date, params.end_date,
+            nasdaq_price_data = stream_market(
+                nasdaq_codes, params.start_date, params.end_date, *signal_args,
                 progress_callback=update_nasdaq_progress,
+                max_workers=DEFAULT_MAX_WORKERS, rate_limit=DEFAULT_RATE_LIMIT,
+                stats=fetch_stats.setdefault("NASDAQ", FetchStats()),
             )
             progress_bar.empty()
 
@@ -96,6 +118,19 @@ if params is not None:
 
         status_text.empty()
 
+    # 수집 요약 - 실패/건너뛴 종목
+    for market, stats in fetch_stats.items():
+        if stats.breaker_tripped:
+            st.warning(
+                f"{market}: 연속 요청 실패로 수집을 중단하고 캐시 데이터만 사용했습니다 "
+                f"({len(stats.breaker_skipped)}개 종목)."
+            )
+        if stats.failed or stats.negative_skipped:
+            st.caption(
+                f"{market}: {stats.loaded}/{stats.requested}개 종목 로드, "
+                f"실패 {len(stats.failed)}개, 최근 실패로 건너뜀 {len(stats.negative_skipped)}개"
+            )
+
     # 백테스트 실행
     with st.spinner("백테스트를 실행하고 있습니다..."):
         bt_progress = st.progress(0, text="백테스트 실행 중...")
@@ -104,6 +139,12 @@ if params is not None:
             pct = current / total
             bt_progress.progress(pct, text=f"백테스트 실행 중... ({current}/{total}일)")
 
+        def listing_history(market: str):
+            # 종목 목록 이력은 시가총액 정렬에만 쓴다
+            if params.sort_method != "market_cap":
+                return None
+            return load_listing_history(market, params.start_date, params.end_date)
+
         if params.kospi_ratio == 100:
             # KOSPI only 모드
             result = run_backtest(
@@ -112,6 +153,7 @@ if params is not None:
                 listing_df=kospi_listing_df,
                 kospi_df=kospi_df,
                 progress_callback=bt_update,
+                listing_history=listing_history("KOSPI"),
             )
         else:
             # 이중 시장 모드
@@ -125,6 +167,8 @@ if params is not None:
                 nasdaq_df=nasdaq_df,
                 exchange_rate_df=exchange_rate_df,
                 progress_callback=bt_update,
+                kospi_listing_history=listing_history("KOSPI"),
+                nasdaq_listing_history=listing_history("NASDAQ"),
             )
         bt_progress.empty()
 
@@ -5,6 +5,7 @@ import plotly.graph_objects as go
 import streamlit as st
 
 from src.engine.backtest import BacktestResult
+from src.engine.equity import as_equity_curve
 
 
 def render_asset_chart(result: BacktestResult) -> None:
@@ -13,10 +14,8 @@ def render_asset_chart(result: BacktestResult) -> None:
         st.warning("시뮬레이션 결과가 없습니다.")
         return
 
-    dates = [s.date for s in result.daily_snapshots]
-    cash = [s.cash for s in result.daily_snapshots]
-    stock_value = [s.stock_value for s in result.daily_snapshots]
-    total = [s.total_value for s in result.daily_snapshots]
+    curve = as_equity_curve(result.daily_snapshots)
+    dates, cash, stock_value, total = curve.dates, curve.cash, curve.stock_value, curve.total_value
 
     fig = go.Figure()
 
@@ -53,11 +52,11 @@ def render_comparison_chart(result: BacktestResult) -> None:
         st.warning("시뮬레이션 결과가 없습니다.")
         return
 
-    dates = [s.date for s in result.daily_snapshots]
-    total_values = [s.total_value for s in result.daily_snapshots]
+    curve = as_equity_curve(result.daily_snapshots)
+    dates, total_values = curve.dates, curve.total_value
 
     base = total_values[0] if total_values[0] != 0 else 1
-    portfolio_normalized = [v / base * 100 for v in total_values]
+    portfolio_normalized = total_values / base * 100
 
     fig = go.Figure()
 
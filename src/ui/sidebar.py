@@ -66,6 +66,14 @@ def render_sidebar() -> BacktestParams | None:
         format_func=lambda x: "시가총액 순" if x == "market_cap" else "수익률 순",
     )
 
+    engine_labels = {"pandas": "기본 (pandas)", "panel": "배열 (panel)", "numba": "컴파일 (numba)"}
+    engine = st.sidebar.selectbox(
+        "계산 엔진",
+        options=list(engine_labels),
+        format_func=engine_labels.get,
+        help="결과는 같고 속도만 다릅니다. numba는 첫 실행 때 컴파일 시간이 들고, 설치되어 있지 않으면 panel로 실행합니다.",
+    )
+
     st.sidebar.divider()
 
     if st.sidebar.button("Run Simulation", type="primary", use_container_width=True):
@@ -81,6 +89,7 @@ def render_sidebar() -> BacktestParams | None:
             min_balance=float(min_balance),
             sort_method=sort_method,
             kospi_ratio=int(kospi_ratio),
+            engine=engine,
         )
 
     return None
@@ -1,9 +1,11 @@
 """지표 카드 및 거래내역 테이블 모듈."""
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
 from src.engine.backtest import BacktestResult
+from src.engine.trade_log import as_trade_log
 
 
 def render_metrics(result: BacktestResult) -> None:
@@ -43,22 +45,22 @@ def render_trade_table(result: BacktestResult) -> None:
         st.info("거래 내역이 없습니다.")
         return
 
-    records = []
-    for t in result.trades:
-        is_nasdaq = t.market == "NASDAQ"
-        currency_fmt = "${:,.2f}" if is_nasdaq else "{:,.0f}"
-        records.append({
-            "시장": t.market,
-            "날짜": t.date,
-            "종목코드": t.code,
-            "종목명": t.name,
-            "구분": t.side,
-            "단가": currency_fmt.format(t.price),
-            "수량": t.quantity,
-            "금액": currency_fmt.format(t.amount),
-            "수수료": currency_fmt.format(t.fee),
-            "실현손익": currency_fmt.format(t.profit) if t.side == "SELL" else "-",
-        })
+    trades = as_trade_log(result.trades).to_frame()
+    is_nasdaq = (trades["market"] == "NASDAQ").to_numpy()
 
-    df = pd.DataFrame(records)
+    def money(column: str) -> np.ndarray:
+        return np.where(is_nasdaq, trades[column].map("${:,.2f}".format), trades[column].map("{:,.0f}".format))
+
+    df = pd.DataFrame({
+        "시장": trades["market"],
+        "날짜": trades["date"],
+        "종목코드": trades["code"],
+        "종목명": trades["name"],
+        "구분": trades["side"],
+        "단가": money("price"),
+        "수량": trades["quantity"],
+        "금액": money("amount"),
+        "수수료": money("fee"),
+        "실현손익": np.where(trades["side"] == "SELL", money("profit"), "-"),
+    })
     st.dataframe(df, use_container_width=True, height=400)
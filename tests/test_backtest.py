@@ -3,7 +3,14 @@
 import pandas as pd
 import pytest
 
-from src.engine.backtest import BacktestParams, BacktestResult, run_backtest, run_dual_market_backtest
+from src.engine.backtest import (
+    BacktestParams,
+    BacktestResult,
+    _combine_snapshots,
+    run_backtest,
+    run_dual_market_backtest,
+)
+from src.engine.equity import DailySnapshot, EquityCurve
 
 
 def _make_price_df(prices: list[float], start: str = "2024-01-01") -> pd.DataFrame:
@@ -285,6 +292,29 @@ class TestDualMarketBacktest:
         expected_last = kospi_cash + nasdaq_usd * 1400.0
         assert last.total_value == pytest.approx(expected_last, rel=1e-4)
 
+    def test_combined_snapshots_forward_fill_markets_and_rates(self):
+        """휴장일이 다른 두 시장과 비는 환율을 직전 값으로 채워 합산한다."""
+        kospi = EquityCurve()
+        kospi.record("2024-01-03", 100.0, 10.0)
+        kospi.record("2024-01-05", 200.0, 20.0)
+        nasdaq = EquityCurve()
+        nasdaq.record("2024-01-02", 1.0, 0.5)
+        nasdaq.record("2024-01-04", 2.0, 1.0)
+        exchange_rate_df = pd.DataFrame(
+            {"Close": [1300.0, 1310.0]},
+            index=pd.DatetimeIndex(["2024-01-03", "2024-01-05"]),
+        )
+
+        combined = _combine_snapshots([kospi, nasdaq], [None, exchange_rate_df])
+
+        assert combined == [
+            # KOSPI 시작 전은 0, 환율 시작 전은 첫 환율
+            DailySnapshot("2024-01-02", 1300.0, 650.0, 1950.0),
+            DailySnapshot("2024-01-03", 100.0 + 1300.0, 10.0 + 650.0, 2060.0),
+            DailySnapshot("2024-01-04", 100.0 + 2600.0, 10.0 + 1300.0, 4010.0),
+            DailySnapshot("2024-01-05", 200.0 + 2620.0, 20.0 + 1310.0, 4150.0),
+        ]
+
     def test_kospi_only_when_ratio_100(self):
         """ratio=100이면 KOSPI only로 동작한다."""
         prices = [100, 100, 100, 100, 100]
@@ -0,0 +1,133 @@
+"""구간 인식 캐시 테스트."""
+
+import pandas as pd
+import pytest
+
+from src.data import cache
+from src.data import manifest as manifest_module
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / ".cache")
+
+
+def _make_df(start: str, end: str) -> pd.DataFrame:
+    dates = pd.bdate_range(start, end)
+    return pd.DataFrame({"Close": range(len(dates))}, index=dates, dtype=float)
+
+
+class TestRangeCache:
+    def test_missing_ranges_without_cache(self):
+        assert cache.get_missing_ranges("A", "2024-01-01", "2024-01-31") == [("2024-01-01", "2024-01-31")]
+
+    def test_contained_range_has_nothing_missing(self):
+        cache.save_to_cache("A", "2024-01-01", "2024-03-31", _make_df("2024-01-01", "2024-03-31"))
+        assert cache.get_missing_ranges("A", "2024-02-01", "2024-02-29") == []
+        df = cache.load_from_cache("A", "2024-02-01", "2024-02-29")
+        assert df.index.min() >= pd.Timestamp("2024-02-01")
+        assert df.index.max() <= pd.Timestamp("2024-02-29")
+
+    def test_gap_is_included_in_tail_segment(self):
+        cache.save_to_cache("A", "2024-01-01", "2024-01-31", _make_df("2024-01-01", "2024-01-31"))
+        assert cache.get_missing_ranges("A", "2024-03-01", "2024-03-31") == [("2024-02-01", "2024-03-31")]
+
+    def test_merge_widens_range(self):
+        cache.save_to_cache("A", "2024-02-01", "2024-02-29", _make_df("2024-02-01", "2024-02-29"))
+        cache.save_to_cache("A", "2024-01-01", "2024-01-31", _make_df("2024-01-01", "2024-01-31"))
+        assert cache.get_cached_range("A") == ("2024-01-01", "2024-02-29")
+        df = cache.load_from_cache("A", "2024-01-01", "2024-02-29")
+        assert df.index.is_monotonic_increasing
+        assert len(df) == len(pd.bdate_range("2024-01-01", "2024-02-29"))
+
+    def test_empty_segment_extends_existing_range(self):
+        cache.save_to_cache("A", "2024-01-01", "2024-01-05", _make_df("2024-01-01", "2024-01-05"))
+        cache.save_to_cache("A", "2024-01-06", "2024-01-07", pd.DataFrame())
+        assert cache.get_cached_range("A") == ("2024-01-01", "2024-01-07")
+
+    def test_range_end_is_capped_before_today(self):
+        today = pd.Timestamp.today().normalize()
+        start = (today - pd.Timedelta(days=10)).strftime("%Y-%m-%d")
+        end = today.strftime("%Y-%m-%d")
+        cache.save_to_cache("A", start, end, _make_df(start, end))
+        _, cached_end = cache.get_cached_range("A")
+        assert cached_end < end
+
+    def test_today_only_is_not_stored(self):
+        today = pd.Timestamp.today().normalize().strftime("%Y-%m-%d")
+        cache.save_to_cache("A", today, today, _make_df(today, today))
+        assert cache.get_cached_range("A") is None
+        assert cache.get_missing_ranges("A", today, today) == [(today, today)]
+
+
+class TestManifest:
+    def test_save_records_entry(self):
+        cache.save_to_cache("A", "2024-01-01", "2024-01-31", _make_df("2024-01-01", "2024-01-31"))
+        entry = cache.manifest().get("A")
+        assert (entry.start, entry.end) == ("2024-01-01", "2024-01-31")
+        assert entry.rows == len(pd.bdate_range("2024-01-01", "2024-01-31"))
+        assert entry.nbytes == cache.get_cache_path("A").stat().st_size
+        assert cache.verify_cache() == []
+
+    def test_manifest_persists_across_processes(self):
+        cache.save_to_cache("A", "2024-01-01", "2024-01-31", _make_df("2024-01-01", "2024-01-31"))
+        cache.flush_manifest()
+        reloaded = manifest_module.CacheManifest(cache.CACHE_DIR)
+        assert reloaded.get("A").checksum == cache.manifest().get("A").checksum
+
+    def test_existing_files_are_adopted(self, tmp_path, monkeypatch):
+        cache.save_to_cache("A", "2024-01-01", "2024-01-31", _make_df("2024-01-01", "2024-01-31"))
+        # 매니페스트 파일 없이 캐시 파일만 있는 디렉터리
+        moved = tmp_path / "old_cache"
+        moved.mkdir()
+        cache.get_cache_path("A").rename(moved / "A.parquet")
+        monkeypatch.setattr(cache, "CACHE_DIR", moved)
+        assert cache.get_cached_range("A") == ("2024-01-01", "2024-01-31")
+
+    def test_verify_detects_corruption(self):
+        cache.save_to_cache("A", "2024-01-01", "2024-01-31", _make_df("2024-01-01", "2024-01-31"))
+        cache.get_cache_path("A").write_bytes(b"garbage")
+        assert cache.verify_cache(fix=True) == [("A", "checksum mismatch")]
+        assert cache.get_cached_range("A") is None
+        assert not cache.get_cache_path("A").exists()
+
+    def test_lru_eviction_keeps_pinned_and_recent(self, monkeypatch):
+        for code in ["KS11", "A", "B", "C"]:
+            cache.save_to_cache(code, "2024-01-01", "2024-03-31", _make_df("2024-01-01", "2024-03-31"))
+        size = cache.manifest().get("A").nbytes
+        cache.read_cached_slice("A", "2024-01-01", "2024-01-31")  # A를 최근 사용으로
+
+        monkeypatch.setattr(cache, "CACHE_BUDGET_BYTES", size * 2 + size // 2)
+        cache.save_to_cache("D", "2024-01-01", "2024-03-31", _make_df("2024-01-01", "2024-03-31"))
+
+        remaining = set(cache.manifest().entries)
+        assert {"KS11", "D"} <= remaining
+        assert "B" not in remaining
+        assert not cache.get_cache_path("B").exists()
+        assert cache.manifest().total_bytes() <= cache.CACHE_BUDGET_BYTES
+
+    def test_compact_drops_missing_files(self):
+        cache.save_to_cache("A", "2024-01-01", "2024-01-31", _make_df("2024-01-01", "2024-01-31"))
+        cache.get_cache_path("A").unlink()
+        report = cache.compact_cache()
+        assert report["dropped"] == ["A"]
+        assert cache.manifest().get("A") is None
+
+
+class TestListingHistory:
+    def test_history_covers_range(self):
+        for as_of in ("2020-01-02", "2020-06-01", "2021-01-04", "2022-01-03"):
+            cache.save_listing_snapshot("KOSPI", as_of, pd.DataFrame({"Code": [as_of]}))
+
+        history = cache.load_listing_history("KOSPI", "2020-03-02", "2021-06-30")
+        assert [as_of for as_of, _ in history] == ["2020-01-02", "2020-06-01", "2021-01-04"]
+        assert history[1][1]["Code"].tolist() == ["2020-06-01"]
+
+    def test_history_before_first_snapshot(self):
+        cache.save_listing_snapshot("KOSPI", "2021-01-04", pd.DataFrame({"Code": ["A"]}))
+        # 나중 날짜의 스냅샷으로 대신하지 않는다
+        assert cache.load_listing_history("KOSPI", "2020-01-02", "2020-12-30") == []
+        assert [as_of for as_of, _ in cache.load_listing_history("KOSPI", "2020-01-02", "2021-06-30")] == \
+            ["2021-01-04"]
+        assert cache.load_listing_snapshot("KOSPI", "2020-06-01") is None
+        assert cache.load_listing_history("NASDAQ", "2020-01-02", "2020-12-30") == []
@@ -0,0 +1,56 @@
+"""매수 후보 역색인 테스트."""
+
+import numpy as np
+import pytest
+
+from src.engine.candidates import build_buy_index
+
+
+@pytest.fixture
+def buy():
+    rng = np.random.default_rng(1)
+    return rng.random((40, 25)) < 0.3
+
+
+def _naive(buy, key=None):
+    """매일 후보를 모아 정렬하는 기존 방식."""
+    days = []
+    for t in range(buy.shape[0]):
+        candidates = np.flatnonzero(buy[t]).tolist()
+        if key is not None:
+            candidates.sort(key=lambda j: key(t, j), reverse=True)
+        days.append(candidates)
+    return days
+
+
+class TestBuyIndex:
+    def test_column_order(self, buy):
+        index = build_buy_index(buy)
+        assert len(index) == buy.shape[0]
+        assert [index.day(t).tolist() for t in range(len(index))] == _naive(buy)
+
+    def test_static_priority(self, buy):
+        rng = np.random.default_rng(2)
+        cap_keys = rng.integers(0, 5, size=buy.shape[1]).tolist()  # 같은 값이 많다
+        order = sorted(range(buy.shape[1]), key=cap_keys.__getitem__, reverse=True)
+
+        index = build_buy_index(buy, order=np.array(order))
+        expected = _naive(buy, key=lambda t, j: cap_keys[j])
+        assert [index.day(t).tolist() for t in range(len(index))] == expected
+
+    def test_per_day_returns(self, buy):
+        rng = np.random.default_rng(3)
+        returns = np.round(rng.normal(size=buy.shape), 1)  # 같은 값이 섞이도록 반올림
+        returns[:, ::4] = 0.0
+        returns[::3, 1::4] = -0.0
+
+        index = build_buy_index(buy, keys=returns)
+        expected = _naive(buy, key=lambda t, j: returns[t, j])
+        assert [index.day(t).tolist() for t in range(len(index))] == expected
+
+    def test_empty_days(self):
+        buy = np.zeros((5, 3), dtype=bool)
+        buy[2, 1] = True
+        index = build_buy_index(buy)
+        assert index.offsets.tolist() == [0, 0, 0, 1, 1, 1]
+        assert index.day(2).tolist() == [1]
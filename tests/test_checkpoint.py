@@ -0,0 +1,130 @@
+"""백테스트 체크포인트 테스트 - 나눠 실행한 결과가 한 번에 실행한 결과와 같아야 한다."""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams, run_backtest
+from src.engine.checkpoint import (
+    BacktestCheckpoint,
+    _tail,
+    extend_backtest,
+    load_checkpoint,
+    save_checkpoint,
+)
+from src.engine.signal_cache import set_signal_cache
+
+
+@pytest.fixture(autouse=True)
+def _no_signal_cache():
+    previous = set_signal_cache(None)
+    yield
+    set_signal_cache(previous)
+
+
+@pytest.fixture(scope="module")
+def market():
+    provider = SyntheticProvider(seed=5, n_kospi=60, as_of="2021-12-30", halt_prob=0.05)
+    listing = provider.stock_listing("KOSPI")
+    prices = {code: provider.data_reader(code, "2021-01-04", "2021-12-30") for code in listing["Code"]}
+    return {"listing": listing, "prices": {code: df for code, df in prices.items() if not df.empty}}
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=50_000_000,
+        start_date="2021-01-04",
+        end_date="2021-12-30",
+        fee_rate=0.015,
+        n_rise_days=2,
+        m_fall_days=2,
+        y_emergency_pct=3.0,
+        max_buy_amount=3_000_000,
+        min_balance=1_000_000,
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+def _until(prices, end):
+    return {code: df.loc[:end] for code, df in prices.items()}
+
+
+class TestTail:
+    def test_keeps_last_rows_per_column(self):
+        close = np.arange(12, dtype=np.float64).reshape(4, 3)
+        valid = np.array([[1, 1, 0], [1, 0, 0], [0, 1, 0], [1, 0, 1]], dtype=bool)
+        tail_close, tail_valid = _tail(close, valid, 2)
+        assert tail_valid.tolist() == [[True, True, False], [True, True, True]]
+        assert tail_close[:, :2].tolist() == [[3.0, 1.0], [9.0, 7.0]]
+        assert tail_close[1, 2] == 11.0
+
+
+class TestExtendBacktest:
+    @pytest.mark.parametrize("sort_method", ["market_cap", "return_rate"])
+    @pytest.mark.parametrize("engine", ["panel", "numba"])
+    def test_split_matches_full_run(self, market, tmp_path, sort_method, engine):
+        params = _params(sort_method=sort_method, engine=engine)
+        expected = run_backtest(params, market["prices"], market["listing"])
+
+        checkpoint = BacktestCheckpoint.new(params)
+        extend_backtest(checkpoint, _until(market["prices"], "2021-06-30"), market["listing"])
+        for end in ("2021-09-30", "2021-11-15", "2021-11-16", "2021-12-30"):
+            save_checkpoint(checkpoint, tmp_path / "run.npz")
+            checkpoint = load_checkpoint(tmp_path / "run.npz")
+            # 겹치는 날짜가 섞여 있어도 마지막 거래일 이후의 봉만 처리한다
+            actual = extend_backtest(checkpoint, _until(market["prices"], end), market["listing"])
+
+        assert expected.total_trades > 0
+        assert actual.trades == expected.trades
+        assert actual.daily_snapshots == expected.daily_snapshots
+        assert (actual.final_return_pct, actual.mdd_pct, actual.win_rate_pct, actual.total_fee) == \
+            (expected.final_return_pct, expected.mdd_pct, expected.win_rate_pct, expected.total_fee)
+        assert checkpoint.params.end_date == expected.daily_snapshots[-1].date
+
+    def test_new_codes_are_appended(self, market):
+        codes = list(market["prices"])
+        late = codes[-5:]
+        prices = {code: df.loc["2021-07-01":] if code in late else df for code, df in market["prices"].items()}
+        params = _params(sort_method="return_rate")
+        expected = run_backtest(params, prices, market["listing"])
+
+        checkpoint = BacktestCheckpoint.new(params)
+        first = {code: df for code, df in _until(prices, "2021-06-30").items() if not df.empty}
+        extend_backtest(checkpoint, first, market["listing"])
+        assert not set(late) & set(checkpoint.codes)
+        actual = extend_backtest(checkpoint, prices, market["listing"])
+
+        assert checkpoint.codes == codes
+        assert actual.trades == expected.trades
+        assert actual.daily_snapshots == expected.daily_snapshots
+
+    def test_no_new_bars(self, market):
+        checkpoint = BacktestCheckpoint.new(_params())
+        before = extend_backtest(checkpoint, market["prices"], market["listing"])
+        n_snapshots = len(before.daily_snapshots)
+        after = extend_backtest(checkpoint, _until(market["prices"], "2021-12-01"), market["listing"])
+        assert len(after.daily_snapshots) == n_snapshots
+
+
+class TestCheckpointFile:
+    def test_round_trip(self, market, tmp_path):
+        checkpoint = BacktestCheckpoint.new(_params(engine="numba"))
+        extend_backtest(checkpoint, market["prices"], market["listing"])
+        save_checkpoint(checkpoint, tmp_path / "sub" / "run.npz")
+        loaded = load_checkpoint(tmp_path / "sub" / "run.npz")
+
+        assert loaded.params == checkpoint.params
+        assert loaded.codes == checkpoint.codes and loaded.names == checkpoint.names
+        assert loaded.portfolio == checkpoint.portfolio
+        assert list(loaded.portfolio.holdings) == list(checkpoint.portfolio.holdings)
+        for field in dataclasses.fields(loaded.streak):
+            np.testing.assert_array_equal(getattr(loaded.streak, field.name), getattr(checkpoint.streak, field.name))
+        np.testing.assert_array_equal(loaded.tail_close, checkpoint.tail_close)
+
+    def test_missing_or_corrupt(self, tmp_path):
+        assert load_checkpoint(tmp_path / "missing.npz") is None
+        (tmp_path / "bad.npz").write_bytes(b"not a zip")
+        assert load_checkpoint(tmp_path / "bad.npz") is None
@@ -0,0 +1,160 @@
+"""날짜 × 종목 배열 엔진 테스트 - 기본 pandas 엔진과 결과가 같아야 한다."""
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.fetcher import downcast_prices
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams, run_backtest, run_dual_market_backtest
+from src.engine.dense import _trailing_returns, trailing_return_matrix
+from src.engine.signal_cache import set_signal_cache
+
+
+@pytest.fixture(autouse=True)
+def _no_signal_cache():
+    """두 엔진이 각자 시그널을 계산하도록 시그널 캐시를 끈다."""
+    previous = set_signal_cache(None)
+    yield
+    set_signal_cache(previous)
+
+
+@pytest.fixture(scope="module")
+def market():
+    provider = SyntheticProvider(seed=5, n_kospi=60, n_nasdaq=30, as_of="2021-12-30", halt_prob=0.05)
+    start, end = "2021-01-04", "2021-12-30"
+    listing = provider.stock_listing("KOSPI")
+    prices = {code: provider.data_reader(code, start, end) for code in listing["Code"]}
+    nasdaq_listing = provider.stock_listing("NASDAQ")
+    nasdaq_prices = {code: provider.data_reader(code, start, end) for code in nasdaq_listing["Symbol"]}
+    return {
+        "listing": listing,
+        "prices": {code: df for code, df in prices.items() if not df.empty},
+        "nasdaq_listing": nasdaq_listing,
+        "nasdaq_prices": {code: df for code, df in nasdaq_prices.items() if not df.empty},
+        "kospi_index": provider.data_reader("KS11", start, end),
+        "nasdaq_index": provider.data_reader("IXIC", start, end),
+        "rate": provider.data_reader("USD/KRW", start, end),
+    }
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=300_000_000,
+        start_date="2021-01-04",
+        end_date="2021-12-30",
+        fee_rate=0.015,
+        n_rise_days=2,
+        m_fall_days=2,
+        y_emergency_pct=3.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+def _snapshot_frame(snapshots) -> pd.DataFrame:
+    return pd.DataFrame([dataclasses.asdict(s) for s in snapshots])
+
+
+def _assert_same_snapshots(actual, expected):
+    """NaN도 같은 값으로 보고 일별 스냅샷이 정확히 같은지 확인한다."""
+    pd.testing.assert_frame_equal(_snapshot_frame(actual), _snapshot_frame(expected), check_exact=True)
+
+
+def _assert_same(params, *args, **kwargs):
+    expected = run_backtest(dataclasses.replace(params, engine="pandas"), *args, **kwargs)
+    actual = run_backtest(dataclasses.replace(params, engine="panel"), *args, **kwargs)
+    assert expected.total_trades > 0
+    assert actual.trades == expected.trades
+    _assert_same_snapshots(actual.daily_snapshots, expected.daily_snapshots)
+    assert (actual.final_return_pct, actual.mdd_pct, actual.win_rate_pct) == \
+        (expected.final_return_pct, expected.mdd_pct, expected.win_rate_pct)
+
+
+class TestPanelEngineMatchesPandas:
+    @pytest.mark.parametrize("sort_method", ["market_cap", "return_rate"])
+    def test_with_listing(self, market, sort_method):
+        _assert_same(_params(sort_method=sort_method), market["prices"], market["listing"])
+
+    def test_without_listing(self, market):
+        _assert_same(_params(), market["prices"])
+
+    def test_return_rate_with_longer_window(self, market):
+        _assert_same(_params(sort_method="return_rate", n_rise_days=4, m_fall_days=3),
+                     market["prices"], market["listing"])
+
+    def test_cash_constrained(self, market):
+        _assert_same(_params(initial_cash=20_000_000, max_buy_amount=3_000_000),
+                     market["prices"], market["listing"])
+
+    def test_downcast_prices(self, market):
+        prices = {code: downcast_prices(df) for code, df in market["prices"].items()}
+        _assert_same(_params(sort_method="return_rate"), prices, market["listing"])
+
+    def test_integer_and_missing_closes(self, market):
+        prices = {}
+        for i, (code, df) in enumerate(market["prices"].items()):
+            df = df[["Close"]].copy()
+            if i % 3 == 0:
+                df["Close"] = df["Close"].round().astype(np.int64)
+            elif i % 3 == 1:
+                df.iloc[5:8, 0] = np.nan
+            prices[code] = df
+        prices["EMPTY"] = pd.DataFrame({"Close": []}, index=pd.DatetimeIndex([]))
+        prices["NOCLOSE"] = pd.DataFrame({"Volume": [1, 2]}, index=pd.bdate_range("2021-01-04", periods=2))
+        _assert_same(_params(), prices, market["listing"])
+
+    def test_dual_market(self, market):
+        params = _params(kospi_ratio=40)
+        args = (market["prices"], market["nasdaq_prices"], market["listing"], market["nasdaq_listing"],
+                market["kospi_index"], market["nasdaq_index"], market["rate"])
+        expected = run_dual_market_backtest(dataclasses.replace(params, engine="pandas"), *args)
+        actual = run_dual_market_backtest(dataclasses.replace(params, engine="panel"), *args)
+        assert actual.trades == expected.trades
+        assert actual.daily_snapshots == expected.daily_snapshots
+        assert actual.nasdaq_snapshots == expected.nasdaq_snapshots
+
+    def test_progress_callback(self, market):
+        calls = []
+        result = run_backtest(_params(engine="panel"), market["prices"],
+                              progress_callback=lambda cur, tot: calls.append((cur, tot)))
+        n_days = len(result.daily_snapshots)
+        assert calls == [(i + 1, n_days) for i in range(n_days)]
+
+    def test_unknown_engine(self, market):
+        with pytest.raises(ValueError):
+            run_backtest(_params(engine="gpu"), market["prices"])
+
+
+class TestTrailingReturns:
+    def test_matches_scalar_definition(self):
+        values = np.array([10.0, 0.0, 12.0, 9.0, 15.0])
+        result = _trailing_returns(values, 2)
+        assert result[:2].tolist() == [0.0, 0.0]
+        assert result[2] == pytest.approx(0.2)
+        assert result[3] == 0.0  # 기준가 0
+        assert result[4] == pytest.approx(0.25)
+
+    def test_short_series(self):
+        assert _trailing_returns(np.array([1.0, 2.0]), 3).tolist() == [0.0, 0.0]
+
+    def test_matrix_matches_per_ticker(self):
+        rng = np.random.default_rng(4)
+        close = np.round(rng.uniform(-1, 20, size=(50, 12)), 1)
+        valid = rng.random(close.shape) > 0.25
+        valid[:, 3] = False  # 데이터가 없는 종목
+        close[~valid] = np.nan
+        close[10, 5] = np.nan  # 데이터 행이지만 종가 결측
+        valid[10, 5] = True
+
+        for n in (1, 3, 60):
+            result = trailing_return_matrix(close, valid, n)
+            for j in range(close.shape[1]):
+                rows = np.flatnonzero(valid[:, j])
+                expected = np.zeros(close.shape[0])
+                expected[rows] = _trailing_returns(close[rows, j], n)
+                np.testing.assert_array_equal(result[:, j], expected)
@@ -0,0 +1,91 @@
+"""열 단위 자산 곡선과 증분 평가 테스트."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine.equity import DailySnapshot, EquityCurve, as_equity_curve
+from src.engine.portfolio import Portfolio
+
+
+def _snapshots() -> list[DailySnapshot]:
+    return [
+        DailySnapshot("2024-01-02", 1_000_000.0, 0.0, 1_000_000.0),
+        DailySnapshot("2024-01-03", 300_000.0, 710_000.0, 1_010_000.0),
+        DailySnapshot("2024-01-04", 300_000.0, float("nan"), float("nan")),
+    ]
+
+
+class TestEquityCurve:
+    def test_round_trips_snapshots(self):
+        snapshots = _snapshots()[:2]
+        curve = EquityCurve.from_snapshots(snapshots)
+        assert len(curve) == 2
+        assert curve == snapshots and list(curve) == snapshots
+        assert curve[-1] == snapshots[-1] and curve[0:1] == snapshots[0:1]
+        with pytest.raises(IndexError):
+            curve[2]
+        assert pickle.loads(pickle.dumps(curve)) == curve
+        assert as_equity_curve(curve) is curve
+
+    def test_columns(self):
+        curve = EquityCurve.from_snapshots(_snapshots())
+        assert curve.dates.dtype == np.dtype("datetime64[D]")
+        assert curve.date_strings() == ["2024-01-02", "2024-01-03", "2024-01-04"]
+        np.testing.assert_array_equal(curve.cash, [1_000_000.0, 300_000.0, 300_000.0])
+        frame = curve.to_frame()
+        assert list(frame.columns) == ["cash", "stock_value", "total_value"]
+        assert frame.index[1] == pd.Timestamp("2024-01-03")
+
+    def test_extend_columns_grows_past_capacity(self):
+        curve = EquityCurve(capacity=2)
+        curve.record("2024-01-01", 1.0, 2.0)
+        days = np.arange(19724, 19724 + 300, dtype=np.int32)
+        curve.extend_columns(days, np.ones(300), np.arange(300, dtype=np.float64))
+        assert len(curve) == 301
+        assert curve[0].total_value == 3.0
+        assert curve[-1] == DailySnapshot("2024-10-27", 1.0, 299.0, 300.0)
+
+
+class TestIncrementalMark:
+    def test_matches_full_revaluation(self):
+        p = Portfolio(cash=10_000_000, fee_rate=0.015)
+        p.buy("2024-01-02", "005930", "삼성전자", 70_100, 3_000_000, 0)
+        p.buy("2024-01-02", "000660", "SK하이닉스", 130_300, 3_000_000, 0)
+        p.record_snapshot("2024-01-02")
+        p.mark("000660", 131_700.0)
+        p.mark("005930", None)  # 데이터가 없는 날은 평균 매입 단가
+        p.record_snapshot("2024-01-03")
+
+        expected = Portfolio(cash=10_000_000, fee_rate=0.015)
+        expected.buy("2024-01-02", "005930", "삼성전자", 70_100, 3_000_000, 0)
+        expected.buy("2024-01-02", "000660", "SK하이닉스", 130_300, 3_000_000, 0)
+        expected.snapshot("2024-01-02", {"005930": 70_100, "000660": 130_300})
+        expected.snapshot("2024-01-03", {"000660": 131_700.0})
+        assert p.daily_snapshots == expected.daily_snapshots
+
+    def test_sell_drops_market_value(self):
+        p = Portfolio(cash=10_000_000, fee_rate=0.015)
+        p.buy("2024-01-02", "005930", "삼성전자", 70_000, 3_000_000, 0)
+        p.sell_all("2024-01-03", "005930", "삼성전자", 71_000)
+        p.record_snapshot("2024-01-03")
+        assert p.market_values == {}
+        assert p.daily_snapshots[-1].total_value == p.cash
+
+    def test_running_total_follows_marks(self):
+        p = Portfolio(cash=10_000_000, fee_rate=0.015)
+        p.buy("2024-01-02", "005930", "삼성전자", 70_100, 3_000_000, 0)
+        p.buy("2024-01-02", "000660", "SK하이닉스", 130_300, 3_000_000, 0)
+        p.mark("005930", 70_100.0)  # 같은 값이면 합계는 그대로
+        assert p.stock_value == 42 * 70_100 + 23 * 130_300
+
+        p.mark("005930", float("nan"))
+        assert np.isnan(p.stock_value)
+        p.mark("005930", 71_000.0)  # NaN이 빠지면 다시 더한다
+        assert p.stock_value == 42 * 71_000 + 23 * 130_300
+
+        p.sell_all("2024-01-03", "000660", "SK하이닉스", 131_000)
+        p.sell_all("2024-01-03", "005930", "삼성전자", 71_000)
+        assert p.stock_value == 0.0
@@ -0,0 +1,322 @@
+"""가격 수집 모듈 테스트 - FinanceDataReader 대신 로컬 스텁 사용."""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.data import cache, fetcher, providers
+from src.data import negative_cache as negative_cache_module
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    """캐시 디렉터리를 임시 경로로 격리하고 재시도 대기를 없앤다."""
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / ".cache")
+    monkeypatch.setattr(fetcher, "RETRY_BASE_DELAY", 0.0)
+
+
+class StubReader:
+    """fdr.DataReader를 대신하는 스레드 안전 스텁."""
+
+    def __init__(self, fail_codes: dict[str, int] | None = None, delay: float = 0.0):
+        self.fail_codes = dict(fail_codes or {})
+        self.delay = delay
+        self.calls: list[str] = []
+        self.ranges: list[tuple[str, str, str]] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, code: str, start: str, end: str) -> pd.DataFrame:
+        with self._lock:
+            self.calls.append(code)
+            self.ranges.append((code, start, end))
+            remaining = self.fail_codes.get(code, 0)
+            if remaining:
+                self.fail_codes[code] = remaining - 1
+        if self.delay:
+            time.sleep(self.delay)
+        if remaining:
+            raise ConnectionError(f"stub failure for {code}")
+        dates = pd.bdate_range(start, end)
+        prices = [100.0 + d.dayofyear for d in dates]
+        return pd.DataFrame({"Close": prices, "Volume": [1000] * len(prices)}, index=dates)
+
+
+class TestFetchAllPrices:
+    def test_concurrent_matches_sequential(self, monkeypatch):
+        codes = [f"{i:06d}" for i in range(20)]
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        sequential = fetcher.fetch_all_prices(codes, "2024-01-01", "2024-01-05")
+
+        monkeypatch.setattr(cache, "CACHE_DIR", cache.CACHE_DIR.parent / ".cache2")
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(delay=0.01))
+        concurrent = fetcher.fetch_all_prices(codes, "2024-01-01", "2024-01-05", max_workers=4)
+
+        assert list(concurrent.keys()) == codes
+        for code in codes:
+            pd.testing.assert_frame_equal(concurrent[code], sequential[code])
+
+    def test_progress_callback_contract(self, monkeypatch):
+        codes = [f"{i:06d}" for i in range(10)]
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(delay=0.005))
+        calls: list[tuple[int, int]] = []
+        fetcher.fetch_all_prices(
+            codes, "2024-01-01", "2024-01-05",
+            progress_callback=lambda cur, tot: calls.append((cur, tot)),
+            max_workers=3,
+        )
+        assert calls == [(i + 1, 10) for i in range(10)]
+
+    def test_retry_does_not_stall_other_workers(self, monkeypatch):
+        monkeypatch.setattr(fetcher, "RETRY_BASE_DELAY", 0.2)
+        stub = StubReader(fail_codes={"BAD": 2})
+        monkeypatch.setattr(providers.fdr, "DataReader", stub)
+        codes = ["BAD"] + [f"{i:06d}" for i in range(8)]
+
+        result = fetcher.fetch_all_prices(codes, "2024-01-01", "2024-01-05", max_workers=4)
+
+        assert "BAD" in result
+        assert len(result) == len(codes)
+        # 나머지 종목은 BAD의 백오프(0.2s + 0.4s)가 끝나기 전에 모두 수집된다
+        assert stub.calls[-1] == "BAD"
+
+    def test_failed_code_is_skipped(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(fail_codes={"DEAD": 99}))
+        result = fetcher.fetch_all_prices(["A", "DEAD", "B"], "2024-01-01", "2024-01-05", max_workers=2)
+        assert list(result.keys()) == ["A", "B"]
+
+
+class TestTokenBucket:
+    def test_rate_limit_is_enforced(self):
+        bucket = fetcher.TokenBucket(rate=50, capacity=1)
+        started = time.monotonic()
+        for _ in range(11):
+            bucket.acquire()
+        # 첫 토큰 이후 10개는 초당 50개 속도로만 발급된다
+        assert time.monotonic() - started >= 10 / 50 * 0.9
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            fetcher.TokenBucket(rate=0)
+
+
+class TestRangeAwareCache:
+    def test_sub_range_is_served_locally(self, monkeypatch):
+        stub = StubReader()
+        monkeypatch.setattr(providers.fdr, "DataReader", stub)
+        full = fetcher.fetch_price_data("A", "2024-01-01", "2024-03-29")
+        sub = fetcher.fetch_price_data("A", "2024-02-01", "2024-02-29")
+
+        assert stub.ranges == [("A", "2024-01-01", "2024-03-29")]
+        pd.testing.assert_frame_equal(sub, full.loc["2024-02-01":"2024-02-29"], check_freq=False)
+
+    def test_only_missing_head_and_tail_are_fetched(self, monkeypatch):
+        stub = StubReader()
+        monkeypatch.setattr(providers.fdr, "DataReader", stub)
+        fetcher.fetch_price_data("A", "2024-02-01", "2024-02-29")
+        df = fetcher.fetch_price_data("A", "2024-01-15", "2024-03-05")
+
+        assert stub.ranges[1:] == [
+            ("A", "2024-01-15", "2024-01-31"),
+            ("A", "2024-03-01", "2024-03-05"),
+        ]
+        expected = pd.bdate_range("2024-01-15", "2024-03-05")
+        assert list(df.index) == list(expected)
+
+
+class StubListing:
+    """fdr.StockListing을 대신하는 스텁."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self, market: str) -> pd.DataFrame:
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("offline")
+        return pd.DataFrame({"Code": ["005930", "NEW001"], "Name": ["삼성전자", "신규상장"]})
+
+
+class TestListingSnapshots:
+    def test_listing_is_cached_within_ttl(self, monkeypatch):
+        stub = StubListing()
+        monkeypatch.setattr(providers.fdr, "StockListing", stub)
+        first = fetcher.fetch_stock_listing("KOSPI")
+        second = fetcher.fetch_stock_listing("KOSPI")
+        assert stub.calls == 1
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_expired_snapshot_is_refreshed(self, monkeypatch):
+        stub = StubListing()
+        monkeypatch.setattr(providers.fdr, "StockListing", stub)
+        fetcher.fetch_stock_listing("KOSPI")
+        fetcher.fetch_stock_listing("KOSPI", ttl=-1)
+        assert stub.calls == 2
+
+    def test_point_in_time_snapshot(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", StubListing())
+        old = pd.DataFrame({"Code": ["005930", "DELIST"], "Name": ["삼성전자", "상장폐지"]})
+        cache.save_listing_snapshot("KOSPI", "2020-01-02", old)
+
+        listing = fetcher.fetch_stock_listing("KOSPI", as_of="2021-06-01")
+        assert listing["Code"].tolist() == ["005930", "DELIST"]
+
+        current = fetcher.fetch_stock_listing("KOSPI")
+        assert current["Code"].tolist() == ["005930", "NEW001"]
+
+    def test_offline_uses_stored_snapshot(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", StubListing())
+        fetcher.fetch_stock_listing("KOSPI")
+        monkeypatch.setattr(providers.fdr, "StockListing", StubListing(fail=True))
+        listing = fetcher.fetch_stock_listing("KOSPI", ttl=-1)
+        assert listing["Code"].tolist() == ["005930", "NEW001"]
+
+    def test_offline_without_snapshot_raises(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", StubListing(fail=True))
+        with pytest.raises(ConnectionError):
+            fetcher.fetch_stock_listing("KOSPI")
+
+
+class TestColumnProjection:
+    def test_projection_and_downcast(self, monkeypatch):
+        def reader(code, start, end):
+            dates = pd.bdate_range(start, end)
+            n = len(dates)
+            return pd.DataFrame({
+                "Open": [100.0] * n, "High": [101.0] * n, "Low": [99.0] * n,
+                "Close": [100.5] * n, "Volume": [12345] * n, "Change": [0.01] * n,
+            }, index=dates)
+
+        monkeypatch.setattr(providers.fdr, "DataReader", reader)
+        full = fetcher.fetch_all_prices(["A"], "2024-01-01", "2024-03-29")["A"]
+
+        stats = fetcher.FetchStats()
+        slim = fetcher.fetch_all_prices(
+            ["A"], "2024-01-01", "2024-03-29",
+            columns=["Close", "Volume"], downcast=True, stats=stats,
+        )["A"]
+
+        assert list(slim.columns) == ["Close", "Volume"]
+        assert slim["Close"].dtype == "float32"
+        assert slim["Volume"].dtype == "int32"
+        assert (slim.index == full.index).all()
+        assert stats.loaded == 1 and stats.failed == []
+        assert stats.saved_bytes > stats.loaded_bytes
+
+    def test_unknown_columns_are_ignored(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        df = fetcher.fetch_price_data("A", "2024-01-01", "2024-01-31", columns=["Close", "Adj Close"])
+        assert list(df.columns) == ["Close"]
+
+    def test_downcast_keeps_large_volume_as_int64(self):
+        df = pd.DataFrame({"Close": [1.0, 2.0], "Volume": [1, 2**40]})
+        result = fetcher.downcast_prices(df)
+        assert result["Close"].dtype == "float32"
+        assert result["Volume"].dtype == "int64"
+
+
+class TestNegativeCache:
+    def test_failed_code_is_not_requested_again(self, monkeypatch):
+        stub = StubReader(fail_codes={"DEAD": 99})
+        monkeypatch.setattr(providers.fdr, "DataReader", stub)
+        fetcher.fetch_all_prices(["A", "DEAD"], "2024-01-01", "2024-01-05")
+        assert stub.calls.count("DEAD") == fetcher.MAX_RETRIES
+
+        stats = fetcher.FetchStats()
+        result = fetcher.fetch_all_prices(["A", "DEAD"], "2024-01-01", "2024-01-05", stats=stats)
+
+        assert stub.calls.count("DEAD") == fetcher.MAX_RETRIES
+        assert list(result) == ["A"]
+        assert stats.negative_skipped == ["DEAD"] and stats.failed == []
+
+    def test_blocked_code_serves_cached_data(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        fetcher.fetch_all_prices(["A"], "2024-01-01", "2024-01-31")
+        cache.negative_cache().add("A", "delisted")
+
+        stub = StubReader(fail_codes={"A": 99})
+        monkeypatch.setattr(providers.fdr, "DataReader", stub)
+        result = fetcher.fetch_all_prices(["A"], "2024-01-01", "2024-02-29")
+
+        assert stub.calls == []
+        assert result["A"].index.max() <= pd.Timestamp("2024-01-31")
+
+    def test_entry_expires_and_backs_off(self, monkeypatch):
+        negative = cache.negative_cache()
+        first = negative.add("DEAD", "boom")
+        second = negative.add("DEAD", "boom")
+        assert second.failures == 2
+        assert second.expires_at - first.expires_at > negative.ttl * 0.9
+
+        negative.entries["DEAD"].expires_at = 0
+        assert not negative.is_blocked("DEAD")
+        assert negative.purge_expired() == ["DEAD"]
+
+    def test_persisted_across_processes(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(fail_codes={"DEAD": 99}))
+        fetcher.fetch_all_prices(["DEAD"], "2024-01-01", "2024-01-05")
+        reloaded = negative_cache_module.NegativeCache(cache.CACHE_DIR)
+        assert reloaded.is_blocked("DEAD")
+
+    def test_success_clears_entry(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        negative = cache.negative_cache()
+        negative.add("A", "temporary")
+        negative.entries["A"].expires_at = 0
+        fetcher.fetch_all_prices(["A"], "2024-01-01", "2024-01-05")
+        assert negative.entries.get("A") is None
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = fetcher.CircuitBreaker(threshold=3)
+        assert not breaker.record_failure("A")
+        breaker.record_success()
+        assert not breaker.record_failure("B")
+        assert not breaker.record_failure("C")
+        assert breaker.record_failure("D")
+        assert breaker.is_open and breaker.tripped_by == ["B", "C", "D"]
+
+    def test_outage_stops_requests_and_serves_cache(self, monkeypatch):
+        codes = [f"{i:06d}" for i in range(10)]
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        fetcher.fetch_all_prices(codes[-2:], "2024-01-01", "2024-01-31")
+
+        outage = StubReader(fail_codes={code: 99 for code in codes})
+        monkeypatch.setattr(providers.fdr, "DataReader", outage)
+        stats = fetcher.FetchStats()
+        result = fetcher.fetch_all_prices(codes, "2024-01-01", "2024-02-29",
+                                          breaker_threshold=3, stats=stats)
+
+        assert stats.breaker_tripped
+        assert stats.failed == codes[:3]
+        assert stats.breaker_skipped == codes[3:]
+        assert len(outage.calls) == 3 * fetcher.MAX_RETRIES
+        # 캐시에 있던 종목은 가진 구간만큼 반환한다
+        assert list(result) == codes[-2:]
+        # 장애로 실패한 종목은 네거티브 캐시에 남기지 않는다
+        assert not any(cache.negative_cache().is_blocked(code) for code in codes)
+
+    def test_breaker_with_workers(self, monkeypatch):
+        codes = [f"{i:06d}" for i in range(40)]
+        outage = StubReader(fail_codes={code: 99 for code in codes})
+        monkeypatch.setattr(providers.fdr, "DataReader", outage)
+        stats = fetcher.FetchStats()
+        fetcher.fetch_all_prices(codes, "2024-01-01", "2024-01-31",
+                                 max_workers=4, breaker_threshold=5, stats=stats)
+
+        assert stats.breaker_tripped
+        assert len(stats.failed) + len(stats.breaker_skipped) == len(codes)
+        assert len(stats.breaker_skipped) > len(codes) // 2
+        # 차단기가 열릴 때 진행 중이던 요청의 실패도 네거티브 캐시에 남기지 않는다
+        assert not any(cache.negative_cache().is_blocked(code) for code in codes)
+
+    def test_disabled(self, monkeypatch):
+        codes = [f"{i:06d}" for i in range(5)]
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(fail_codes={c: 99 for c in codes}))
+        stats = fetcher.FetchStats()
+        fetcher.fetch_all_prices(codes, "2024-01-01", "2024-01-31", breaker_threshold=None,
+                                 use_negative_cache=False, stats=stats)
+        assert not stats.breaker_tripped and stats.failed == codes
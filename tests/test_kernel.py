@@ -0,0 +1,155 @@
+"""컴파일 시뮬레이션 커널 테스트 - Python 패널 엔진과 결과가 같아야 한다."""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from src.data.synthetic import SyntheticProvider
+from src.engine import kernel
+from src.engine.backtest import BacktestParams, _get_trading_dates, run_backtest, run_dual_market_backtest
+from src.engine.dense import build_market_panel, run_panel_loop
+from src.engine.market_cap import build_market_cap_panel
+from src.engine.portfolio import Portfolio
+from src.engine.signal_cache import set_signal_cache
+
+
+@pytest.fixture(autouse=True)
+def _no_signal_cache():
+    previous = set_signal_cache(None)
+    yield
+    set_signal_cache(previous)
+
+
+@pytest.fixture(scope="module")
+def market():
+    provider = SyntheticProvider(seed=21, n_kospi=60, n_nasdaq=30, as_of="2021-12-30", halt_prob=0.05)
+    start, end = "2021-01-04", "2021-12-30"
+    listing = provider.stock_listing("KOSPI")
+    prices = {code: provider.data_reader(code, start, end) for code in listing["Code"]}
+    nasdaq_listing = provider.stock_listing("NASDAQ")
+    nasdaq_prices = {code: provider.data_reader(code, start, end) for code in nasdaq_listing["Symbol"]}
+    return {
+        "listing": listing,
+        "prices": {code: df for code, df in prices.items() if not df.empty},
+        "nasdaq_listing": nasdaq_listing,
+        "nasdaq_prices": {code: df for code, df in nasdaq_prices.items() if not df.empty},
+        "kospi_index": provider.data_reader("KS11", start, end),
+        "nasdaq_index": provider.data_reader("IXIC", start, end),
+        "rate": provider.data_reader("USD/KRW", start, end),
+    }
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=300_000_000,
+        start_date="2021-01-04",
+        end_date="2021-12-30",
+        fee_rate=0.015,
+        n_rise_days=2,
+        m_fall_days=2,
+        y_emergency_pct=3.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+def _assert_same(params, *args):
+    expected = run_backtest(dataclasses.replace(params, engine="panel"), *args)
+    actual = run_backtest(dataclasses.replace(params, engine="numba"), *args)
+    assert expected.total_trades > 0
+    assert actual.trades == expected.trades
+    assert actual.daily_snapshots == expected.daily_snapshots
+    assert (actual.final_return_pct, actual.mdd_pct, actual.win_rate_pct, actual.total_fee) == \
+        (expected.final_return_pct, expected.mdd_pct, expected.win_rate_pct, expected.total_fee)
+
+
+def _run_loops(market, params, simulate, cap_rank=None, portfolio_factory=None):
+    """같은 패널에서 run_panel_loop와 run_kernel_loop를 실행해 두 포트폴리오를 반환한다."""
+    panel = build_market_panel(
+        market["prices"], _get_trading_dates(market["prices"]),
+        n_rise=params.n_rise_days, m_fall=params.m_fall_days, y_pct=params.y_emergency_pct,
+        returns_n=params.n_rise_days if params.sort_method == "return_rate" else None,
+    )
+    factory = portfolio_factory or (lambda: Portfolio(cash=params.initial_cash, fee_rate=params.fee_rate))
+    expected, actual = factory(), factory()
+    if params.sort_method == "market_cap":
+        cap_rank = build_market_cap_panel(
+            panel.close, panel.dates, panel.codes, [(params.start_date, market["listing"])]).rank
+    run_panel_loop(panel, expected, {}, params.max_buy_amount, params.min_balance, cap_rank=cap_rank)
+    kernel.run_kernel_loop(panel, actual, {}, params.max_buy_amount, params.min_balance,
+                           cap_rank=cap_rank, simulate=simulate)
+    return expected, actual
+
+
+class TestPythonKernel:
+    """numba 없이 커널 함수(_simulate)를 그대로 실행해 계산 순서를 확인한다."""
+
+    @pytest.mark.parametrize("sort_method", ["market_cap", "return_rate"])
+    def test_matches_panel_loop(self, market, sort_method):
+        params = _params(sort_method=sort_method, initial_cash=50_000_000)
+        expected, actual = _run_loops(market, params, kernel._simulate)
+
+        assert len(expected.trades) > 0
+        assert actual.trades == expected.trades
+        assert actual.daily_snapshots == expected.daily_snapshots
+        assert actual.cash == expected.cash
+        assert actual.holdings == expected.holdings
+
+    def test_resumes_from_existing_holdings(self, market):
+        params = _params(initial_cash=20_000_000)
+        codes = list(market["prices"])
+
+        def factory():
+            portfolio = Portfolio(cash=params.initial_cash, fee_rate=params.fee_rate)
+            for code in (codes[3], codes[0]):
+                portfolio.buy("2020-12-30", code, code, 10_000.0, 1_000_000, 0)
+            return portfolio
+
+        expected, actual = _run_loops(market, params, kernel._simulate, portfolio_factory=factory)
+        assert actual.trades == expected.trades
+        assert actual.daily_snapshots == expected.daily_snapshots
+        assert list(actual.holdings) == list(expected.holdings)
+
+    def test_trade_buffer_grows(self, market, monkeypatch):
+        monkeypatch.setattr(kernel, "_INITIAL_TRADE_CAPACITY", 4)
+        expected, actual = _run_loops(market, _params(), kernel._simulate)
+        assert len(expected.trades) > 4
+        assert actual.trades == expected.trades
+
+
+class TestNumbaEngine:
+    @pytest.mark.parametrize("sort_method", ["market_cap", "return_rate"])
+    def test_with_listing(self, market, sort_method):
+        _assert_same(_params(sort_method=sort_method), market["prices"], market["listing"])
+
+    def test_without_listing(self, market):
+        _assert_same(_params(), market["prices"])
+
+    def test_cash_constrained(self, market):
+        _assert_same(_params(initial_cash=20_000_000, max_buy_amount=3_000_000, sort_method="return_rate"),
+                     market["prices"], market["listing"])
+
+    def test_integer_closes(self, market):
+        prices = {code: df[["Close"]].round().astype(np.int64) if i % 2 else df
+                  for i, (code, df) in enumerate(market["prices"].items())}
+        _assert_same(_params(), prices, market["listing"])
+
+    def test_dual_market(self, market):
+        params = _params(kospi_ratio=40)
+        args = (market["prices"], market["nasdaq_prices"], market["listing"], market["nasdaq_listing"],
+                market["kospi_index"], market["nasdaq_index"], market["rate"])
+        expected = run_dual_market_backtest(dataclasses.replace(params, engine="panel"), *args)
+        actual = run_dual_market_backtest(dataclasses.replace(params, engine="numba"), *args)
+        assert actual.trades == expected.trades
+        assert actual.daily_snapshots == expected.daily_snapshots
+
+    def test_falls_back_without_numba(self, market, monkeypatch):
+        monkeypatch.setattr(kernel, "_simulate_jit", None)
+        calls = []
+        result = run_backtest(_params(engine="numba"), market["prices"],
+                              progress_callback=lambda cur, tot: calls.append(cur))
+        assert result.trades == run_backtest(_params(engine="panel"), market["prices"]).trades
+        assert calls == list(range(1, len(result.daily_snapshots) + 1))
@@ -0,0 +1,125 @@
+"""시점별 시가총액 패널 테스트."""
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.engine.backtest import BacktestParams, run_backtest
+from src.engine.market_cap import build_market_cap_panel, listing_shares
+from src.engine.signal_cache import set_signal_cache
+
+
+@pytest.fixture(autouse=True)
+def _no_signal_cache():
+    previous = set_signal_cache(None)
+    yield
+    set_signal_cache(previous)
+
+
+DATES = pd.bdate_range("2024-01-01", periods=6)
+CODES = ["A", "B", "C"]
+
+
+def _close() -> np.ndarray:
+    # A는 꾸준히 오르고 B는 꾸준히 내려 3일째부터 A의 시가총액이 더 커진다
+    return np.array([
+        [100.0, 300.0, 50.0],
+        [150.0, 250.0, 50.0],
+        [200.0, 200.0, 50.0],
+        [250.0, 150.0, 50.0],
+        [300.0, 100.0, np.nan],
+        [350.0, 50.0, 50.0],
+    ])
+
+
+def _listing(stocks: list[int]) -> pd.DataFrame:
+    return pd.DataFrame({"Code": CODES, "Name": CODES, "Stocks": stocks})
+
+
+class TestListingShares:
+    def test_shares_from_stocks_or_cap(self):
+        listing = pd.DataFrame({
+            "Symbol": ["A", "B", "C"],
+            "Close": [10.0, 20.0, 0.0],
+            "MarketCap": [1_000.0, 4_000.0, 500.0],
+        })
+        shares, fixed = listing_shares(listing, ["B", "A", "C", "D"])
+        assert shares[:2].tolist() == [200.0, 100.0]
+        assert np.isnan(shares[2]) and np.isnan(shares[3])
+        assert fixed.tolist() == [4_000.0, 1_000.0, 500.0, 0.0]
+
+
+class TestMarketCapPanel:
+    def test_rank_follows_daily_price(self):
+        panel = build_market_cap_panel(_close(), DATES, CODES, [("2024-01-01", _listing([10, 10, 10]))])
+        assert panel.cap[0].tolist() == [1_000.0, 3_000.0, 500.0]
+        # 같은 시가총액(3일째 A, B)은 열 순서
+        assert panel.rank[:, :2].tolist() == [[1, 0], [1, 0], [0, 1], [0, 1], [0, 1], [0, 1]]
+        assert panel.rank[4, 2] == 2  # 가격이 없는 칸은 맨 뒤
+
+    def test_snapshot_as_of(self):
+        listings = [
+            ("2024-01-04", _listing([10, 10, 100])),  # 4일째부터 C의 주식수가 늘어난다
+            ("2024-01-01", _listing([10, 10, 10])),
+        ]
+        panel = build_market_cap_panel(_close(), DATES, CODES, listings)
+        assert panel.cap[2, 2] == 500.0
+        assert panel.cap[3, 2] == 5_000.0
+        assert panel.rank[3].tolist() == [1, 2, 0]
+
+    def test_first_snapshot_before_its_date(self):
+        panel = build_market_cap_panel(_close(), DATES, CODES, [("2024-02-01", _listing([10, 20, 30]))])
+        assert panel.cap[0].tolist() == [1_000.0, 6_000.0, 1_500.0]
+
+    def test_fixed_cap_without_shares(self):
+        listing = pd.DataFrame({"Code": ["A", "B"], "Marcap": [5.0, 9.0]})
+        panel = build_market_cap_panel(_close(), DATES, CODES, [("2024-01-01", listing)])
+        assert (panel.cap[:, :2] == [5.0, 9.0]).all()
+        assert (panel.rank == [1, 0, 2]).all()
+
+    def test_rank_matches_stable_sort(self):
+        rng = np.random.default_rng(4)
+        close = np.round(rng.uniform(1, 5, size=(30, 12)))
+        stocks = rng.integers(1, 4, size=12).tolist()
+        listing = pd.DataFrame({"Code": [str(j) for j in range(12)], "Stocks": stocks})
+        panel = build_market_cap_panel(close, pd.bdate_range("2024-01-01", periods=30),
+                                       [str(j) for j in range(12)], [("2024-01-01", listing)])
+        for t in range(30):
+            order = sorted(range(12), key=lambda j: close[t, j] * stocks[j], reverse=True)
+            assert panel.rank[t, order].tolist() == list(range(12))
+
+
+class TestBacktestMarketCap:
+    def _run(self, engine, **kwargs):
+        # 모든 종목이 매일 오르도록 만들어 매수 시그널이 함께 뜨게 한다
+        prices = {code: pd.DataFrame({"Close": np.arange(1.0, 7.0) * (j + 1) * 10}, index=DATES)
+                  for j, code in enumerate(CODES)}
+        params = BacktestParams(
+            initial_cash=100, start_date="2024-01-01", end_date="2024-01-08", fee_rate=0.0,
+            n_rise_days=1, m_fall_days=2, y_emergency_pct=50.0,
+            max_buy_amount=100, min_balance=0, engine=engine,
+        )
+        return run_backtest(params, prices, **kwargs)
+
+    @pytest.mark.parametrize("engine", ["pandas", "panel", "numba"])
+    def test_point_in_time_shares(self, engine):
+        # 첫 스냅샷은 A, 이후 스냅샷은 C가 가장 크다. 첫 매수일은 첫 스냅샷 기준이어야 한다
+        history = [
+            ("2024-01-01", _listing([1_000, 10, 1])),
+            ("2024-01-05", _listing([1, 10, 1_000])),
+        ]
+        result = self._run(engine, listing_df=history[-1][1], listing_history=history)
+        assert result.trades[0].code == "A"
+
+        result = self._run(engine, listing_df=history[-1][1])
+        assert result.trades[0].code == "C"
+
+    def test_engines_match(self):
+        history = [("2024-01-01", _listing([1_000, 10, 1])), ("2024-01-04", _listing([1, 10, 1_000]))]
+        results = [self._run(engine, listing_df=_listing([1, 1, 1]), listing_history=history)
+                   for engine in ("pandas", "panel", "numba")]
+        assert results[0].trades == results[1].trades == results[2].trades
+        assert dataclasses.asdict(results[0])["daily_snapshots"] == \
+            dataclasses.asdict(results[2])["daily_snapshots"]
@@ -0,0 +1,123 @@
+"""다중 시장 백테스트 테스트."""
+
+import dataclasses
+
+import numpy as np
+import pytest
+
+from src.data.fetcher import downcast_prices
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams, run_backtest, run_dual_market_backtest
+from src.engine.multi_market import MarketSleeve, run_multi_market_backtest
+
+
+@pytest.fixture(scope="module")
+def market():
+    provider = SyntheticProvider(seed=5, n_kospi=25, n_nasdaq=20, as_of="2021-06-30")
+    start, end = "2021-01-04", "2021-06-30"
+    listing = provider.stock_listing("KOSPI")
+    nasdaq_listing = provider.stock_listing("NASDAQ")
+    prices = {code: provider.data_reader(code, start, end) for code in listing["Code"]}
+    nasdaq_prices = {code: provider.data_reader(code, start, end) for code in nasdaq_listing["Symbol"]}
+    return {
+        "listing": listing,
+        "prices": {code: df for code, df in prices.items() if not df.empty},
+        "nasdaq_listing": nasdaq_listing,
+        "nasdaq_prices": {code: df for code, df in nasdaq_prices.items() if not df.empty},
+        "kospi_index": provider.data_reader("KS11", start, end),
+        "nasdaq_index": provider.data_reader("IXIC", start, end),
+        "rate": provider.data_reader("USD/KRW", start, end),
+    }
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=100_000_000,
+        start_date="2021-01-04",
+        end_date="2021-06-30",
+        fee_rate=0.015,
+        n_rise_days=2,
+        m_fall_days=2,
+        y_emergency_pct=3.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+        engine="panel",
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+def _sleeves(market, kospi_ratio: float = 50) -> list[MarketSleeve]:
+    return [
+        MarketSleeve("KOSPI", kospi_ratio, "KRW", market["prices"], market["listing"], market["kospi_index"]),
+        MarketSleeve("NASDAQ", 100 - kospi_ratio, "USD", market["nasdaq_prices"], market["nasdaq_listing"],
+                     market["nasdaq_index"]),
+    ]
+
+
+class TestRunMultiMarketBacktest:
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_two_sleeves_match_dual_market(self, market, max_workers):
+        params = _params(kospi_ratio=50)
+        expected = run_dual_market_backtest(
+            params, market["prices"], market["nasdaq_prices"], market["listing"], market["nasdaq_listing"],
+            market["kospi_index"], market["nasdaq_index"], market["rate"],
+        )
+        calls = []
+        result = run_multi_market_backtest(
+            params, _sleeves(market), {"USD": market["rate"]}, max_workers=max_workers,
+            progress_callback=lambda cur, tot: calls.append((cur, tot)),
+        )
+
+        assert expected.total_trades > 0
+        assert result.trades == expected.trades
+        assert result.daily_snapshots == expected.daily_snapshots
+        assert result.market_snapshots["KOSPI"] == expected.kospi_snapshots
+        assert result.market_snapshots["NASDAQ"] == expected.nasdaq_snapshots
+        for name in ("final_return_pct", "mdd_pct", "win_rate_pct", "total_fee", "initial_exchange_rate"):
+            assert getattr(result, name) == getattr(expected, name)
+        assert calls == [(1, 2), (2, 2)]
+
+    def test_single_base_currency_sleeve_matches_run_backtest(self, market):
+        params = _params()
+        expected = run_backtest(params, market["prices"], market["listing"])
+        result = run_multi_market_backtest(
+            params, [MarketSleeve("KOSPI", 100, "KRW", market["prices"], market["listing"])], max_workers=1,
+        )
+        assert result.trades == expected.trades
+        assert result.daily_snapshots == expected.daily_snapshots
+        assert (result.final_return_pct, result.total_fee) == (expected.final_return_pct, expected.total_fee)
+
+    def test_workers_see_the_same_input(self, market):
+        # float32 종가도 워커 수와 관계없이 같은 패널 입력으로 실행된다
+        sleeves = [dataclasses.replace(sleeve, price_data={code: downcast_prices(df)
+                                                           for code, df in sleeve.price_data.items()})
+                   for sleeve in _sleeves(market)]
+        params = _params(engine="pandas", y_emergency_pct=1.0)
+        results = [run_multi_market_backtest(params, sleeves, {"USD": market["rate"]}, max_workers=workers)
+                   for workers in (1, 2)]
+        assert results[0].trades == results[1].trades
+        assert results[0].daily_snapshots == results[1].daily_snapshots
+
+    def test_unallocated_capital_stays_as_cash(self, market):
+        params = _params()
+        expected = run_backtest(dataclasses.replace(params, initial_cash=50_000_000),
+                                market["prices"], market["listing"])
+        result = run_multi_market_backtest(
+            params, [MarketSleeve("KOSPI", 50, "KRW", market["prices"], market["listing"])], max_workers=1,
+        )
+        assert result.trades == expected.trades
+        np.testing.assert_array_equal(result.daily_snapshots.cash, expected.daily_snapshots.cash + 50_000_000)
+        np.testing.assert_allclose(result.daily_snapshots.total_value,
+                                   expected.daily_snapshots.total_value + 50_000_000, rtol=1e-12)
+        assert result.final_return_pct == pytest.approx(expected.final_return_pct / 2, abs=0.01)
+
+    def test_invalid_sleeves(self, market):
+        sleeves = _sleeves(market)
+        with pytest.raises(ValueError, match="USD"):
+            run_multi_market_backtest(_params(), sleeves)
+        with pytest.raises(ValueError, match="Duplicate"):
+            run_multi_market_backtest(_params(), [sleeves[0], dataclasses.replace(sleeves[0], ratio=10)])
+        with pytest.raises(ValueError, match="more than 100"):
+            run_multi_market_backtest(_params(), [sleeves[0], dataclasses.replace(sleeves[1], ratio=60)],
+                                      {"USD": market["rate"]})
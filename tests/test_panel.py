@@ -0,0 +1,90 @@
+"""메모리 매핑 가격 패널 테스트."""
+
+import numpy as np
+import pandas as pd
+
+from src.data.panel import PricePanel, build_panel, load_panel, open_panel, save_panel
+from src.engine.backtest import BacktestParams, run_backtest
+
+
+def _make_price_df(prices: list[float], dates: pd.DatetimeIndex) -> pd.DataFrame:
+    return pd.DataFrame({"Close": prices}, index=dates)
+
+
+def _sample_price_data() -> dict[str, pd.DataFrame]:
+    dates = pd.bdate_range("2024-01-01", periods=10)
+    return {
+        "A": _make_price_df([100, 101, 102, 103, 104, 103, 102, 101, 100, 99], dates),
+        "B": _make_price_df([50, 51, 52, 53, 54, 55], dates[2:8]),
+        "C": _make_price_df([10, 11, 12, 13, 14], dates[[0, 1, 2, 5, 6]]),  # 거래정지 구간
+    }
+
+
+class TestPricePanel:
+    def test_build_aligns_on_union_calendar(self):
+        panel = build_panel(_sample_price_data())
+        assert panel.codes == ["A", "B", "C"]
+        assert panel.close.shape == (10, 3)
+        assert np.isnan(panel.close[0, 1])
+        assert panel.close[2, 1] == 50
+
+    def test_save_and_open_is_memory_mapped(self, tmp_path):
+        save_panel(build_panel(_sample_price_data(), "2024-01-01", "2024-01-12"), tmp_path)
+        panel = open_panel(tmp_path)
+        assert isinstance(panel.close, np.memmap)
+        assert panel.close.flags["F_CONTIGUOUS"]
+        assert load_panel(tmp_path, "2024-01-01", "2024-01-12") is not None
+        assert load_panel(tmp_path, "2024-01-01", "2024-01-31") is None
+
+    def test_to_price_data_is_zero_copy_for_contiguous_series(self, tmp_path):
+        original = _sample_price_data()
+        save_panel(build_panel(original), tmp_path)
+        panel = open_panel(tmp_path)
+        price_data = panel.to_price_data()
+
+        assert np.shares_memory(price_data["A"]["Close"].to_numpy(), panel.close)
+        assert np.shares_memory(price_data["B"]["Close"].to_numpy(), panel.close)
+        for code, df in original.items():
+            np.testing.assert_array_equal(price_data[code]["Close"].to_numpy(), df["Close"].to_numpy())
+            assert list(price_data[code].index) == list(df.index)
+
+    def test_run_backtest_accepts_panel(self, tmp_path):
+        original = _sample_price_data()
+        save_panel(build_panel(original), tmp_path)
+        params = BacktestParams(
+            initial_cash=10_000_000, start_date="2024-01-01", end_date="2024-01-12",
+            fee_rate=0.015, n_rise_days=3, m_fall_days=3, y_emergency_pct=5.0,
+            max_buy_amount=5_000_000, min_balance=1_000_000,
+        )
+        from_dict = run_backtest(params, original)
+        from_panel = run_backtest(params, open_panel(tmp_path))
+        assert from_panel.trades == from_dict.trades
+        assert from_panel.daily_snapshots == from_dict.daily_snapshots
+
+    def test_panel_engines_read_the_matrix_directly(self, tmp_path, monkeypatch):
+        original = _sample_price_data()
+        panel = build_panel(original)
+        # 데이터가 없는 열은 to_price_data와 같이 빠져야 한다
+        close = np.column_stack([panel.close, np.full(len(panel.dates), np.nan)])
+        save_panel(PricePanel(panel.dates, panel.codes + ["D"], close), tmp_path)
+        runs = [
+            BacktestParams(
+                initial_cash=10_000_000, start_date="2024-01-01", end_date="2024-01-12",
+                fee_rate=0.015, n_rise_days=2, m_fall_days=2, y_emergency_pct=1.0,
+                max_buy_amount=3_000_000, min_balance=1_000_000,
+                sort_method=sort_method, engine=engine,
+            )
+            for engine in ("panel", "numba")
+            for sort_method in ("market_cap", "return_rate")
+        ]
+        expected = [run_backtest(params, original) for params in runs]
+
+        def unpack(self):
+            raise AssertionError("패널 엔진은 PricePanel을 DataFrame으로 풀지 않아야 한다")
+
+        monkeypatch.setattr(PricePanel, "to_price_data", unpack)
+        for params, result in zip(runs, expected):
+            from_panel = run_backtest(params, open_panel(tmp_path))
+            assert len(from_panel.trades) > 0
+            assert from_panel.trades == result.trades
+            assert from_panel.daily_snapshots == result.daily_snapshots
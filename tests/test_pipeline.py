@@ -0,0 +1,162 @@
+"""수집 → 시그널 스트리밍 파이프라인 테스트."""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import cache, fetcher, providers
+from src.data.providers import use_provider
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams, run_backtest, run_dual_market_backtest
+from src.engine.pipeline import PackedMarket, stream_market
+from tests.test_fetcher import StubReader
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / ".cache")
+    monkeypatch.setattr(fetcher, "RETRY_BASE_DELAY", 0.0)
+
+
+@pytest.fixture
+def provider():
+    with use_provider(SyntheticProvider(seed=11, n_kospi=40, n_nasdaq=25, as_of="2022-12-30")) as p:
+        yield p
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=100_000_000,
+        start_date="2022-01-03",
+        end_date="2022-09-30",
+        fee_rate=0.015,
+        n_rise_days=3,
+        m_fall_days=2,
+        y_emergency_pct=4.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+def _stream(codes, params, **kwargs) -> PackedMarket:
+    return stream_market(codes, params.start_date, params.end_date,
+                         params.n_rise_days, params.m_fall_days, params.y_emergency_pct, **kwargs)
+
+
+class TestStreamMarket:
+    def test_matches_batch_backtest(self, provider):
+        params = _params()
+        listing = fetcher.fetch_stock_listing("KOSPI")
+        codes = listing["Code"].tolist()
+
+        batch = fetcher.fetch_all_prices(codes, params.start_date, params.end_date)
+        packed = _stream(codes, params, max_workers=4)
+
+        assert list(packed.price_data) == list(batch)
+        expected = run_backtest(params, batch, listing)
+        actual = run_backtest(params, packed, listing)
+        assert actual.trades == expected.trades
+        assert actual.daily_snapshots == expected.daily_snapshots
+
+    def test_mismatched_params_recompute_signals(self, provider):
+        params = _params()
+        codes = fetcher.fetch_stock_listing("KOSPI")["Code"].tolist()
+        packed = _stream(codes, params)
+
+        other = _params(n_rise_days=2, m_fall_days=3)
+        expected = run_backtest(other, fetcher.fetch_all_prices(codes, other.start_date, other.end_date))
+        assert run_backtest(other, packed).trades == expected.trades
+
+    def test_dual_market(self, provider):
+        params = _params(kospi_ratio=50)
+        kospi_listing = fetcher.fetch_stock_listing("KOSPI")
+        nasdaq_listing = fetcher.fetch_stock_listing("NASDAQ")
+        kospi_codes = kospi_listing["Code"].tolist()
+        nasdaq_codes = nasdaq_listing["Symbol"].tolist()
+        benchmarks = (
+            fetcher.fetch_kospi_index(params.start_date, params.end_date),
+            fetcher.fetch_nasdaq_index(params.start_date, params.end_date),
+            fetcher.fetch_exchange_rate(params.start_date, params.end_date),
+        )
+
+        expected = run_dual_market_backtest(
+            params,
+            fetcher.fetch_all_prices(kospi_codes, params.start_date, params.end_date),
+            fetcher.fetch_all_prices(nasdaq_codes, params.start_date, params.end_date),
+            kospi_listing, nasdaq_listing, *benchmarks,
+        )
+        actual = run_dual_market_backtest(
+            params, _stream(kospi_codes, params), _stream(nasdaq_codes, params),
+            kospi_listing, nasdaq_listing, *benchmarks,
+        )
+        assert actual.daily_snapshots == expected.daily_snapshots
+        assert actual.trades == expected.trades
+
+    def test_stats_and_progress(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(fail_codes={"BAD": 99}))
+        stats = fetcher.FetchStats()
+        calls = []
+        packed = _stream(["A", "BAD", "B"], _params(start_date="2024-01-01", end_date="2024-02-29"),
+                         max_workers=2, stats=stats,
+                         progress_callback=lambda cur, tot: calls.append((cur, tot)))
+
+        assert list(packed.price_data) == ["A", "B"]
+        assert stats.loaded == 2 and stats.failed == ["BAD"]
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+
+
+class TestPackedMarket:
+    def test_packed_close_does_not_share_raw_memory(self):
+        dates = pd.bdate_range("2024-01-01", periods=50)
+        raw = pd.DataFrame(np.random.default_rng(0).random((50, 4)) + 1,
+                           columns=["Open", "High", "Low", "Close"], index=dates)
+        packed = PackedMarket(n_rise=3, m_fall=2, y_pct=5.0)
+
+        assert packed.add("A", raw)
+        close = packed.price_data["A"]
+        assert list(close.columns) == ["Close"]
+        assert not np.shares_memory(close["Close"].to_numpy(), raw.to_numpy())
+        assert packed.signals["A"]["buy"].dtype == bool
+        assert packed.nbytes < raw.memory_usage(index=True).sum()
+
+    def test_skips_frames_without_close(self):
+        packed = PackedMarket(n_rise=3, m_fall=2, y_pct=5.0)
+        assert not packed.add("A", pd.DataFrame({"Volume": [1, 2]}))
+        assert not packed.add("B", pd.DataFrame())
+        assert packed.price_data == {}
+
+
+class TestIterPrices:
+    def test_in_flight_requests_are_bounded(self, monkeypatch):
+        """소비자가 멈춰 있으면 max_workers * 2개 이상 미리 받지 않는다."""
+        stub = StubReader()
+        monkeypatch.setattr(providers.fdr, "DataReader", stub)
+        codes = [f"{i:06d}" for i in range(40)]
+
+        stream = fetcher.iter_prices(codes, "2024-01-01", "2024-01-31", max_workers=2)
+        next(stream)
+        time.sleep(0.1)
+        assert len(stub.calls) <= 2 * 2 + 1
+        rest = list(stream)
+        assert len(rest) == len(codes) - 1
+
+    def test_consumer_runs_while_workers_fetch(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(delay=0.02))
+        codes = [f"{i:06d}" for i in range(8)]
+        fetch_threads: set[int] = set()
+        consumer = threading.get_ident()
+
+        started = time.perf_counter()
+        for _code, _df in fetcher.iter_prices(codes, "2024-01-01", "2024-01-31", max_workers=4):
+            fetch_threads.add(threading.get_ident())
+            time.sleep(0.02)  # 시그널 계산 흉내
+        elapsed = time.perf_counter() - started
+
+        assert fetch_threads == {consumer}
+        # 순차라면 수집 8 * 0.02 + 계산 8 * 0.02 = 0.32s
+        assert elapsed < 0.3
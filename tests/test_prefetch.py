@@ -0,0 +1,160 @@
+"""캐시 사전 수집 테스트 - FinanceDataReader 대신 로컬 스텁 사용."""
+
+import pandas as pd
+import pytest
+
+from src.data import cache, cli, fetcher, prefetch, providers
+from tests.test_fetcher import StubReader
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / ".cache")
+    monkeypatch.setattr(fetcher, "RETRY_BASE_DELAY", 0.0)
+
+
+class MutableListing:
+    """호출할 때마다 현재 codes를 돌려주는 fdr.StockListing 스텁."""
+
+    def __init__(self, codes: list[str]):
+        self.codes = list(codes)
+
+    def __call__(self, market: str) -> pd.DataFrame:
+        return pd.DataFrame({"Code": self.codes, "Name": self.codes})
+
+
+class InterruptingReader(StubReader):
+    """종목 요청 limit번 이후 KeyboardInterrupt를 던져 강제 종료를 흉내 낸다."""
+
+    def __init__(self, limit: int):
+        super().__init__()
+        self.limit = limit
+
+    def __call__(self, code: str, start: str, end: str) -> pd.DataFrame:
+        if code[:1].isdigit() and sum(c[:1].isdigit() for c in self.calls) >= self.limit:
+            raise KeyboardInterrupt
+        return super().__call__(code, start, end)
+
+
+def _stock_calls(reader: StubReader) -> list[str]:
+    return [code for code in reader.calls if code[:1].isdigit()]
+
+
+CODES = [f"{i:06d}" for i in range(10)]
+
+
+class TestPrefetchMarket:
+    def test_fetches_all_codes_and_index(self, monkeypatch):
+        reader = StubReader()
+        monkeypatch.setattr(providers.fdr, "StockListing", MutableListing(CODES))
+        monkeypatch.setattr(providers.fdr, "DataReader", reader)
+
+        stats = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31",
+                                         max_workers=2, checkpoint_every=4)
+
+        assert stats.fetched == 10 and stats.skipped == 0 and not stats.failed
+        assert sorted(_stock_calls(reader)) == CODES
+        assert "KS11" in reader.calls
+        assert stats.nbytes > 0 and stats.codes_per_sec > 0 and stats.mb_per_sec > 0
+        assert all(cache.get_cached_range(code) is not None for code in CODES)
+        assert sorted(prefetch.load_checkpoint("KOSPI").done) == CODES
+
+    def test_resumes_after_interruption(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", MutableListing(CODES))
+        monkeypatch.setattr(providers.fdr, "DataReader", InterruptingReader(limit=6))
+        with pytest.raises(KeyboardInterrupt):
+            prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31",
+                                     max_workers=1, checkpoint_every=3)
+        assert prefetch.load_checkpoint("KOSPI").done == CODES[:6]
+
+        reader = StubReader()
+        monkeypatch.setattr(providers.fdr, "DataReader", reader)
+        stats = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31",
+                                         max_workers=1, checkpoint_every=3)
+
+        assert _stock_calls(reader) == CODES[6:]
+        assert stats.skipped == 6 and stats.fetched == 4
+
+    def test_only_new_listings_are_fetched(self, monkeypatch):
+        listing = MutableListing(CODES)
+        monkeypatch.setattr(providers.fdr, "StockListing", listing)
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1)
+
+        listing.codes = CODES[1:] + ["NEW001", "NEW002"]
+        reader = StubReader()
+        monkeypatch.setattr(providers.fdr, "DataReader", reader)
+        stats = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1)
+
+        assert [c for c in reader.calls if c.startswith("NEW")] == ["NEW001", "NEW002"]
+        assert not _stock_calls(reader)
+        assert (stats.added, stats.removed, stats.fetched, stats.skipped) == (2, 1, 2, 9)
+
+    def test_failed_codes_are_retried_after_expiry(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", MutableListing(CODES[:3]))
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader(fail_codes={"000001": 3}))
+        stats = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1)
+        assert stats.failed == ["000001"]
+        assert prefetch.load_checkpoint("KOSPI").failed == ["000001"]
+
+        reader = StubReader()
+        monkeypatch.setattr(providers.fdr, "DataReader", reader)
+        stats = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1)
+        assert not _stock_calls(reader)
+        assert stats.blocked == ["000001"]
+
+        cache.negative_cache().entries["000001"].expires_at = 0
+        stats = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1)
+        assert _stock_calls(reader) == ["000001"]
+        assert not stats.failed and not stats.blocked
+
+    def test_new_range_starts_over(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", MutableListing(CODES[:3]))
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1)
+
+        reader = StubReader()
+        monkeypatch.setattr(providers.fdr, "DataReader", reader)
+        stats = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-02-29", max_workers=1)
+
+        assert stats.skipped == 0 and stats.fetched == 3
+        # 캐시된 1월은 다시 받지 않고 2월만 받는다
+        assert all(start > "2024-01-31" for code, start, _ in reader.ranges if code in CODES)
+
+    def test_nbytes_counts_only_newly_fetched_data(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", MutableListing(CODES[:3]))
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        first = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1)
+        again = prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1, restart=True)
+
+        assert first.nbytes > 0
+        assert again.fetched == 3 and again.nbytes == 0
+
+    def test_one_limiter_per_run(self, monkeypatch):
+        monkeypatch.setattr(providers.fdr, "StockListing", MutableListing(CODES[:6]))
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+        limiters = []
+        original = fetcher.iter_prices
+
+        def spy(*args, **kwargs):
+            limiters.append(kwargs["limiter"])
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(fetcher, "iter_prices", spy)
+        prefetch.prefetch_market("KOSPI", "2024-01-01", "2024-01-31", max_workers=1,
+                                 rate_limit=1000, checkpoint_every=2)
+        assert len(limiters) == 3
+        assert limiters[0] is not None and all(limiter is limiters[0] for limiter in limiters)
+
+
+class TestPrefetchCli:
+    def test_prints_throughput(self, monkeypatch, capsys):
+        monkeypatch.setattr(providers.fdr, "StockListing", MutableListing(CODES[:3]))
+        monkeypatch.setattr(providers.fdr, "DataReader", StubReader())
+
+        code = cli.main(["prefetch", "--market", "KOSPI", "--start", "2024-01-01",
+                         "--end", "2024-01-31", "--rate-limit", "0"])
+
+        out = capsys.readouterr().out
+        assert code == 0
+        assert "KOSPI: 3 fetched" in out and "codes/s" in out and "MB/s" in out
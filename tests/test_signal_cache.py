@@ -0,0 +1,192 @@
+"""시그널 메모이제이션 테스트."""
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.synthetic import SyntheticProvider
+from src.engine import backtest
+from src.engine.backtest import BacktestParams, _precompute_signals, run_backtest
+from src.engine.pipeline import PackedMarket
+from src.engine.signal_cache import (
+    SignalArrays,
+    SignalCache,
+    fingerprint_prices,
+    get_signal_cache,
+    set_signal_cache,
+)
+
+
+@pytest.fixture(scope="module")
+def market():
+    provider = SyntheticProvider(seed=9, n_kospi=40, as_of="2021-12-30", halt_prob=0.05)
+    start, end = "2021-01-04", "2021-12-30"
+    listing = provider.stock_listing("KOSPI")
+    prices = {code: provider.data_reader(code, start, end) for code in listing["Code"]}
+    return {"listing": listing, "prices": {code: df for code, df in prices.items() if not df.empty}}
+
+
+@pytest.fixture
+def signal_cache():
+    signal_cache = SignalCache()
+    previous = set_signal_cache(signal_cache)
+    yield signal_cache
+    set_signal_cache(previous)
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=300_000_000,
+        start_date="2021-01-04",
+        end_date="2021-12-30",
+        fee_rate=0.015,
+        n_rise_days=2,
+        m_fall_days=2,
+        y_emergency_pct=3.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+def _run_uncached(params, market):
+    previous = set_signal_cache(None)
+    try:
+        return run_backtest(params, market["prices"], market["listing"])
+    finally:
+        set_signal_cache(previous)
+
+
+class TestSignalArrays:
+    def test_series_round_trip(self, market):
+        signals = _precompute_signals(market["prices"], 2, 2, 3.0)
+        restored = SignalArrays.from_series(signals).to_series(market["prices"])
+
+        assert list(restored) == list(signals)
+        for code, sig in signals.items():
+            for key, series in sig.items():
+                pd.testing.assert_series_equal(restored[code][key], series, check_names=False)
+
+    def test_panel_round_trip(self):
+        rng = np.random.default_rng(0)
+        valid = rng.random((30, 5)) > 0.2
+        dense = {key: (rng.random((30, 5)) > 0.5) & valid
+                 for key in ("buy", "sell_fall", "sell_emergency")}
+
+        arrays = SignalArrays.from_panel(list("abcde"), valid, dense)
+        assert arrays.offsets[-1] == valid.sum()
+        restored = arrays.to_panel(valid)
+        for key, values in dense.items():
+            np.testing.assert_array_equal(restored[key], values)
+
+
+class TestFingerprint:
+    def test_changes_with_prices_and_order(self, market):
+        prices = market["prices"]
+        base = fingerprint_prices(prices)
+        assert fingerprint_prices(dict(prices)) == base
+
+        reordered = dict(reversed(list(prices.items())))
+        assert fingerprint_prices(reordered) != base
+
+        code = next(iter(prices))
+        bumped = dict(prices)
+        bumped[code] = prices[code].copy()
+        bumped[code].iloc[-1, bumped[code].columns.get_loc("Close")] += 1
+        assert fingerprint_prices(bumped) != base
+
+
+class TestSignalCache:
+    def test_lru_evicts_oldest(self):
+        signal_cache = SignalCache(max_entries=2)
+        arrays = SignalArrays.from_series({})
+        for key in ("a", "b", "c"):
+            signal_cache.put(key, arrays)
+
+        assert signal_cache.get("a") is None
+        assert signal_cache.get("c") is arrays
+        assert (signal_cache.stats.hits, signal_cache.stats.misses) == (1, 1)
+
+    def test_disk_tier_survives_new_process(self, market, tmp_path):
+        signals = _precompute_signals(market["prices"], 2, 2, 3.0)
+        key = SignalCache.key(market["prices"], 2, 2, 3.0, "series")
+        SignalCache(disk_dir=tmp_path).put(key, SignalArrays.from_series(signals))
+
+        fresh = SignalCache(disk_dir=tmp_path)
+        loaded = fresh.get(key)
+        assert fresh.stats.disk_hits == 1
+        assert fresh.get(key) is loaded
+        assert fresh.stats.hits == 1
+        restored = loaded.to_series(market["prices"])
+        code = next(iter(signals))
+        pd.testing.assert_series_equal(restored[code]["buy"], signals[code]["buy"], check_names=False)
+
+    def test_disk_tier_prunes_oldest_files(self, tmp_path):
+        signal_cache = SignalCache(disk_dir=tmp_path, max_disk_entries=2)
+        in_flight = tmp_path / "x.123.456.tmp.npz"  # 다른 프로세스가 쓰는 중인 파일
+        in_flight.write_bytes(b"")
+        for key in ("a", "b", "c"):
+            signal_cache.put(key, SignalArrays.from_series({}))
+        assert sorted(p.name for p in tmp_path.glob("*.npz")) == ["b.npz", "c.npz", in_flight.name]
+
+    def test_off_by_default(self):
+        assert get_signal_cache() is None
+
+    def test_unreadable_file_is_a_miss(self, tmp_path):
+        (tmp_path / "broken.npz").write_bytes(b"not a zip")
+        signal_cache = SignalCache(disk_dir=tmp_path)
+        assert signal_cache.get("broken") is None
+        assert signal_cache.stats.misses == 1
+
+
+class TestBacktestUsesCache:
+    @pytest.mark.parametrize("engine", ["pandas", "panel"])
+    def test_second_run_hits_and_matches(self, market, signal_cache, engine):
+        params = _params(engine=engine)
+        tuned = dataclasses.replace(params, max_buy_amount=3_000_000)
+
+        first = run_backtest(params, market["prices"], market["listing"])
+        second = run_backtest(tuned, market["prices"], market["listing"])
+
+        assert (signal_cache.stats.misses, signal_cache.stats.hits) == (1, 1)
+        assert first.trades == _run_uncached(params, market).trades
+        expected = _run_uncached(tuned, market)
+        assert second.trades == expected.trades
+        assert second.daily_snapshots == expected.daily_snapshots
+
+    def test_engines_keep_separate_entries(self, market, signal_cache):
+        run_backtest(_params(engine="pandas"), market["prices"], market["listing"])
+        run_backtest(_params(engine="panel"), market["prices"], market["listing"])
+        result = run_backtest(_params(engine="numba"), market["prices"], market["listing"])
+
+        assert (signal_cache.stats.misses, signal_cache.stats.hits) == (2, 1)
+        assert result.trades == _run_uncached(_params(engine="numba"), market).trades
+
+    def test_signal_params_are_part_of_key(self, market, signal_cache):
+        run_backtest(_params(), market["prices"], market["listing"])
+        run_backtest(_params(n_rise_days=3), market["prices"], market["listing"])
+        run_backtest(_params(y_emergency_pct=5.0), market["prices"], market["listing"])
+        assert (signal_cache.stats.misses, signal_cache.stats.hits) == (3, 0)
+
+    def test_matching_packed_market_skips_cache(self, market, signal_cache, monkeypatch):
+        packed = PackedMarket(n_rise=2, m_fall=2, y_pct=3.0)
+        for code, df in market["prices"].items():
+            packed.add(code, df)
+        monkeypatch.setattr(backtest, "_precompute_signals", None)
+
+        run_backtest(_params(), packed, market["listing"])
+        assert signal_cache.stats.lookups == 0
+
+    def test_packed_market_without_signals_uses_cache(self, market, signal_cache):
+        packed = PackedMarket(n_rise=2, m_fall=2, y_pct=3.0, with_signals=False)
+        for code, df in market["prices"].items():
+            packed.add(code, df)
+        assert packed.signals == {}
+
+        result = run_backtest(_params(engine="panel"), packed, market["listing"])
+        run_backtest(_params(engine="panel"), packed, market["listing"])
+        assert (signal_cache.stats.misses, signal_cache.stats.hits) == (1, 1)
+        assert result.trades == _run_uncached(_params(engine="panel"), market).trades
@@ -1,12 +1,17 @@
 """시그널 감지 로직 테스트 - 합성 데이터 기반."""
 
+import numpy as np
 import pandas as pd
 import pytest
 
 from src.engine.signals import (
+    StreakState,
+    compute_signals,
     detect_consecutive_falls,
     detect_consecutive_rises,
     detect_emergency_sell,
+    panel_signals,
+    streak_lengths,
 )
 
 
@@ -78,3 +83,72 @@ class TestEmergencySell:
         close = _make_series([100, 95])
         result = detect_emergency_sell(close, y_pct=5.0)
         assert result.iloc[1] == True
+
+
+def _random_panel(seed: int = 0, n_days: int = 300, n_codes: int = 40):
+    """가격 패턴이 다양한 패널 - 거래정지(빈 날), 상장일, NaN 종가, 보합, 0원 포함."""
+    rng = np.random.default_rng(seed)
+    steps = rng.choice([-2.0, -1.0, 0.0, 1.0, 2.0], size=(n_days, n_codes), p=[0.2, 0.2, 0.1, 0.25, 0.25])
+    close = 100 + np.cumsum(steps, axis=0)
+    close[rng.random(close.shape) < 0.01] = np.nan
+    close[10:12, 0] = 0.0
+    valid = rng.random(close.shape) >= 0.05
+    for j in range(n_codes):
+        valid[:rng.integers(0, n_days // 3), j] = False
+    valid[:, 1] = False  # 데이터가 전혀 없는 종목
+    dates = pd.bdate_range("2020-01-01", periods=n_days)
+    return dates, close, valid
+
+
+def _series_signals(dates, close, valid, j, n, m, y):
+    """종목 j의 데이터 행만 모아 기준 구현으로 계산한 시그널을 달력 위로 되돌린다."""
+    rows = np.flatnonzero(valid[:, j])
+    series = pd.Series(close[rows, j], index=dates[rows])
+    result = {}
+    for key, sig in compute_signals(series, n, m, y).items():
+        full = np.zeros(len(dates), dtype=bool)
+        full[rows] = sig.to_numpy(dtype=bool)
+        result[key] = full
+    return result
+
+
+class TestPanelSignals:
+    @pytest.mark.parametrize("n,m,y", [(1, 1, 1.0), (3, 2, 2.0), (5, 4, 0.5)])
+    def test_matches_per_series_reference(self, n, m, y):
+        dates, close, valid = _random_panel()
+        panel = panel_signals(close, n, m, y, valid=valid)
+        for j in range(close.shape[1]):
+            expected = _series_signals(dates, close, valid, j, n, m, y)
+            for key in ("buy", "sell_fall", "sell_emergency"):
+                np.testing.assert_array_equal(panel[key][:, j], expected[key], err_msg=f"{key} col {j}")
+
+    def test_streak_lengths(self):
+        close = np.array([[1.0], [2.0], [3.0], [3.0], [2.0], [1.0], [0.5]])
+        up, down = streak_lengths(close)
+        assert up[:, 0].tolist() == [0, 1, 2, 0, 0, 0, 0]
+        assert down[:, 0].tolist() == [0, 0, 0, 0, 1, 2, 3]
+
+    def test_missing_days_are_skipped(self):
+        close = np.array([[1.0], [9.0], [2.0], [3.0]])
+        valid = np.array([[True], [False], [True], [True]])
+        up, _ = streak_lengths(close, valid)
+        assert up[:, 0].tolist() == [0, 0, 1, 2]
+
+    def test_state_continues_across_chunks(self):
+        _, close, valid = _random_panel(seed=3)
+        full = panel_signals(close, 3, 2, 2.0, valid=valid)
+
+        state = StreakState.empty(close.shape[1])
+        head = panel_signals(close[:150], 3, 2, 2.0, valid=valid[:150], state=state)
+        tail = panel_signals(close[150:], 3, 2, 2.0, valid=valid[150:], state=state)
+        for key in full:
+            np.testing.assert_array_equal(np.vstack([head[key], tail[key]]), full[key])
+
+    def test_all_rows_valid_by_default(self):
+        dates, close, _ = _random_panel(seed=1)
+        close = np.nan_to_num(close, nan=50.0)
+        panel = panel_signals(close, 3, 3, 1.5)
+        series = pd.Series(close[:, 4], index=dates)
+        np.testing.assert_array_equal(panel["buy"][:, 4], detect_consecutive_rises(series, 3).to_numpy())
+        np.testing.assert_array_equal(panel["sell_fall"][:, 4], detect_consecutive_falls(series, 3).to_numpy())
+        np.testing.assert_array_equal(panel["sell_emergency"][:, 4], detect_emergency_sell(series, 1.5).to_numpy())
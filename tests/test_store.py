@@ -0,0 +1,79 @@
+"""시장 단위 통합 가격 저장소 테스트."""
+
+import pandas as pd
+import pytest
+
+from src.data import cache, store
+
+
+def _make_price_df(start: str, end: str, base: float = 100.0) -> pd.DataFrame:
+    dates = pd.bdate_range(start, end, name="Date")
+    n = len(dates)
+    return pd.DataFrame({
+        "Close": [base + i for i in range(n)],
+        "Volume": [1000 + i for i in range(n)],
+    }, index=dates)
+
+
+class TestPriceStore:
+    def test_round_trip(self, tmp_path):
+        price_data = {
+            "005930": _make_price_df("2022-12-20", "2023-01-10", 100),
+            "000660": _make_price_df("2023-01-02", "2023-01-10", 200),
+        }
+        store.write_market("KOSPI", price_data, root=tmp_path)
+
+        assert (tmp_path / "market=KOSPI" / "year=2022").is_dir()
+        assert (tmp_path / "market=KOSPI" / "year=2023").is_dir()
+
+        loaded = store.read_market("KOSPI", codes=["005930", "000660"], root=tmp_path)
+        assert list(loaded.keys()) == ["005930", "000660"]
+        for code, df in price_data.items():
+            pd.testing.assert_frame_equal(loaded[code], df, check_freq=False)
+
+    def test_date_and_column_filter(self, tmp_path):
+        store.write_market("KOSPI", {"A": _make_price_df("2022-12-01", "2023-02-28")}, root=tmp_path)
+        loaded = store.read_market("KOSPI", start="2023-01-01", end="2023-01-31",
+                                   columns=["Close"], root=tmp_path)
+        df = loaded["A"]
+        assert list(df.columns) == ["Close"]
+        assert df.index.min() >= pd.Timestamp("2023-01-01")
+        assert df.index.max() <= pd.Timestamp("2023-01-31")
+
+    def test_write_merges_with_existing(self, tmp_path):
+        store.write_market("KOSPI", {"A": _make_price_df("2023-01-02", "2023-01-31")}, root=tmp_path)
+        store.write_market("KOSPI", {"B": _make_price_df("2023-01-02", "2023-01-31")}, root=tmp_path)
+        loaded = store.read_market("KOSPI", root=tmp_path)
+        assert sorted(loaded.keys()) == ["A", "B"]
+
+    def test_markets_are_separate(self, tmp_path):
+        store.write_market("KOSPI", {"A": _make_price_df("2023-01-02", "2023-01-06")}, root=tmp_path)
+        store.write_market("NASDAQ", {"AAPL": _make_price_df("2023-01-02", "2023-01-06")}, root=tmp_path)
+        assert list(store.read_market("NASDAQ", root=tmp_path).keys()) == ["AAPL"]
+
+    def test_missing_store_returns_empty(self, tmp_path):
+        assert store.read_market("KOSPI", root=tmp_path / "missing") == {}
+
+
+class TestMigrateCache:
+    def test_migrates_current_and_legacy_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / ".cache")
+        cache.save_to_cache("005930", "2023-01-02", "2023-01-31", _make_price_df("2023-01-02", "2023-01-31"))
+        legacy = _make_price_df("2023-02-01", "2023-02-28")
+        legacy.to_parquet(cache.CACHE_DIR / "005930_2023-02-01_2023-02-28.parquet")
+        _make_price_df("2023-01-02", "2023-01-31").to_parquet(cache.CACHE_DIR / "AAPL.parquet")
+        _make_price_df("2023-01-02", "2023-01-31").to_parquet(cache.CACHE_DIR / "KS11.parquet")
+
+        counts = store.migrate_cache(root=tmp_path / "store")
+
+        assert counts == {"KOSPI": 1, "NASDAQ": 1}
+        kospi = store.read_market("KOSPI", root=tmp_path / "store")
+        assert kospi["005930"].index.min() == pd.Timestamp("2023-01-02")
+        assert kospi["005930"].index.max() == pd.Timestamp("2023-02-28")
+
+    @pytest.mark.parametrize("compression", ["zstd", "snappy", "none"])
+    def test_compression_codecs(self, tmp_path, compression):
+        data = {"A": _make_price_df("2023-01-02", "2023-03-31")}
+        store.write_market("KOSPI", data, root=tmp_path, compression=compression, row_group_size=16)
+        pd.testing.assert_frame_equal(store.read_market("KOSPI", root=tmp_path)["A"], data["A"],
+                                      check_freq=False)
@@ -0,0 +1,114 @@
+"""거래일 단위 백테스트 제너레이터 테스트."""
+
+import pytest
+
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import (
+    BacktestParams,
+    MaxDrawdownStop,
+    MinEquityStop,
+    iter_backtest,
+    run_backtest,
+)
+from src.engine.signal_cache import set_signal_cache
+
+
+@pytest.fixture(autouse=True)
+def _no_signal_cache():
+    previous = set_signal_cache(None)
+    yield
+    set_signal_cache(previous)
+
+
+@pytest.fixture(scope="module")
+def market():
+    provider = SyntheticProvider(seed=9, n_kospi=40, as_of="2021-12-30")
+    listing = provider.stock_listing("KOSPI")
+    prices = {code: provider.data_reader(code, "2021-01-04", "2021-12-30") for code in listing["Code"]}
+    return {"listing": listing, "prices": {code: df for code, df in prices.items() if not df.empty}}
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=50_000_000,
+        start_date="2021-01-04",
+        end_date="2021-12-30",
+        fee_rate=0.015,
+        n_rise_days=2,
+        m_fall_days=2,
+        y_emergency_pct=3.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+def _drain(stream):
+    steps = []
+    while True:
+        try:
+            steps.append(next(stream))
+        except StopIteration as stop:
+            return steps, stop.value
+
+
+class TestIterBacktest:
+    @pytest.mark.parametrize("sort_method", ["market_cap", "return_rate"])
+    def test_steps_match_run_backtest(self, market, sort_method):
+        params = _params(sort_method=sort_method)
+        expected = run_backtest(params, market["prices"], market["listing"])
+        steps, result = _drain(iter_backtest(params, market["prices"], market["listing"]))
+
+        assert [step.snapshot for step in steps] == expected.daily_snapshots
+        assert [trade for step in steps for trade in step.trades] == expected.trades
+        assert [step.day for step in steps] == list(range(len(steps)))
+        assert all(step.total_days == len(steps) for step in steps)
+        assert result.trades == expected.trades
+        assert (result.final_return_pct, result.mdd_pct, result.stopped_on) == \
+            (expected.final_return_pct, expected.mdd_pct, None)
+        assert min(step.drawdown_pct for step in steps) == pytest.approx(expected.mdd_pct, abs=0.005)
+
+    def test_each_step_only_has_that_days_trades(self, market):
+        for step in iter_backtest(_params(), market["prices"], market["listing"]):
+            assert all(trade.date == step.snapshot.date for trade in step.trades)
+
+    def test_caller_can_stop(self, market):
+        stream = iter_backtest(_params(), market["prices"], market["listing"])
+        first = [next(stream) for _ in range(10)]
+        stream.close()
+        assert first[-1].day == 9
+
+
+class TestStopRules:
+    def test_max_drawdown(self, market):
+        full = run_backtest(_params(), market["prices"], market["listing"])
+        assert full.mdd_pct < -1.0
+        result = run_backtest(_params(), market["prices"], market["listing"], stop_rules=[MaxDrawdownStop(1.0)])
+
+        assert result.stopped_on is not None
+        stop_day = [s.date for s in full.daily_snapshots].index(result.stopped_on)
+        assert result.daily_snapshots == full.daily_snapshots[:stop_day + 1]
+        assert result.trades == [t for t in full.trades if t.date <= result.stopped_on]
+        assert -1.0 >= result.mdd_pct
+
+    def test_min_equity(self, market):
+        rule = MinEquityStop(49_900_000)
+        steps, result = _drain(iter_backtest(_params(), market["prices"], market["listing"], stop_rules=[rule]))
+        assert steps[-1].snapshot.total_value < 49_900_000
+        assert all(step.snapshot.total_value >= 49_900_000 for step in steps[:-1])
+        assert result.stopped_on == steps[-1].snapshot.date
+
+    def test_rule_not_hit(self, market):
+        full = run_backtest(_params(), market["prices"], market["listing"])
+        result = run_backtest(_params(engine="numba"), market["prices"], market["listing"],
+                              stop_rules=[MaxDrawdownStop(99.0), lambda step: False])
+        assert result.stopped_on is None
+        assert result.daily_snapshots == full.daily_snapshots
+
+    def test_progress_callback(self, market):
+        calls = []
+        result = run_backtest(_params(), market["prices"], market["listing"],
+                              progress_callback=lambda cur, tot: calls.append(cur),
+                              stop_rules=[MaxDrawdownStop(1.0)])
+        assert calls == list(range(1, len(result.daily_snapshots) + 1))
@@ -0,0 +1,147 @@
+"""파라미터 스윕 테스트."""
+
+import pytest
+
+from src.data.synthetic import SyntheticProvider
+from src.engine import dense
+from src.engine.backtest import BacktestParams, MaxDrawdownStop, run_backtest, run_dual_market_backtest
+from src.engine.signal_cache import SignalCache, get_signal_cache, set_signal_cache
+from src.engine.sweep import SWEEP_METRICS, expand_grid, run_sweep
+
+
+@pytest.fixture(scope="module")
+def market():
+    provider = SyntheticProvider(seed=3, n_kospi=30, n_nasdaq=20, as_of="2021-06-30")
+    start, end = "2021-01-04", "2021-06-30"
+    listing = provider.stock_listing("KOSPI")
+    nasdaq_listing = provider.stock_listing("NASDAQ")
+    prices = {code: provider.data_reader(code, start, end) for code in listing["Code"]}
+    nasdaq_prices = {code: provider.data_reader(code, start, end) for code in nasdaq_listing["Symbol"]}
+    return {
+        "listing": listing,
+        "prices": {code: df for code, df in prices.items() if not df.empty},
+        "nasdaq_listing": nasdaq_listing,
+        "nasdaq_prices": {code: df for code, df in nasdaq_prices.items() if not df.empty},
+        "kospi_index": provider.data_reader("KS11", start, end),
+        "nasdaq_index": provider.data_reader("IXIC", start, end),
+        "rate": provider.data_reader("USD/KRW", start, end),
+    }
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=100_000_000,
+        start_date="2021-01-04",
+        end_date="2021-06-30",
+        fee_rate=0.015,
+        n_rise_days=2,
+        m_fall_days=2,
+        y_emergency_pct=3.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+        engine="panel",
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+GRID = {
+    "n_rise_days": [2, 3],
+    "max_buy_amount": [3_000_000, 5_000_000],
+    "sort_method": ["market_cap", "return_rate"],
+}
+
+
+class TestExpandGrid:
+    def test_cartesian_product_in_grid_order(self):
+        configs = expand_grid(_params(), GRID)
+        assert len(configs) == 8
+        assert [(c.n_rise_days, c.max_buy_amount, c.sort_method) for c in configs[:2]] == \
+            [(2, 3_000_000, "market_cap"), (2, 3_000_000, "return_rate")]
+        assert all(c.fee_rate == 0.015 for c in configs)
+
+    def test_unknown_field_raises(self):
+        with pytest.raises(ValueError, match="n_rise"):
+            expand_grid(_params(), {"n_rise": [1]})
+
+
+class TestRunSweep:
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_matches_individual_runs(self, market, max_workers):
+        table = run_sweep(_params(), GRID, market["prices"], market["listing"], market["kospi_index"],
+                          max_workers=max_workers)
+
+        assert list(table.columns) == [*GRID, *SWEEP_METRICS, "elapsed_s"]
+        for config, row in zip(expand_grid(_params(), GRID), table.itertuples()):
+            assert (row.n_rise_days, row.max_buy_amount, row.sort_method) == \
+                (config.n_rise_days, config.max_buy_amount, config.sort_method)
+            result = run_backtest(config, market["prices"], market["listing"], market["kospi_index"])
+            assert [getattr(row, name) for name in SWEEP_METRICS] == \
+                [getattr(result, name) for name in SWEEP_METRICS]
+
+    def test_dual_market(self, market):
+        grid = {"kospi_ratio": [100, 60], "y_emergency_pct": [3.0]}
+        table = run_sweep(
+            _params(), grid, market["prices"], market["listing"], market["kospi_index"],
+            nasdaq_price_data=market["nasdaq_prices"], nasdaq_listing_df=market["nasdaq_listing"],
+            nasdaq_df=market["nasdaq_index"], exchange_rate_df=market["rate"], max_workers=2,
+        )
+
+        dual = run_dual_market_backtest(
+            _params(kospi_ratio=60), market["prices"], market["nasdaq_prices"],
+            market["listing"], market["nasdaq_listing"],
+            market["kospi_index"], market["nasdaq_index"], market["rate"],
+        )
+        row = table.iloc[1]
+        assert row["kospi_ratio"] == 60
+        assert row["final_return_pct"] == dual.final_return_pct
+        assert row["total_trades"] == dual.total_trades
+
+    def test_dual_market_requires_nasdaq_inputs(self, market):
+        with pytest.raises(ValueError, match="nasdaq_price_data"):
+            run_sweep(_params(), {"kospi_ratio": [50]}, market["prices"], max_workers=1)
+
+    def test_progress_reaches_total(self, market):
+        calls = []
+        run_sweep(_params(), {"m_fall_days": [1, 2, 3]}, market["prices"], market["listing"],
+                  max_workers=1, progress_callback=lambda cur, tot: calls.append((cur, tot)))
+        assert calls == [(1, 3), (2, 3), (3, 3)]
+
+    def test_same_signal_params_reuse_signal_cache(self, market):
+        signal_cache = SignalCache()
+        previous = set_signal_cache(signal_cache)
+        try:
+            run_sweep(_params(), {"max_buy_amount": [2_000_000, 3_000_000, 4_000_000]},
+                      market["prices"], market["listing"], max_workers=1)
+        finally:
+            set_signal_cache(previous)
+        assert (signal_cache.stats.misses, signal_cache.stats.hits) == (1, 2)
+
+    def test_sweep_reuses_signals_without_a_global_cache(self, market, monkeypatch):
+        calls = []
+        compute = dense.panel_signals
+        monkeypatch.setattr(dense, "panel_signals", lambda *args, **kwargs: calls.append(1) or compute(*args, **kwargs))
+        previous = set_signal_cache(None)
+        try:
+            run_sweep(_params(), {"max_buy_amount": [2_000_000, 3_000_000, 4_000_000]},
+                      market["prices"], market["listing"], max_workers=1)
+            assert get_signal_cache() is None
+        finally:
+            set_signal_cache(previous)
+        assert len(calls) == 1
+
+    def test_stop_rules(self, market):
+        rule = MaxDrawdownStop(pct=1.0)
+        table = run_sweep(_params(), {"max_buy_amount": [3_000_000, 20_000_000]}, market["prices"],
+                          market["listing"], max_workers=2, stop_rules=[rule])
+        for config, row in zip(expand_grid(_params(), {"max_buy_amount": [3_000_000, 20_000_000]}),
+                               table.itertuples()):
+            result = run_backtest(config, market["prices"], market["listing"], stop_rules=[rule])
+            assert (row.stopped_on, row.total_trades) == (result.stopped_on, result.total_trades)
+        assert table["stopped_on"].notna().any()
+
+    def test_stop_rules_reject_dual_market_configs(self, market):
+        with pytest.raises(ValueError, match="stop_rules"):
+            run_sweep(_params(), {"kospi_ratio": [100, 50]}, market["prices"], market["listing"],
+                      nasdaq_price_data=market["prices"], exchange_rate_df=market["rate"],
+                      max_workers=1, stop_rules=[MaxDrawdownStop(pct=1.0)])
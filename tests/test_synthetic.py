@@ -0,0 +1,147 @@
+"""합성 데이터 공급자 테스트."""
+
+import pandas as pd
+import pytest
+
+from src.data import cache, fetcher
+from src.data.providers import FdrProvider, get_provider, use_provider
+from src.data.synthetic import SyntheticProvider
+from src.engine.backtest import BacktestParams, run_backtest, run_dual_market_backtest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / ".cache")
+
+
+@pytest.fixture
+def provider():
+    return SyntheticProvider(seed=3, n_kospi=30, n_nasdaq=20, as_of="2023-12-29")
+
+
+def _params(**overrides) -> BacktestParams:
+    values = dict(
+        initial_cash=100_000_000,
+        start_date="2023-01-02",
+        end_date="2023-06-30",
+        fee_rate=0.015,
+        n_rise_days=3,
+        m_fall_days=2,
+        y_emergency_pct=5.0,
+        max_buy_amount=5_000_000,
+        min_balance=1_000_000,
+    )
+    values.update(overrides)
+    return BacktestParams(**values)
+
+
+class TestSyntheticProvider:
+    def test_same_seed_same_data(self, provider):
+        other = SyntheticProvider(seed=3, n_kospi=30, n_nasdaq=20, as_of="2023-12-29")
+        pd.testing.assert_frame_equal(
+            provider.data_reader("000005", "2020-01-01", "2020-12-31"),
+            other.data_reader("000005", "2020-01-01", "2020-12-31"),
+        )
+        pd.testing.assert_frame_equal(provider.stock_listing("KOSPI"), other.stock_listing("KOSPI"))
+
+    def test_different_seed_differs(self, provider):
+        other = SyntheticProvider(seed=4, n_kospi=30, n_nasdaq=20)
+        a = provider.data_reader("000005", "2020-01-01", "2020-12-31")["Close"]
+        b = other.data_reader("000005", "2020-01-01", "2020-12-31")["Close"]
+        assert not a.equals(b)
+
+    def test_ranges_are_consistent(self, provider):
+        """겹치는 구간을 따로 요청해도 같은 날짜는 같은 값이다."""
+        wide = provider.data_reader("AAAC", "2019-01-01", "2021-12-31")
+        narrow = provider.data_reader("AAAC", "2020-03-01", "2020-06-30")
+        assert not narrow.empty
+        pd.testing.assert_frame_equal(narrow, wide.loc[narrow.index])
+
+    def test_price_paths_are_sane(self, provider):
+        df = provider.data_reader("000001", "2015-01-01", "2020-12-31")
+        assert df.index.is_monotonic_increasing
+        assert (df["Close"] > 0).all()
+        assert (df["High"] >= df[["Open", "Close"]].max(axis=1) - 1e-9).all()
+        assert (df["Low"] <= df[["Open", "Close"]].min(axis=1) + 1e-9).all()
+        # KOSPI 종목은 원 단위 가격, 일간 변동은 ±30% 이내
+        assert (df["Close"] == df["Close"].round()).all()
+        assert (df["Close"].pct_change().dropna().abs() <= 0.31).all()
+
+    def test_listings_have_market_caps(self, provider):
+        kospi = provider.stock_listing("KOSPI")
+        nasdaq = provider.stock_listing("NASDAQ")
+        assert len(kospi) == 30 and len(nasdaq) == 20
+        assert {"Code", "Name", "Marcap"} <= set(kospi.columns)
+        assert {"Symbol", "Name", "MarketCap"} <= set(nasdaq.columns)
+        assert kospi["Marcap"].is_monotonic_decreasing
+        assert (kospi["Marcap"] > 0).all()
+
+    def test_index_and_exchange_rate(self, provider):
+        ks11 = provider.data_reader("KS11", "2023-01-01", "2023-03-31")
+        usdkrw = provider.data_reader("USD/KRW", "2023-01-01", "2023-03-31")
+        assert not ks11.empty and "Close" in ks11.columns
+        assert usdkrw["Close"].between(700, 1800).all()
+
+    def test_unknown_symbol(self, provider):
+        with pytest.raises(ValueError):
+            provider.data_reader("NOPE", "2023-01-01", "2023-03-31")
+
+
+class TestUseProvider:
+    def test_restores_previous_provider(self, provider):
+        before = get_provider()
+        with use_provider(provider):
+            assert get_provider() is provider
+        assert get_provider() is before
+        assert isinstance(before, FdrProvider)
+
+    def test_fetchers_route_to_provider_without_cache(self, provider):
+        with use_provider(provider):
+            listing = fetcher.fetch_stock_listing("KOSPI")
+            prices = fetcher.fetch_all_prices(listing["Code"].tolist()[:5], "2023-01-01", "2023-03-31")
+            kospi_index = fetcher.fetch_kospi_index("2023-01-01", "2023-03-31")
+            rate = fetcher.fetch_exchange_rate("2023-01-01", "2023-03-31")
+
+        assert len(prices) == 5
+        assert kospi_index is not None and rate is not None
+        code = next(iter(prices))
+        pd.testing.assert_frame_equal(prices[code], provider.data_reader(code, "2023-01-01", "2023-03-31"))
+        # 합성 공급자는 캐시하지 않는다
+        assert not cache.CACHE_DIR.exists() or not list(cache.CACHE_DIR.glob("*.parquet"))
+
+
+class TestBacktestWithSyntheticData:
+    def test_run_backtest(self, provider):
+        params = _params()
+        with use_provider(provider):
+            listing = fetcher.fetch_stock_listing("KOSPI")
+            prices = fetcher.fetch_all_prices(listing["Code"].tolist(), params.start_date, params.end_date)
+            kospi_df = fetcher.fetch_kospi_index(params.start_date, params.end_date)
+
+        result = run_backtest(params, prices, listing_df=listing, kospi_df=kospi_df)
+
+        assert result.daily_snapshots
+        assert result.total_trades > 0
+        assert all(s.total_value > 0 for s in result.daily_snapshots)
+
+    def test_run_dual_market_backtest(self, provider):
+        params = _params(kospi_ratio=60)
+        with use_provider(provider):
+            kospi_listing = fetcher.fetch_stock_listing("KOSPI")
+            nasdaq_listing = fetcher.fetch_stock_listing("NASDAQ")
+            kospi_prices = fetcher.fetch_all_prices(
+                kospi_listing["Code"].tolist(), params.start_date, params.end_date)
+            nasdaq_prices = fetcher.fetch_all_prices(
+                nasdaq_listing["Symbol"].tolist(), params.start_date, params.end_date)
+            kospi_df = fetcher.fetch_kospi_index(params.start_date, params.end_date)
+            nasdaq_df = fetcher.fetch_nasdaq_index(params.start_date, params.end_date)
+            rate_df = fetcher.fetch_exchange_rate(params.start_date, params.end_date)
+
+        result = run_dual_market_backtest(
+            params, kospi_prices, nasdaq_prices, kospi_listing, nasdaq_listing,
+            kospi_df, nasdaq_df, rate_df,
+        )
+
+        assert result.daily_snapshots
+        assert result.kospi_snapshots and result.nasdaq_snapshots
+        assert result.initial_exchange_rate > 0
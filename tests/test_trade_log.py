@@ -0,0 +1,135 @@
+"""열 단위 거래 기록 테스트."""
+
+import dataclasses
+import pickle
+
+import numpy as np
+import pytest
+
+from src.engine.portfolio import Holding, Portfolio, Trade
+from src.engine.trade_log import TradeLog, as_trade_log, date_to_day, day_to_date
+
+
+def _trades() -> list[Trade]:
+    return [
+        Trade("2024-01-03", "005930", "삼성전자", "BUY", 70_000.0, 10, 700_000.0, 105.0),
+        Trade("2024-01-02", "AAPL", "Apple", "BUY", 180.5, 3, 541.5, 0.08, market="NASDAQ"),
+        Trade("2024-01-05", "005930", "삼성전자", "SELL", 72_000.0, 10, 720_000.0, 108.0, profit=19_787.0),
+        Trade("2024-01-05", "000660", "SK하이닉스", "SELL", 130_000.0, 2, 260_000.0, 39.0, profit=-1_000.0),
+    ]
+
+
+class TestTradeLog:
+    def test_round_trips_trades(self):
+        trades = _trades()
+        log = TradeLog.from_trades(trades)
+        assert len(log) == 4
+        assert log == trades and list(log) == trades
+        assert log[2] == trades[2] and log[-1] == trades[-1]
+        assert log[1:3] == trades[1:3]
+        assert isinstance(log[0].quantity, int) and isinstance(log[0].price, float)
+        with pytest.raises(IndexError):
+            log[4]
+
+    def test_strings_are_interned(self):
+        log = TradeLog.from_trades(_trades())
+        assert log.strings.count("005930") == 1
+        assert log.data["code"].tolist() == [0, 3, 0, 6]  # 코드, 이름, 시장이 같은 풀을 쓴다
+        assert log.data["date"].tolist() == [date_to_day(t.date) for t in _trades()]
+        assert day_to_date(date_to_day("2024-02-29")) == "2024-02-29"
+
+    def test_grows_past_capacity(self):
+        log = TradeLog(capacity=2)
+        for k in range(300):
+            log.record("2024-01-02", f"{k:06d}", "x", "BUY", 1.0, k, float(k), 0.0)
+        assert len(log) == 300
+        assert log.data["quantity"].tolist() == list(range(300))
+
+    def test_metrics_columns(self):
+        trades = _trades()
+        log = TradeLog.from_trades(trades)
+        assert log.sell_mask().tolist() == [False, False, True, True]
+        assert log.total_fee() == sum(t.fee for t in trades)
+        empty = TradeLog().total_fee()
+        assert empty == 0.0 and isinstance(empty, float)
+
+    def test_market_concat_and_sort(self):
+        trades = _trades()
+        kospi, nasdaq = TradeLog.from_trades(trades[:1]), TradeLog.from_trades(trades[1:])
+        kospi.set_market("KOSPI")
+        nasdaq.set_market("NASDAQ")
+        combined = TradeLog.concat([kospi, nasdaq]).sorted_by_date()
+        assert [(t.date, t.code, t.market) for t in combined] == [
+            ("2024-01-02", "AAPL", "NASDAQ"),
+            ("2024-01-03", "005930", "KOSPI"),
+            ("2024-01-05", "005930", "NASDAQ"),
+            ("2024-01-05", "000660", "NASDAQ"),
+        ]
+
+    def test_list_operations(self):
+        trades = _trades()
+        log = TradeLog.from_trades(trades[:2])
+        rest = TradeLog.from_trades(trades[2:])
+        assert log + trades[2:] == trades and log + rest == trades
+        assert trades[:1] + rest == trades[:1] + trades[2:]
+        assert log == TradeLog.from_trades(trades[:2]) and log != rest
+
+        combined = log + rest
+        expected = list(combined)
+        for kwargs in ({"key": lambda t: (t.date, t.code)}, {"key": lambda t: t.date, "reverse": True}):
+            combined.sort(**kwargs)
+            expected.sort(**kwargs)
+            assert combined == expected
+
+    def test_iteration_is_lazy(self):
+        log = TradeLog()
+        for k in range(3000):
+            log.record("2024-01-02", "A", "A", "BUY", 1.0, k, float(k), 0.0)
+        trades = iter(log)
+        assert next(trades).quantity == 0
+        assert sum(1 for _ in trades) == 2999
+
+    def test_returned_trades_cannot_be_mutated(self):
+        log = TradeLog.from_trades(_trades())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            log[0].market = "NASDAQ"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            for trade in log:
+                trade.profit = 0.0
+        assert log == _trades()
+
+    def test_extend_columns(self):
+        log = TradeLog()
+        ids = np.array([log.intern("A"), log.intern("B")], dtype=np.int32)
+        log.extend_columns(date=np.array([date_to_day("2024-01-02")] * 2), code=ids, name=ids,
+                           side=np.array([0, 1]), price=np.array([1.0, 2.0]), quantity=np.array([5, 6]),
+                           amount=np.array([5.0, 12.0]), fee=np.array([0.0, 0.1]))
+        assert log == [
+            Trade("2024-01-02", "A", "A", "BUY", 1.0, 5, 5.0, 0.0),
+            Trade("2024-01-02", "B", "B", "SELL", 2.0, 6, 12.0, 0.1),
+        ]
+
+    def test_frame_and_pickle(self):
+        log = TradeLog.from_trades(_trades())
+        frame = log.to_frame()
+        assert frame["code"].tolist() == [t.code for t in _trades()]
+        assert frame["side"].tolist() == [t.side for t in _trades()]
+        assert TradeLog().to_frame().empty
+        assert pickle.loads(pickle.dumps(log)) == log
+        assert as_trade_log(log) is log
+
+
+class TestPortfolioTrades:
+    def test_portfolio_records_into_log(self):
+        portfolio = Portfolio(cash=10_000_000, fee_rate=0.015)
+        portfolio.buy("2024-01-02", "A", "에이", 10_000.0, 1_000_000, 0)
+        portfolio.sell_all("2024-01-03", "A", "에이", 11_000.0)
+        assert isinstance(portfolio.trades, TradeLog)
+        assert [t.side for t in portfolio.trades] == ["BUY", "SELL"]
+        assert portfolio.trades[1].profit == pytest.approx(100 * 1_000 - 1_100_000 * 0.00015)
+
+    def test_holding_has_slots(self):
+        holding = Holding(code="A", name="에이", quantity=1, avg_price=1.0)
+        assert not hasattr(holding, "__dict__")
+        with pytest.raises(AttributeError):
+            holding.extra = 1